@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Construye un modelo de n-gramas de caracteres con suavizado Kneser-Ney
+para `CharLMFluencyScenario`.
+
+Uso:
+    python -m scripts.build_char_lm --order 5 data/corpus1.txt ...
+    python -m scripts.build_char_lm --order 5 --brown
+    python -m scripts.build_char_lm --order 5 --unigrams data/processed/unigrams.pkl
+
+• Ficheros de texto plano (o STDIN si no se pasa ninguno): cada línea
+  es un texto.
+• --brown: corpus Brown de NLTK (como build_bigrams.py).
+• --unigrams: pickle dict{palabra: frecuencia}; cada palabra cuenta
+  tantas veces como su frecuencia (sólo n-gramas dentro de palabras).
+"""
+import argparse, pickle, sys
+from pathlib import Path
+
+from src.utils.char_lm import CharNgramLM, MAX_ORDER, count_ngrams, normalize
+from src.utils.ngram_store import drop_store
+
+
+def iter_lines(paths):
+    for fp in paths:
+        fh = sys.stdin if fp == Path("-") else fp.open(encoding="utf-8-sig", errors="ignore")
+        with fh:
+            for line in fh:
+                text = normalize(line)
+                if text:
+                    yield text, 1
+
+
+def iter_brown():
+    from nltk.corpus import brown
+    for sent in brown.sents():
+        text = normalize(" ".join(sent))
+        if text:
+            yield text, 1
+
+
+def iter_unigrams(path):
+    with path.open("rb") as f:
+        freqs = pickle.load(f)
+    for word, count in freqs.items():
+        text = normalize(str(word))
+        if text:
+            yield text, count
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("files", nargs="*", type=Path, help="Archivos de texto plano")
+    ap.add_argument("--order", type=int, default=5, help=f"orden del modelo (1..{MAX_ORDER})")
+    ap.add_argument("--brown", action="store_true", help="usar el corpus Brown de NLTK")
+    ap.add_argument("--unigrams", type=Path, help="pickle dict{palabra: frecuencia}")
+    ap.add_argument("--out", type=Path, default=None,
+                    help="Fichero de salida (por defecto: data/processed/char_lm_<orden>.pkl)")
+    args = ap.parse_args()
+
+    if args.brown:
+        texts = iter_brown()
+    elif args.unigrams:
+        texts = iter_unigrams(args.unigrams)
+    else:
+        texts = iter_lines(args.files or [Path("-")])
+
+    counts = count_ngrams(texts, args.order)
+    model = CharNgramLM.from_counts(counts, args.order)
+
+    out = args.out or Path("data/processed") / f"char_lm_{args.order}.pkl"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    model.save(out)
+    drop_store(out)  # el .bin de convert_ngrams ya no corresponde
+    print(f"📦 Guardados {len(model):,} n-gramas (orden 1–{args.order}) → {out}")
+
+
+if __name__ == "__main__":
+    main()
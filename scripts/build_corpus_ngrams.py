@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Construye todas las tablas de n-gramas a partir de corpus locales de
+texto plano, en varios procesos y con memoria acotada (ver
+src/utils/corpus_ngrams.py). Pensado para corpus de decenas de GB; no
+necesita NLTK.
+
+Uso:
+    python -m scripts.build_corpus_ngrams --workers 8 --min-count 3 \
+           --char-lm 5 data/corpus1.txt data/corpus2.txt ...
+
+Salidas (en --out-dir, por defecto data/processed):
+• es_unigrams.bin / es_bigrams.bin – los recuentos de
+  build_es_word_ngrams.py en formato binario (src/utils/ngram_store.py;
+  los escenarios los prefieren a los .pkl). Se escriben en streaming:
+  nunca se carga la tabla entera de bigramas en memoria.
+• es_word_bigrams.pkl – como build_es_word_ngrams.py
+• bigrams.pkl – bigramas de caracteres sin espacio, como build_bigrams.py
+• char_lm_<orden>.pkl – con --char-lm, como build_char_lm.py
+"""
+import argparse, pickle, shutil, tempfile
+from collections import Counter
+from pathlib import Path
+
+from src.utils.char_lm import CharNgramLM, MAX_ORDER
+from src.utils.char_ngrams import ALPHABET, BASE
+from src.utils.corpus_ngrams import build_counts
+from src.utils.ngram_store import StringCounts, drop_store, write_sorted_counts
+from src.utils.word_ngrams import WordBigramTable
+
+
+def char_counts_to_lm(tables, order):
+    """{"charN": {"AB…": n}} → counts[n] = Counter{clave base 28: n} (como `count_ngrams`)."""
+    index = {c: i for i, c in enumerate(ALPHABET)}
+    counts = [Counter() for _ in range(order + 1)]
+    for n in range(1, order + 1):
+        cnt = counts[n]
+        for gram, c in tables[f"char{n}"].items():
+            key = 0
+            for ch in gram:
+                key = key * BASE + index[ch]
+            cnt[key] = c
+    return counts
+
+
+def save_word_tables(tables, out_dir):
+    """word1 / word2 (`StringCounts`) → es_unigrams.bin / es_bigrams.bin + es_word_bigrams.pkl."""
+    uni_path = out_dir / "es_unigrams.bin"
+    shutil.move(tables.pop("word1").path, uni_path)  # mismas claves: basta con moverlo
+    # "w1 w2" → ("w1", "w2"): el orden de las claves se conserva
+    word2 = tables.pop("word2")
+    bi_path = write_sorted_counts(out_dir / "es_bigrams.bin",
+                                  ((tuple(k.split(" ")), c) for k, c in word2.items()), pairs=True)
+    unigrams, bigrams = StringCounts(uni_path), StringCounts(bi_path)
+    table = WordBigramTable.from_counts(unigrams, bigrams)
+    table.save(out_dir / "es_word_bigrams.pkl")
+    drop_store(out_dir / "es_word_bigrams.pkl")  # .bin de convert_ngrams, ya obsoleto
+    print(f"📦 Guardados  {len(unigrams):,} unigramas  "
+          f"y  {len(bigrams):,} bigramas ({len(table):,} por ID)  →  {out_dir}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("files", nargs="+", type=Path, help="Archivos de texto plano (UTF-8)")
+    ap.add_argument("--out-dir", type=Path, default=Path("data/processed"),
+                    help="Directorio de salida (por defecto: data/processed)")
+    ap.add_argument("--workers", type=int, default=None, help="procesos (por defecto: nº de CPUs)")
+    ap.add_argument("--chunk-mb", type=float, default=64, help="tamaño de cada trozo de entrada")
+    ap.add_argument("--max-entries", type=int, default=2_000_000,
+                    help="claves en memoria por worker antes de volcar a disco")
+    ap.add_argument("--tmp-dir", type=Path, default=None, help="directorio para los volcados")
+    ap.add_argument("--min-count", type=int, default=1,
+                    help="frecuencia mínima de palabras y bigramas de palabras")
+    ap.add_argument("--top-k", type=int, default=None,
+                    help="conservar sólo las k palabras / bigramas más frecuentes")
+    ap.add_argument("--sketch", action="store_true",
+                    help="pre-filtrar con un count-min sketch (necesita --min-count > 1)")
+    ap.add_argument("--sketch-width", type=int, default=1 << 21, help="columnas del sketch")
+    ap.add_argument("--char-lm", type=int, default=0, metavar="ORDEN",
+                    help=f"construir también char_lm_<orden>.pkl (2..{MAX_ORDER})")
+    ap.add_argument("--char-bigrams", type=int, default=3000,
+                    help="bigramas de caracteres a guardar en bigrams.pkl (0 = ninguno)")
+    ap.add_argument("--no-words", action="store_true", help="sólo tablas de caracteres")
+    args = ap.parse_args()
+
+    if args.char_lm and not 2 <= args.char_lm <= MAX_ORDER:
+        ap.error(f"--char-lm debe estar en 2..{MAX_ORDER}")
+    char_order = max(args.char_lm, 2 if args.char_bigrams else 0)
+
+    out_dir = args.out_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # las tablas de palabras se escriben en disco (junto a la salida) según se mezclan
+    with tempfile.TemporaryDirectory(prefix=".word_counts_", dir=out_dir) as store_dir:
+        tables = build_counts(
+            args.files, char_order=char_order, words=not args.no_words,
+            workers=args.workers, chunk_mb=args.chunk_mb, max_entries=args.max_entries,
+            min_count=args.min_count, top_k=args.top_k, sketch=args.sketch,
+            sketch_width=args.sketch_width, tmp_dir=args.tmp_dir, store_dir=store_dir,
+        )
+        if not args.no_words:
+            save_word_tables(tables, out_dir)
+
+    if args.char_bigrams:
+        letters = Counter({k: c for k, c in tables["char2"].items() if " " not in k})
+        with (out_dir / "bigrams.pkl").open("wb") as f:
+            pickle.dump(dict(letters.most_common(args.char_bigrams)), f)
+        drop_store(out_dir / "bigrams.pkl")
+        print(f"📦 Guardados {min(len(letters), args.char_bigrams):,} bigramas de caracteres → "
+              f"{out_dir / 'bigrams.pkl'}")
+
+    if args.char_lm:
+        model = CharNgramLM.from_counts(char_counts_to_lm(tables, args.char_lm), args.char_lm)
+        out = out_dir / f"char_lm_{args.char_lm}.pkl"
+        model.save(out)
+        drop_store(out)
+        print(f"📦 Guardados {len(model):,} n-gramas (orden 1–{args.char_lm}) → {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,19 @@
 """
 Genera unigramas y bigramas a nivel de palabra para español.
 
+Además de los recuentos por palabra (es_unigrams.pkl / es_bigrams.pkl)
+escribe es_word_bigrams.pkl: los bigramas ya traducidos a IDs del
+vocabulario (ver src/utils/word_ngrams.py).
+
 Uso:
     python -m scripts.build_es_word_ngrams  \
            --out-dir src/data               \
            data/corpus1.txt data/corpus2.txt ...
 
 Si no pasa ficheros, lee STDIN.
+
+Las versiones binarias (.bin, scripts/convert_ngrams.py) de las salidas
+quedan obsoletas y se borran.
 """
 import argparse, pickle, re, sys
 from collections import Counter
@@ -15,6 +22,9 @@ from pathlib import Path
 from itertools import tee
 from tqdm import tqdm  # pip install tqdm
 
+from src.utils.ngram_store import drop_store
+from src.utils.word_ngrams import WordBigramTable
+
 TOKEN_RE = re.compile(r"[A-Za-zÁÉÍÓÚÜÑáéíóúüñ]+")
 
 
@@ -57,13 +67,20 @@ def main():
 
     out_dir = args.out_dir
     out_dir.mkdir(parents=True, exist_ok=True)
+    unigrams = {w: c for w, c in unigrams.items() if c >= args.min_count}
+    bigrams = {bg: c for bg, c in bigrams.items() if c >= args.min_count}
     with (out_dir / "es_unigrams.pkl").open("wb") as f:
-        pickle.dump({w: c for w, c in unigrams.items() if c >= args.min_count}, f)
+        pickle.dump(unigrams, f)
     with (out_dir / "es_bigrams.pkl").open("wb") as f:
-        pickle.dump({bg: c for bg, c in bigrams.items() if c >= args.min_count}, f)
+        pickle.dump(bigrams, f)
+    table = WordBigramTable.from_counts(unigrams, bigrams)
+    table.save(out_dir / "es_word_bigrams.pkl")
+    for name in ("es_unigrams.pkl", "es_bigrams.pkl", "es_word_bigrams.pkl"):
+        if drop_store(out_dir / name):
+            print(f"🗑️  Borrado {(out_dir / name).with_suffix('.bin')} (obsoleto)")
 
     print(f"📦 Guardados  {len(unigrams):,} unigramas  "
-          f"y  {len(bigrams):,} bigramas  →  {out_dir}")
+          f"y  {len(bigrams):,} bigramas ({len(table):,} por ID)  →  {out_dir}")
 
 
 if __name__ == "__main__":
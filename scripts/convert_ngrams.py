@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Convierte las tablas de n-gramas en pickle al formato binario mapeable
+en memoria de `src/utils/ngram_store.py` (mismo nombre, extensión .bin).
+Los escenarios usan la versión .bin en cuanto existe.
+
+Uso:
+    python -m scripts.convert_ngrams                         # todo data/processed/*.pkl
+    python -m scripts.convert_ngrams data/processed/es_bigrams.pkl ...
+
+    python -m scripts.convert_ngrams --bits 8 data/processed/es_unigrams.pkl
+
+Tipos reconocidos: recuentos dict{str: int} / dict{(str, str): int},
+es_word_bigrams.pkl (`WordBigramTable`) y char_lm_<orden>.pkl (`CharNgramLM`).
+Con --bits 8 | 16, los recuentos se guardan cuantizados en cubetas
+logarítmicas uint8 / uint16 (el resto de tipos no se ve afectado).
+"""
+import argparse
+import pickle
+import time
+from pathlib import Path
+
+from src.utils.char_lm import CharNgramLM
+from src.utils.ngram_store import ArrayStore, StringCounts, store_path, write_counts
+from src.utils.word_ngrams import WordBigramTable
+
+DATA_DIR = Path("data/processed")
+
+
+def convert(src: Path, dst: Path, bits: int | None = None) -> str:
+    with src.open("rb") as fh:
+        data = pickle.load(fh)
+    if isinstance(data, dict) and "tables" in data and "alphabet" in data:
+        CharNgramLM.load(src).save_store(dst)
+        return "char_lm"
+    if isinstance(data, dict) and "keys" in data and "n_vocab" in data:
+        WordBigramTable.load(src).save_store(dst)
+        return "word_bigrams"
+    if isinstance(data, dict):
+        write_counts(dst, data, bits)
+        return f"counts ({len(data):,}{f', {bits} bits' if bits else ''})"
+    raise ValueError(f"Contenido no reconocido en {src} ({type(data).__name__})")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("files", nargs="*", type=Path,
+                    help=f"Pickles de entrada (def. {DATA_DIR}/*.pkl)")
+    ap.add_argument("--bits", type=int, choices=(8, 16), default=None,
+                    help="cuantizar los recuentos a cubetas log de 8 o 16 bits")
+    args = ap.parse_args()
+
+    files = args.files or sorted(DATA_DIR.glob("*.pkl"))
+    if not files:
+        ap.error(f"No hay pickles que convertir en {DATA_DIR}")
+
+    for src in files:
+        dst = store_path(src)
+        try:
+            kind = convert(src, dst, args.bits)
+        except ValueError as exc:
+            print(f"⚠️  {exc}")
+            continue
+
+        t0 = time.perf_counter()
+        StringCounts(dst) if kind.startswith("counts") else ArrayStore(dst)
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"📦 {src.name} [{kind}] → {dst} ({dst.stat().st_size / 1024:,.0f} KiB, "
+              f"apertura {ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""
+Convierte un vocabulario pickle (dict token → ID) al formato binario
+mapeable en memoria de `src/utils/vocab_store.py`.
+
+Uso:
+    python -m scripts.convert_vocab                              # vocab por defecto
+    python -m scripts.convert_vocab data/vocab_es_100000.pkl     # → .bin al lado
+    python -m scripts.convert_vocab in.pkl --out otro.bin
+"""
+import argparse
+import time
+from pathlib import Path
+
+from src import vocab
+from src.utils.vocab_store import VocabStore
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("src", nargs="?", type=Path, default=vocab._PICKLE_FILE,
+                    help="Pickle de entrada (def. el de VOCAB_SIZE)")
+    ap.add_argument("--out", type=Path, default=None,
+                    help="Fichero de salida (def. mismo nombre con extensión .bin)")
+    args = ap.parse_args()
+
+    out = vocab.convert_pickle(args.src, args.out or args.src.with_suffix(".bin"))
+
+    t0 = time.perf_counter()
+    store = VocabStore(out)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"📦 {len(store):,} tokens → {out} ({out.stat().st_size / 1024:,.0f} KiB, "
+          f"apertura {ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
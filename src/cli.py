@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import argparse
-import sys
 from pathlib import Path
 
-from src.ga_word import GAWord
+from src.evolution.selection import SELECTIONS
+from src.ga_word import GAWord, PROMPT_SEED_FRAC, WARM_CARRY, prompt_seeds
 from src.vocab import decode  # para convertir IDs → palabra
 
 def main() -> None:
@@ -24,36 +24,92 @@ def main() -> None:
         default=2000,
         help="Número máximo de generaciones"
     )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Procesos para evaluar la fitness (1 = sin pool)"
+    )
+    parser.add_argument(
+        "-s", "--selection",
+        choices=list(SELECTIONS),
+        default="roulette",
+        help="Estrategia de selección de padres"
+    )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="No mostrar el progreso de cada generación"
+    )
+    parser.add_argument(
+        "-b", "--bigram-weight",
+        type=float,
+        default=0.0,
+        help="Peso de la fluidez de bigramas de palabras (0 = sólo Zipf)"
+    )
+    parser.add_argument(
+        "-t", "--time-budget-ms",
+        type=float,
+        default=None,
+        help="Tiempo máximo por respuesta en ms (devuelve lo mejor hasta entonces)"
+    )
+    parser.add_argument(
+        "--target-fitness",
+        type=float,
+        default=None,
+        help="Responder en cuanto se alcance esta fitness"
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Población nueva en cada turno (sin sesión persistente)"
+    )
     args = parser.parse_args()
 
     print("🗣️  Chat evolutivo word-level (ENTER sin texto para salir)\n")
 
-    while True:
-        prompt = input("Tú: ").strip()
-        if not prompt:
-            print("Adiós 👋")
-            sys.exit(0)
-
-        # Instanciamos GAWord (sin prompt en constructor)
-        ga = GAWord(
-            pop_size=args.pop_size,
-            max_gens=args.max_gens,
-            runs_dir=Path("runs")
-        )
+    # Sesión: vocabulario, tablas, pool y población se cargan una vez y
+    # cada turno arranca en caliente desde la población anterior
+    ga = None
+    try:
+        while True:
+            try:
+                prompt = input("Tú: ").strip()
+            except (EOFError, KeyboardInterrupt):
+                prompt = ""
+            if not prompt:
+                print("Adiós 👋")
+                break
 
-        # Si quieres que tu fitness tenga en cuenta el prompt,
-        # asegúrate de que GAWord use `self.prompt` dentro de _fitness().
-        ga.prompt = prompt  # opcional, si tu GAWord lo espera
+            if ga is None or args.fresh:
+                ga = GAWord(
+                    pop_size=args.pop_size,
+                    max_gens=args.max_gens,
+                    runs_dir=Path("runs"),
+                    workers=args.workers,
+                    selection=args.selection,
+                    quiet=args.quiet,
+                    persistent=not args.fresh,
+                    time_budget_ms=args.time_budget_ms,
+                    target_fitness=args.target_fitness,
+                    bigram_weight=args.bigram_weight,
+                )
+            # anterior (mejores) + semillas del prompt + aleatorias
+            seeds = prompt_seeds(prompt, int(args.pop_size * PROMPT_SEED_FRAC))
+            ga.warm_start(seeds, carry=0.0 if args.fresh else WARM_CARRY)
 
-        # Ejecutamos la evolución y guardamos el último genome
-        last_genome = None
-        for gen, best_fit, best_genome in ga.run():
-            last_genome = best_genome
+            # Ejecutamos la evolución y guardamos el último genome
+            last_genome = None
+            for gen, best_fit, best_genome in ga.run():
+                last_genome = best_genome
 
-        # Decodificamos IDs → palabras, saltando BOS/EOS
-        response = decode(last_genome, skip_special=True)
+            # Decodificamos IDs → palabras, saltando BOS/EOS
+            response = decode(last_genome, skip_special=True)
 
-        print("Bot:", response, "\n")
+            print("Bot:", response, "\n")
+    finally:
+        if ga is not None:
+            ga.close()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
-import copy
 from typing import List, Tuple
 
 from ..evolution.operators import EvolutionOperators
 from ..models.individual import Individual
+from ..utils.budget import RunBudget
+from ..utils.diversity import DiversityTracker
+from ..utils.fitness_cache import FitnessCache
+from ..utils.parallel import ParallelEvaluator
 from ..utils.run_logger import RunLogger
 
 
@@ -16,6 +19,8 @@ class EvolutionEngine:
     • **Nuevo:** cuando un individuo tiene ≤ 3 genes incorrectos,
       se aplica una *micro-mutación* agresiva (μ = 0.20) sólo en esos
       genes, acelerando la recta final.
+    • Modo *anytime*: `time_budget_ms` y/o `target_fitness` (ver
+      `utils/budget.py`); `run()` devuelve el mejor (genes, fitness).
     """
 
     # -------------------------------------------------- #
@@ -38,6 +43,21 @@ class EvolutionEngine:
             # --- micro-mutación --------------------------- #
             micro_threshold: int = 3,
             micro_mutation_rate: float = 0.20,
+            # --- evaluación en paralelo ------------------- #
+            workers: int = 1,
+            # --- memoización de fitness ------------------- #
+            fitness_cache: FitnessCache | None = None,
+            # --- diversidad ------------------------------- #
+            diversity_mode: str = "exact",
+            diversity_sample: int = 1024,
+            # --- evaluación delta ------------------------- #
+            delta_evaluation: bool = True,
+            delta_max_fraction: float = 0.05,
+            # --- informe por consola ---------------------- #
+            report_every: int = 1,
+            # --- presupuesto (modo anytime) --------------- #
+            time_budget_ms: float | None = None,
+            target_fitness: float | None = None,
     ):
         self.scenario = scenario
         self.population_size = population_size
@@ -62,6 +82,26 @@ class EvolutionEngine:
         self.micro_threshold = micro_threshold
         self.micro_mutation_rate = micro_mutation_rate
 
+        # Evaluación (pool de procesos si workers > 1)
+        self.evaluator = ParallelEvaluator(scenario.evaluate_batch, workers)
+        self.fitness_cache = fitness_cache
+
+        # Evaluación delta (si el escenario expone `evaluate_delta()`)
+        self.use_delta = delta_evaluation and hasattr(scenario, "evaluate_delta")
+        self.delta_max_fraction = delta_max_fraction
+
+        # Diversidad (modo exacto: incremental, con los individuos que entran
+        # en cada posición; sample/hll: se mide una vez por generación)
+        self.diversity_tracker = DiversityTracker(diversity_mode, sample_size=diversity_sample)
+        self._last_diversity: int | None = None
+
+        # Informe por consola cada `report_every` generaciones (0 = silencio)
+        self.report_every = report_every
+
+        # Presupuesto de tiempo / calidad (None → sin límite)
+        self.budget = RunBudget(time_budget_ms, target_fitness)
+        self.best: Tuple[list, float] | None = None
+
         # Logger
         self.logger = RunLogger(scenario_name=scenario.__class__.__name__)
 
@@ -73,19 +113,67 @@ class EvolutionEngine:
             Individual(self.scenario.random_genes())
             for _ in range(self.population_size)
         ]
+        if self.diversity_tracker.incremental:
+            self.diversity_tracker.reset(ind.genome_hash() for ind in self.population)
+
+    def _score(self, genomes):
+        """Fitness de un batch de genomas (caché → pool/escenario)."""
+        if self.fitness_cache is not None:
+            return self.fitness_cache.evaluate(genomes, self.evaluator)
+        return self.evaluator(genomes)
+
+    def _evaluate_delta(self, ind: Individual) -> bool:
+        """
+        Intenta obtener la fitness a partir del genoma base del individuo.
+        Devuelve False si hace falta una evaluación completa.
+        """
+        info = ind.delta_info()
+        ind.settle()
+        if info is None:
+            return False
+
+        base_genes, base_fitness, changed = info
+        if not changed:
+            ind.fitness = base_fitness
+            return True
+        if len(changed) > self.delta_max_fraction * len(ind):
+            return False
+
+        if ind.is_char:
+            base_genes = base_genes.decode("latin-1")
+        ind.fitness = self.scenario.evaluate_delta(
+            ind.as_sequence(), base_genes, base_fitness, sorted(changed)
+        )
+        return True
 
     def evaluate_population(self):
-        for ind in self.population:
-            ind.fitness = self.scenario.evaluate(ind.genes)
+        pending = self.population
+        if self.use_delta:
+            pending = [ind for ind in self.population if not self._evaluate_delta(ind)]
+
+        if not pending:
+            return
+        fits = self._score([ind.genes for ind in pending])
+        for ind, fit in zip(pending, fits):
+            ind.fitness = fit
+            ind.settle()
 
     # -------------------------------------------------- #
     # Métricas y utilidades
     # -------------------------------------------------- #
     def _population_diversity(self) -> int:
-        return len({tuple(ind.genes) for ind in self.population})
+        tracker = self.diversity_tracker
+        if tracker.incremental:
+            self._last_diversity = tracker.distinct()
+        else:
+            self._last_diversity = tracker.measure(self.population, Individual.genome_hash)
+        return self._last_diversity
+
+    def _best(self) -> Individual:
+        return max(self.population, key=lambda ind: ind.fitness)
 
     def _collect_metrics(self) -> Tuple[Individual, float, int]:
-        best = max(self.population, key=lambda ind: ind.fitness)
+        best = self._best()
         avg = sum(ind.fitness for ind in self.population) / len(self.population)
         div = self._population_diversity()
         return best, avg, div
@@ -99,11 +187,11 @@ class EvolutionEngine:
             μ: float,
     ):
         # Construir representación de los genes
-        if all(isinstance(g, str) for g in best.genes):
-            genes_str = ''.join(best.genes)
+        if best.is_char:
+            genes_str = best.as_sequence()
         else:
             # Si son números, convertir la lista entera a string
-            genes_str = str(best.genes)
+            genes_str = str(list(best.genes))
 
         print(
             f"Gen {gen:<4} "
@@ -117,7 +205,7 @@ class EvolutionEngine:
     # Estancamiento y mutación adaptativa
     # -------------------------------------------------- #
     def _update_stagnation(self):
-        current_best = max(self.population, key=lambda ind: ind.fitness).fitness
+        current_best = self._best().fitness
         if self._best_fitness_so_far is None or current_best > self._best_fitness_so_far:
             self._best_fitness_so_far = current_best
             self._no_improve_counter = 0
@@ -132,80 +220,152 @@ class EvolutionEngine:
         return self.base_mutation_rate
 
     # -------------------------------------------------- #
-    # Bucle principal
+    # Reproducción: selección, cruce, mutación y elitismo
     # -------------------------------------------------- #
-    def run(self):
-        # --- Generación 0 ------------------------------------------- #
-        self.initialize_population()
-        self.evaluate_population()
+    def _next_generation(self, gen: int) -> float:
+        """Sustituye `self.population` por la siguiente generación y devuelve el μ usado."""
+        best_prev = self._best()
+        selected = self.operators.select(self.population)
+
+        next_generation: List[Individual] = []
+        for i in range(0, len(selected), 2):
+            if i + 1 < len(selected):
+                parent = selected[i]
+                child_genes, changed = self.operators.crossover_diff(parent, selected[i + 1])
+                child = Individual(child_genes)
+                child.derive(parent.genes, parent.fitness, changed)
+                next_generation.append(child)
+            else:
+                next_generation.append(selected[i])
+
+        # ---- Mutación ------------------------------------------ #
+        diversity_prev = self._last_diversity
+        if diversity_prev is None:
+            diversity_prev = self._population_diversity()
+        μ = self._adaptive_mu(diversity_prev) * (self.anneal_factor ** gen)
+
+        for ind in next_generation:
+            incorrect = None
+            if hasattr(self.scenario, "incorrect_positions"):
+                incorrect = self.scenario.incorrect_positions(ind.as_sequence())
 
+            if incorrect and len(incorrect) <= self.micro_threshold:
+                # micro-mutación agresiva sólo en estos genes
+                self.operators.mutate(
+                    ind,
+                    mutation_rate=self.micro_mutation_rate,
+                    incorrect_positions=incorrect,
+                )
+            else:
+                # mutación adaptativa estándar
+                self.operators.mutate(
+                    ind,
+                    mutation_rate=μ,
+                    incorrect_positions=incorrect,
+                )
+
+        # ---- Elitismo & relleno (clones copia-en-escritura) -- #
+        if next_generation:
+            next_generation[0] = best_prev.clone()
+        while len(next_generation) < self.population_size:
+            next_generation.append(best_prev.clone())
+
+        # los clones heredan el hash del genoma: sólo se recalcula el de
+        # los hijos mutados
+        if self.diversity_tracker.incremental:
+            self.diversity_tracker.assign_all([ind.genome_hash() for ind in next_generation])
+        self.population = next_generation
+        return μ
+
+    # -------------------------------------------------- #
+    # Migración (modelo de islas)
+    # -------------------------------------------------- #
+    def emigrants(self, k: int) -> List[Tuple[list, float]]:
+        """Los `k` mejores individuos como (genes en forma de lista, fitness)."""
+        top = sorted(self.population, key=lambda ind: ind.fitness, reverse=True)[:k]
+        return [(ind.gene_list(), ind.fitness) for ind in top]
+
+    def immigrate(self, migrants: List[Tuple[list, float]]) -> None:
+        """Sustituye a los peores individuos por los inmigrantes (ya evaluados)."""
+        if not migrants:
+            return
+        order = sorted(range(len(self.population)), key=lambda i: self.population[i].fitness)
+        track = self.diversity_tracker.incremental
+        for i, (genes, fitness) in zip(order, migrants):
+            self.population[i] = Individual(genes, fitness=fitness)
+            if track:
+                self.diversity_tracker.assign(i, self.population[i].genome_hash())
+        self._last_diversity = None
+
+    # -------------------------------------------------- #
+    # Bucle principal
+    # -------------------------------------------------- #
+    def _record(self, gen: int, μ: float | None = None) -> None:
+        """Métricas, log, informe y estancamiento de la generación actual."""
         best, avg, div = self._collect_metrics()
-        μ = self._adaptive_mu(div)
-        self.logger.log(0, best.fitness, avg, div)
-        self._print_report(0, best, avg, div, μ)
+        if μ is None:
+            μ = self._adaptive_mu(div)
+        self.logger.log(gen, best.fitness, avg, div)
+        if self.report_every and gen % self.report_every == 0:
+            self._print_report(gen, best, avg, div, μ)
         self._update_stagnation()
 
-        # --- Generaciones siguientes -------------------------------- #
-        for gen in range(1, self.generations + 1):
-            best_prev = max(self.population, key=lambda ind: ind.fitness)
-            selected = self.operators.select(self.population)
+    def start(self) -> None:
+        """Generación 0: población inicial evaluada y registrada."""
+        self.budget.start()
+        self.initialize_population()
+        self.evaluate_population()
+        self._record(0)
+        self.budget.tick()
 
-            next_generation: List[Individual] = []
-            for i in range(0, len(selected), 2):
-                if i + 1 < len(selected):
-                    child_genes = self.operators.crossover(selected[i], selected[i + 1])
-                    next_generation.append(Individual(child_genes))
-                else:
-                    next_generation.append(selected[i])
+    def step(self, gen: int) -> bool:
+        """Avanza una generación. Devuelve True si se cumple una condición de parada."""
+        μ = self._next_generation(gen)
 
-            # ---- Mutación ------------------------------------------ #
-            diversity_prev = self._population_diversity()
-            μ = self._adaptive_mu(diversity_prev) * (self.anneal_factor ** gen)
-
-            for ind in next_generation:
-                incorrect = None
-                if hasattr(self.scenario, "incorrect_positions"):
-                    incorrect = self.scenario.incorrect_positions(ind.genes)
-
-                if incorrect and len(incorrect) <= self.micro_threshold:
-                    # micro-mutación agresiva sólo en estos genes
-                    self.operators.mutate(
-                        ind,
-                        mutation_rate=self.micro_mutation_rate,
-                        incorrect_positions=incorrect,
-                    )
-                else:
-                    # mutación adaptativa estándar
-                    self.operators.mutate(
-                        ind,
-                        mutation_rate=μ,
-                        incorrect_positions=incorrect,
-                    )
-
-            # ---- Elitismo & relleno ------------------------------- #
-            if next_generation:
-                next_generation[0] = copy.deepcopy(best_prev)
-            while len(next_generation) < self.population_size:
-                next_generation.append(copy.deepcopy(best_prev))
-
-            self.population = next_generation
-
-            # ---- Evaluación & métricas ---------------------------- #
-            self.evaluate_population()
-            best, avg, div = self._collect_metrics()
-            self.logger.log(gen, best.fitness, avg, div)
-            self._print_report(gen, best, avg, div, μ)
-            self._update_stagnation()
+        # ---- Evaluación & métricas ---------------------------- #
+        self.evaluate_population()
+        self._record(gen, μ)
+        self.budget.tick()
 
-            # ---- Condiciones de parada --------------------------- #
-            if self._optimal_fitness and self._best_fitness_so_far >= self._optimal_fitness:
+        # ---- Condiciones de parada --------------------------- #
+        if self._optimal_fitness and self._best_fitness_so_far >= self._optimal_fitness:
+            if self.report_every:
                 print(f"✅ Fitness óptima ({self._optimal_fitness}) alcanzada en la generación {gen}.")
-                break
+            return True
 
-            if self._no_improve_counter >= self.stagnation_patience:
+        if self._no_improve_counter >= self.stagnation_patience:
+            if self.report_every:
                 print(f"🛑 Sin mejora en {self.stagnation_patience} generaciones. Parando en la generación {gen}.")
-                break
+            return True
+
+        if self.budget.exhausted(self._best_fitness_so_far):
+            if self.report_every:
+                print(f"⏱️  {self.budget.describe()}. Parando en la generación {gen}.")
+            return True
+
+        return False
+
+    def evolve(self) -> Tuple[list, float]:
+        """Evoluciona hasta una condición de parada y devuelve el mejor (genes, fitness)."""
+        try:
+            self.start()
+            if not self.budget.exhausted(self._best_fitness_so_far):
+                for gen in range(1, self.generations + 1):
+                    if self.step(gen):
+                        break
+            best = self._best()
+            self.best = (best.gene_list(), best.fitness)
+        finally:
+            self.evaluator.close()
+        return self.best
+
+    def run(self) -> Tuple[list, float]:
+        """`evolve()` + CSV de métricas e informe final."""
+        self.evolve()
 
         # ---- Guardar métricas ------------------------------------ #
         csv_path = self.logger.save()
         print(f"📄 Métricas guardadas en '{csv_path}'.")
+        if self.fitness_cache is not None:
+            print(self.fitness_cache.report())
+        return self.best
@@ -0,0 +1,203 @@
+"""
+IslandEngine
+============
+
+Modelo de islas: varias instancias de `EvolutionEngine` (o de
+`NumpyEvolutionEngine`) en procesos separados, cada una con su propia
+población.
+
+• Cada `migration_interval` generaciones, cada isla envía sus
+  `migrants` mejores individuos al coordinador, que los reparte según la
+  topología (``ring`` o ``random``); los inmigrantes sustituyen a los
+  peores de la isla destino.
+• Si una isla alcanza la fitness óptima (o `target_fitness`), el resto
+  para en la siguiente migración.
+• `time_budget_ms` / `target_fitness` (en `engine_kwargs`) se aplican en
+  cada isla: cada motor para por su cuenta al agotar el presupuesto.
+• Todas las métricas terminan en un único CSV de `RunLogger` con una
+  columna ``island``.
+• Las islas no son procesos *daemon*: cada una puede evaluar con su
+  propio pool (``workers > 1`` en `engine_kwargs`). Si una muere, el
+  coordinador termina las demás y lanza `RuntimeError`.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import List, Tuple
+
+from .engine import EvolutionEngine
+from ..utils.parallel import mp_context
+from ..utils.run_logger import RunLogger
+
+TOPOLOGIES = ("ring", "random")
+
+
+# ─────────────────────────────────────────────────────────────
+# Proceso de cada isla
+# ─────────────────────────────────────────────────────────────
+def _island_main(island_id, scenario, engine_cls, engine_kwargs, conn,
+                 generations, interval, migrants, seed):
+    # tras un fork todas las islas heredarían el mismo estado de `random`
+    random.seed(None if seed is None else seed + island_id)
+
+    kwargs = dict(engine_kwargs)
+    if kwargs.get("seed") is not None:
+        kwargs["seed"] += island_id
+
+    engine = engine_cls(scenario, generations=generations, report_every=0, **kwargs)
+    try:
+        engine.start()
+        for gen in range(1, generations + 1):
+            stop = engine.step(gen)
+            if not stop and gen % interval == 0:
+                conn.send(("migrate", gen, engine.emigrants(migrants)))
+                incoming, stop = conn.recv()
+                engine.immigrate(incoming)
+            if stop:
+                break
+    finally:
+        engine.evaluator.close()
+
+    conn.send(("done", engine.logger.records, engine.emigrants(1)[0]))
+    conn.close()
+
+
+class IslandEngine:
+    def __init__(
+            self,
+            scenario,
+            n_islands: int = 4,
+            generations: int = 3000,
+            migration_interval: int = 25,
+            migrants: int = 2,
+            topology: str = "ring",
+            seed: int | None = None,
+            engine_cls=EvolutionEngine,
+            **engine_kwargs,
+    ):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Topología '{topology}' no reconocida {TOPOLOGIES}.")
+
+        self.scenario = scenario
+        self.n_islands = n_islands
+        self.generations = generations
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.topology = topology
+        self.seed = seed
+        self.engine_cls = engine_cls
+        self.engine_kwargs = engine_kwargs
+
+        self._rng = random.Random(seed)
+        self._optimal_fitness = scenario.max_fitness
+
+        self.logger = RunLogger(
+            scenario_name=f"{scenario.__class__.__name__}_islands",
+            extra_columns=("island",),
+        )
+        self.best: Tuple[list, float, int] | None = None  # (genes, fitness, isla)
+
+    # -------------------------------------------------- #
+    # Topología
+    # -------------------------------------------------- #
+    def _route(self, sources: List[int]) -> dict[int, int]:
+        """Para cada isla destino, la isla de la que recibe inmigrantes."""
+        if len(sources) < 2:
+            return {}
+        if self.topology == "ring":
+            return {dst: sources[k - 1] for k, dst in enumerate(sources)}
+
+        # random: permutación sin puntos fijos (nadie se envía a sí mismo)
+        while True:
+            shuffled = sources[:]
+            self._rng.shuffle(shuffled)
+            if all(src != dst for src, dst in zip(shuffled, sources)):
+                return dict(zip(sources, shuffled))
+
+    def _is_optimal(self, fitness: float) -> bool:
+        target = self.engine_kwargs.get("target_fitness")
+        if target is not None and fitness >= target:
+            return True
+        return bool(self._optimal_fitness) and fitness >= self._optimal_fitness
+
+    # -------------------------------------------------- #
+    # Bucle principal (coordinador)
+    # -------------------------------------------------- #
+    def run(self):
+        ctx = mp_context()
+        conns, procs = [], []
+        for i in range(self.n_islands):
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(
+                target=_island_main,
+                args=(i, self.scenario, self.engine_cls, self.engine_kwargs, child_conn,
+                      self.generations, self.migration_interval, self.migrants, self.seed),
+            )
+            proc.start()
+            child_conn.close()
+            conns.append(parent_conn)
+            procs.append(proc)
+
+        results: dict[int, tuple] = {}
+        active = list(range(self.n_islands))
+        optimum_reached = False
+
+        try:
+            while active:
+                outgoing: dict[int, list] = {}
+                gen = None
+                for i in active:
+                    try:
+                        msg = conns[i].recv()
+                    except EOFError:
+                        procs[i].join()
+                        raise RuntimeError(f"La isla {i} ha terminado inesperadamente "
+                                           f"(código de salida {procs[i].exitcode}).") from None
+                    if msg[0] == "done":
+                        results[i] = msg
+                        optimum_reached |= self._is_optimal(msg[2][1])
+                    else:
+                        _, gen, emigrants = msg
+                        outgoing[i] = emigrants
+                        optimum_reached |= any(self._is_optimal(f) for _, f in emigrants)
+
+                active = sorted(outgoing)
+                if not active:
+                    break
+
+                print(f"🏝️  Gen {gen:<4} - migración ({self.topology}) - mejores: "
+                      + " | ".join(f"I{i} {outgoing[i][0][1]:.3f}" for i in active))
+
+                routes = self._route(active)
+                for i in active:
+                    incoming = outgoing[routes[i]] if i in routes else []
+                    conns[i].send((incoming, optimum_reached))
+        except BaseException:
+            for proc in procs:  # las demás islas esperarían para siempre su migración
+                if proc.is_alive():
+                    proc.terminate()
+            raise
+        finally:
+            for conn in conns:
+                conn.close()
+            for proc in procs:
+                proc.join()
+
+        # ---- Métricas agregadas & mejor global ----------------- #
+        rows = sorted(
+            (rec + (i,) for i, (_, records, _) in results.items() for rec in records),
+            key=lambda r: (r[0], r[-1]),
+        )
+        for row in rows:
+            self.logger.log(*row)
+
+        island, (_, _, (genes, fitness)) = max(results.items(), key=lambda kv: kv[1][2][1])
+        self.best = (genes, fitness, island)
+
+        genes_str = "".join(genes) if genes and isinstance(genes[0], str) else str(genes)
+        print(f"🏆 Mejor global (isla {island}): {genes_str} (fit={fitness:.3f})")
+
+        csv_path = self.logger.save()
+        print(f"📄 Métricas guardadas en '{csv_path}'.")
+        return self.best
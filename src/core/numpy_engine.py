@@ -0,0 +1,112 @@
+from typing import Tuple
+
+from .engine import EvolutionEngine
+from ..models.individual import Individual
+from ..models.population_matrix import PopulationMatrix, np
+
+
+class NumpyEvolutionEngine(EvolutionEngine):
+    """
+    Variante de `EvolutionEngine` con la población en un `PopulationMatrix`:
+
+    • Genomas en una matriz ``uint8``/``float64`` y fitness en un vector.
+    • Torneo, cruce, mutación (adaptativa + micro-mutación) y métricas se
+      calculan con operaciones sobre arrays.
+    • Mismo esquema generacional que el motor clásico: un hijo por pareja,
+      élite en la fila 0 y relleno con copias del mejor anterior.
+    """
+
+    def __init__(self, scenario, seed: int | None = None, **kwargs):
+        super().__init__(scenario, **kwargs)
+        if np is None:
+            raise RuntimeError(
+                "El módulo 'numpy' no está instalado. "
+                "Ejecuta `pip install numpy` e inténtalo de nuevo."
+            )
+        self.rng = np.random.default_rng(seed)
+        self.population: PopulationMatrix | None = None
+
+    # -------------------------------------------------- #
+    # Población: creación y evaluación
+    # -------------------------------------------------- #
+    def initialize_population(self):
+        self.population = PopulationMatrix.from_scenario(self.scenario, self.population_size)
+
+    def evaluate_population(self):
+        self.population.fitness[:] = self._score(self.population.genes)
+
+    # -------------------------------------------------- #
+    # Métricas y utilidades
+    # -------------------------------------------------- #
+    def _population_diversity(self) -> int:
+        self._last_diversity = self.diversity_tracker.measure_hashes(self.population.row_hashes())
+        return self._last_diversity
+
+    def _best(self) -> Individual:
+        return self.population.individual(self.population.best_index())
+
+    def _collect_metrics(self) -> Tuple[Individual, float, int]:
+        return self._best(), self.population.average(), self._population_diversity()
+
+    # -------------------------------------------------- #
+    # Migración (modelo de islas)
+    # -------------------------------------------------- #
+    def emigrants(self, k: int):
+        pop = self.population
+        top = np.argsort(pop.fitness)[::-1][:k]
+        return [(pop.genes_list(i), float(pop.fitness[i])) for i in top]
+
+    def immigrate(self, migrants) -> None:
+        if not migrants:
+            return
+        pop = self.population
+        worst = np.argsort(pop.fitness)[:len(migrants)]
+        for i, (genes, fitness) in zip(worst, migrants):
+            if pop.is_char:
+                genes = np.frombuffer("".join(genes).encode("latin-1"), dtype=np.uint8)
+            pop.genes[i] = genes
+            pop.fitness[i] = fitness
+        self._last_diversity = None
+
+    # -------------------------------------------------- #
+    # Reproducción vectorizada
+    # -------------------------------------------------- #
+    def _next_generation(self, gen: int) -> float:
+        pop = self.population
+        n = len(pop)
+        elite = pop.genes[pop.best_index()].copy()
+
+        # ---- Selección por torneo & cruce por parejas ----------- #
+        selected = pop.tournament(self.rng)
+        n_pairs = n // 2
+        n_children = n_pairs + n % 2
+
+        next_genes = np.empty_like(pop.genes)
+        next_genes[:n_pairs] = pop.crossover(
+            self.rng, selected[0:2 * n_pairs:2], selected[1:2 * n_pairs:2]
+        )
+        if n % 2:
+            next_genes[n_pairs] = pop.genes[selected[-1]]
+
+        # ---- Mutación ------------------------------------------ #
+        diversity_prev = self._last_diversity
+        if diversity_prev is None:
+            diversity_prev = self._population_diversity()
+        μ = self._adaptive_mu(diversity_prev) * (self.anneal_factor ** gen)
+
+        children = next_genes[:n_children]
+        mask = pop.incorrect_mask(self.scenario, children)
+        if mask is None:
+            rates = μ
+        else:
+            n_incorrect = mask.sum(axis=1)
+            micro = (n_incorrect > 0) & (n_incorrect <= self.micro_threshold)
+            rates = np.where(micro, self.micro_mutation_rate, μ)
+        pop.mutate(self.rng, children, rates, mask)
+
+        # ---- Elitismo & relleno ------------------------------- #
+        next_genes[0] = elite
+        next_genes[n_children:] = elite
+
+        pop.genes = next_genes
+        return μ
@@ -0,0 +1,137 @@
+"""
+text_terms
+==========
+
+Fitness de texto como suma ponderada de términos declarados:
+
+    self.terms = WeightedTerms(self, [
+        # nombre        peso (atributo)  término: TextScan → número
+        ("bigram",      "W_BG",          word_bigrams),
+        ("repetition",  "W_REP",         doubled_chars),   # ≤ 0: penaliza
+    ])
+    fitness = self.terms(text)
+    detalle = self.terms.breakdown(text)  # {"bigram": …, "repetition": …}
+
+• Los pesos se leen del objeto dueño en cada llamada (``owner.W_BG``…):
+  cambiarlos en caliente surte efecto sin reconstruir nada.
+• Todos los términos comparten un único `TextScan` por genoma: cada vista
+  del texto (palabras, minúsculas, IDs del vocabulario…) se calcula la
+  primera vez que un término la pide y se reutiliza en el resto. Añadir
+  un término cuesta su propia reducción, no otra tokenización.
+• Los términos de penalización devuelven valores ≤ 0.
+• Términos = funciones de módulo u objetos invocables (no lambdas), para
+  que el escenario se pueda serializar hacia los workers (spawn).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from src import vocab
+
+_DOUBLED = re.compile(r"(.)\1")
+
+
+# palabra (minúsculas) → ID: las poblaciones repiten mucho las mismas palabras
+_WORD_IDS: Dict[str, int] = {}
+_WORD_IDS_MAX = 1 << 16
+
+
+def _word_id(word: str) -> int:
+    if len(_WORD_IDS) >= _WORD_IDS_MAX:
+        _WORD_IDS.clear()
+    i = _WORD_IDS[word] = vocab.lookup(word, vocab.UNK_ID)
+    return i
+
+
+class TextScan:
+    """Vistas de un texto, calculadas bajo demanda y una sola vez."""
+
+    __slots__ = ("text", "_lower_words", "_word_ids")
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lower_words = self._word_ids = None
+
+    @property
+    def lower_words(self) -> List[str]:
+        if self._lower_words is None:
+            self._lower_words = self.text.lower().split()
+        return self._lower_words
+
+    @property
+    def word_ids(self) -> List[int]:
+        """IDs del vocabulario de cada palabra (desconocidas → <unk>)."""
+        if self._word_ids is None:
+            get = _WORD_IDS.get
+            self._word_ids = [
+                i if (i := get(w)) is not None else _word_id(w) for w in self.lower_words
+            ]
+        return self._word_ids
+
+
+Term = Tuple[str, str, Callable[[TextScan], float]]  # (nombre, atributo del peso, función)
+
+
+class WeightedTerms:
+    def __init__(self, owner, terms: Sequence[Term]):
+        self.owner = owner
+        self.terms = list(terms)
+
+    def __call__(self, text: str) -> float:
+        scan, owner = TextScan(text), self.owner
+        fitness = 0.0
+        for _, weight, fn in self.terms:
+            fitness += getattr(owner, weight) * fn(scan)
+        return fitness
+
+    def breakdown(self, text: str) -> Dict[str, float]:
+        """Valor (sin ponderar) de cada término."""
+        scan = TextScan(text)
+        return {name: fn(scan) for name, _, fn in self.terms}
+
+
+# ─────────────────────────────────────────────────────────────
+# Términos de uso común
+# ─────────────────────────────────────────────────────────────
+def doubled_chars(scan: TextScan) -> int:
+    """−nº de dobles no solapados ("AA", "LL"…), como ``re.finditer(r"(.)\\1")``."""
+    return -len(_DOUBLED.findall(scan.text))
+
+
+def structure(scan: TextScan) -> int:
+    """+1 si empieza por letra, +1 si termina en punto."""
+    text = scan.text
+    return (text[:1].isalpha()) + text.endswith(".")
+
+
+class WordFrequency:
+    """Suma de la frecuencia de cada palabra (claves en minúsculas)."""
+
+    def __init__(self, freqs: Dict[str, int]):
+        self.freqs = freqs
+
+    def __call__(self, scan: TextScan) -> float:
+        get = self.freqs.get
+        return sum(get(w, 0) for w in scan.lower_words)
+
+
+class WordOverlap:
+    """Nº de palabras del texto presentes en `words` (sin distinguir mayúsculas)."""
+
+    def __init__(self, words):
+        self.words = frozenset(w.lower() for w in words)
+
+    def __call__(self, scan: TextScan) -> int:
+        return sum(map(self.words.__contains__, scan.lower_words))
+
+
+class WordBigrams:
+    """Fluidez de bigramas de palabras (`WordBigramTable`) sobre los IDs del texto."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __call__(self, scan: TextScan) -> float:
+        return self.table.score_word_ids(scan.word_ids)
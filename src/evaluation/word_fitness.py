@@ -0,0 +1,158 @@
+"""
+word_fitness
+============
+
+Fitness de frases word-level (`GAWord`) calculada directamente sobre
+secuencias de IDs del vocabulario; el texto sólo se decodifica para
+mostrarlo.
+
+• Tokens especiales (<pad>, <unk>, <bos>, <eos>) → se descartan por
+  rango de ID (`vocab.content_ids`), sin decodificar.
+• Duplicados → `dict` indexado por ID (orden de primera aparición).
+• Zipf → `vocab.zipf_table()`, un array indexado por ID.
+
+API:
+    score_ids(ids)        fitness de un genoma
+    score_many(genomes)   lista de fitness (unidad de trabajo del pool)
+    score_packed(pop)     vector de fitness de una `PackedPopulation`
+
+`WordFitness(bigram_weight)` ofrece las mismas tres funciones sumando
+`bigram_weight` × fluidez de bigramas de palabras (`utils/word_ngrams.py`,
+tabla cargada con `bigram_table()`).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Sequence
+
+from src import vocab
+from src.utils.genome_batch import np
+from src.utils.ngram_store import load_counts, prefer_store
+from src.utils.word_ngrams import WordBigramTable
+
+# ─ Parámetros ────────────────────────────────────────────────────────
+LEN_PEN_BASE = 5  # Nº palabras a partir del cual empieza a penalizar
+LEN_PEN_ALPHA = 1.10  # Factor exponencial de castigo
+WORD_BONUS = 0.30  # Premio por palabra
+WORD_BONUS_CAP = 6
+DUP_PENALTY = 1.00  # Castigo lineal por duplicados
+
+_DATA_DIR = Path(__file__).resolve().parents[2] / "data" / "processed"
+WORD_BIGRAM_FILE = _DATA_DIR / "es_word_bigrams.pkl"  # scripts/build_es_word_ngrams.py
+_bigram_table: WordBigramTable | None = None
+
+
+def bigram_table() -> WordBigramTable:
+    """
+    Tabla de bigramas de palabras por ID (se carga una vez por proceso).
+    Sin `es_word_bigrams.pkl` (ni su versión `.bin`, que se mapea en
+    memoria), se traduce a IDs desde es_unigrams/es_bigrams.
+    """
+    global _bigram_table
+    if _bigram_table is None:
+        path = prefer_store(WORD_BIGRAM_FILE)
+        if path.exists():
+            _bigram_table = WordBigramTable.load(path)
+        else:
+            _bigram_table = WordBigramTable.from_counts(
+                load_counts(_DATA_DIR / "es_unigrams.pkl"), load_counts(_DATA_DIR / "es_bigrams.pkl")
+            )
+    return _bigram_table
+
+
+def score_ids(ids: Sequence[int]) -> float:
+    """
+    • Zipf de palabras *únicas*             (mayor ⇒ mejor)
+    • Penalización suave de longitud
+    • Bonus moderado por nº de palabras
+    • Penalización lineal por repetición
+    """
+    zipf = vocab.zipf_table()
+    words = vocab.content_ids(ids)
+    if not words:
+        return 0.0
+
+    distinct = dict.fromkeys(words)  # IDs distintos, en orden de aparición
+
+    # 1) Frecuencia Zipf (sólo una vez por token distinto)
+    fit = sum(map(zipf.__getitem__, distinct))
+
+    # 2) Penalización por longitud excesiva
+    n = len(words)
+    if n > LEN_PEN_BASE:
+        fit /= LEN_PEN_ALPHA ** (n - LEN_PEN_BASE)
+
+    # 3) Bonus por nº de palabras
+    fit += WORD_BONUS * min(n, WORD_BONUS_CAP)
+
+    # 4) Penalización por duplicados
+    dup = n - len(distinct)  # apariciones extra
+    fit -= DUP_PENALTY * dup
+
+    return fit
+
+
+def score_many(genomes: Sequence[Sequence[int]]) -> List[float]:
+    """`score_ids` sobre un bloque de genomas."""
+    return [score_ids(g) for g in genomes]
+
+
+def score_packed(pop):
+    """
+    `score_ids` de toda una `PackedPopulation` con NumPy (mismos términos;
+    las sumas pueden diferir de la ruta escalar en el último bit).
+    """
+    zipf = np.frombuffer(vocab.zipf_table(), dtype=np.float64)
+    n_vocab, size = len(zipf), len(pop)
+
+    tokens = pop.tokens.astype(np.int64)
+    is_word = (tokens >= vocab.FIRST_WORD_ID) & (tokens < n_vocab)
+    seg = pop.segment_ids()[is_word]
+    n = np.bincount(seg, minlength=size)
+
+    # IDs distintos por genoma: claves (genoma, ID) ordenadas, primera aparición
+    keys = np.sort(seg * n_vocab + tokens[is_word])
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    uniq = keys[first]
+    useg = uniq // n_vocab
+    distinct = np.bincount(useg, minlength=size)
+
+    # 1) Zipf de los IDs distintos
+    fit = np.bincount(useg, weights=zipf[uniq % n_vocab], minlength=size)
+    # 2) Penalización por longitud excesiva
+    excess = np.maximum(n - LEN_PEN_BASE, 0)
+    fit /= LEN_PEN_ALPHA ** excess
+    # 3) Bonus por nº de palabras
+    fit += WORD_BONUS * np.minimum(n, WORD_BONUS_CAP)
+    # 4) Penalización por duplicados
+    fit -= DUP_PENALTY * (n - distinct)
+
+    fit[n == 0] = 0.0
+    return fit
+
+
+class WordFitness:
+    """Fitness de `GAWord` + `bigram_weight` × fluidez de bigramas de palabras."""
+
+    def __init__(self, bigram_weight: float = 0.0, bigrams: WordBigramTable | None = None):
+        self.bigram_weight = bigram_weight
+        if bigrams is None and bigram_weight:
+            bigrams = bigram_table()
+        self.bigrams = bigrams
+
+    def score_ids(self, ids: Sequence[int]) -> float:
+        fit = score_ids(ids)
+        if self.bigram_weight:
+            fit += self.bigram_weight * self.bigrams.score(ids)
+        return fit
+
+    def score_many(self, genomes: Sequence[Sequence[int]]) -> List[float]:
+        return [self.score_ids(g) for g in genomes]
+
+    def score_packed(self, pop):
+        fit = score_packed(pop)
+        if self.bigram_weight:
+            fit += self.bigram_weight * self.bigrams.score_packed(pop)
+        return fit
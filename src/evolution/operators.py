@@ -1,43 +1,61 @@
 import random
-import copy
 import string
+from array import array
 
 
 class EvolutionOperators:
     def __init__(self):
         self.charset = string.ascii_uppercase + " "
+        self.charset_codes = self.charset.encode("latin-1")
 
     # -------------------------------------------------- #
     # Selección por torneo
     # -------------------------------------------------- #
     def select(self, population, tournament_size=3):
+        """Los ganadores se devuelven como clones copia-en-escritura."""
         selected = []
         for _ in range(len(population)):
             tournament = random.sample(population, tournament_size)
             winner = max(tournament, key=lambda ind: ind.fitness)
-            selected.append(copy.deepcopy(winner))
+            selected.append(winner.clone())
         return selected
 
     # -------------------------------------------------- #
     # Crossover uniforme / aritmético
     # -------------------------------------------------- #
     def crossover(self, parent1, parent2):
-        child_genes = []
+        """Devuelve el genoma compacto del hijo (`bytearray` o `array('d')`)."""
+        return self.crossover_diff(parent1, parent2)[0]
 
-        for g1, g2 in zip(parent1.genes, parent2.genes):
-            if isinstance(g1, str):
-                # Favorecemos conservación de genes correctos
-                if random.random() < 0.9:
-                    gene = g1 if random.random() < 0.5 else g2
-                else:
-                    gene = random.choice(self.charset)
-            else:
-                alpha = 0.5
+    def crossover_diff(self, parent1, parent2):
+        """
+        Como `crossover`, pero devuelve también el conjunto de posiciones en
+        las que el hijo difiere de `parent1` (para la evaluación delta).
+        """
+        changed = set()
+
+        if not parent1.is_char:
+            alpha = 0.5
+            child_genes = array("d")
+            for i, (g1, g2) in enumerate(zip(parent1.genes, parent2.genes)):
                 gene = (1 - alpha) * g1 + alpha * g2
+                if gene != g1:
+                    changed.add(i)
+                child_genes.append(gene)
+            return child_genes, changed
 
+        child_genes = bytearray()
+        for i, (g1, g2) in enumerate(zip(parent1.genes, parent2.genes)):
+            # Favorecemos conservación de genes correctos
+            if random.random() < 0.9:
+                gene = g1 if random.random() < 0.5 else g2
+            else:
+                gene = random.choice(self.charset_codes)
+            if gene != g1:
+                changed.add(i)
             child_genes.append(gene)
 
-        return child_genes
+        return child_genes, changed
 
     # -------------------------------------------------- #
     # Mutación
@@ -57,9 +75,10 @@ class EvolutionOperators:
             incorrect_positions if incorrect_positions is not None else range(len(individual.genes))
         )
 
+        is_char = individual.is_char
         for i in positions:
             if random.random() < mutation_rate:
-                if isinstance(individual.genes[i], str):
-                    individual.genes[i] = random.choice(self.charset)
+                if is_char:
+                    individual.set_gene(i, random.choice(self.charset_codes))
                 else:
-                    individual.genes[i] += random.gauss(0, mutation_sigma)
+                    individual.set_gene(i, individual.genes[i] + random.gauss(0, mutation_sigma))
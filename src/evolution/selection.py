@@ -0,0 +1,181 @@
+"""
+selection
+=========
+
+Estrategias de selección de padres para poblaciones de tamaño arbitrario.
+
+Todas siguen el mismo protocolo:
+
+    sel.prepare(fits)   # una vez por generación: O(n) u O(n log n)
+    idx = sel.sample(k) # k índices de padres
+
+• ``roulette``   – ruleta con suma prefija + bisección (O(log n) por pick).
+• ``alias``      – ruleta con tabla de alias de Vose (O(1) por pick).
+• ``rank``       – ruleta sobre el ranking lineal (presión `pressure` ∈ [1, 2]).
+• ``tournament`` – torneo de `size` individuos; vectorizado con NumPy.
+
+Las ruletas admiten fitness negativas: si el mínimo es < 0 se desplazan
+los pesos para que empiece en 0; si todos los pesos son 0 el sorteo es
+uniforme.
+
+Con NumPy, `sample()` sortea los k padres de una vez con un generador
+sembrado desde `random` (reproducible con ``random.seed()``).
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Sequence
+
+from ..utils.genome_batch import np, has_numpy
+
+
+def _np_rng(rng):
+    return np.random.default_rng(rng.getrandbits(64)) if has_numpy() else None
+
+
+def _roulette_weights(fits: Sequence[float]) -> List[float]:
+    """Pesos ≥ 0 proporcionales a la fitness (desplazada si hay negativas)."""
+    low = min(fits)
+    if low < 0:
+        fits = [f - low for f in fits]
+    total = sum(fits)
+    if total <= 0:
+        return [1.0] * len(fits)
+    return [f / total for f in fits]
+
+
+# ─────────────────────────────────────────────────────────────
+# Ruleta (suma prefija)
+# ─────────────────────────────────────────────────────────────
+class RouletteSelection:
+    def __init__(self, rng=None):
+        self.rng = rng or random  # por defecto, el `random` global
+        self._np_rng = _np_rng(self.rng)
+        self._cum: List[float] = []
+
+    def _set_weights(self, weights: Sequence[float]) -> None:
+        if self._np_rng is not None:
+            self._cum = np.cumsum(weights)
+        else:
+            self._cum = list(accumulate(weights))
+
+    def prepare(self, fits: Sequence[float]) -> None:
+        self._set_weights(_roulette_weights(fits))
+
+    def sample(self, k: int) -> List[int]:
+        cum = self._cum
+        total, hi = cum[-1], len(cum) - 1
+        if self._np_rng is not None:
+            picks = np.searchsorted(cum, self._np_rng.random(k) * total, side="right")
+            return np.minimum(picks, hi).tolist()
+        rand = self.rng.random
+        return [bisect_right(cum, rand() * total, 0, hi) for _ in range(k)]
+
+
+# ─────────────────────────────────────────────────────────────
+# Ruleta (tabla de alias de Vose)
+# ─────────────────────────────────────────────────────────────
+class AliasSelection:
+    def __init__(self, rng=None):
+        self.rng = rng or random
+        self._np_rng = _np_rng(self.rng)
+        self._prob: List[float] = []
+        self._alias: List[int] = []
+
+    def prepare(self, fits: Sequence[float]) -> None:
+        n = len(fits)
+        scaled = [w * n for w in _roulette_weights(fits)]
+        prob, alias = [1.0] * n, list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # los restantes quedan con prob 1 (errores de redondeo)
+
+        self._prob, self._alias = prob, alias
+        if self._np_rng is not None:
+            self._prob, self._alias = np.asarray(prob), np.asarray(alias)
+
+    def sample(self, k: int) -> List[int]:
+        prob, alias, n = self._prob, self._alias, len(self._prob)
+        if self._np_rng is not None:
+            u = self._np_rng.random(k) * n
+            i = u.astype(np.int64)
+            return np.where(u - i < prob[i], i, alias[i]).tolist()
+        rand = self.rng.random
+        out = []
+        for _ in range(k):
+            u = rand() * n
+            i = int(u)
+            out.append(i if u - i < prob[i] else alias[i])
+        return out
+
+
+# ─────────────────────────────────────────────────────────────
+# Ranking lineal
+# ─────────────────────────────────────────────────────────────
+class RankSelection(RouletteSelection):
+    def __init__(self, pressure: float = 1.5, rng=None):
+        if not 1.0 <= pressure <= 2.0:
+            raise ValueError("pressure debe estar en [1, 2].")
+        super().__init__(rng)
+        self.pressure = pressure
+
+    def prepare(self, fits: Sequence[float]) -> None:
+        n = len(fits)
+        s = self.pressure
+        order = sorted(range(n), key=fits.__getitem__)  # peor → mejor
+        weights = [0.0] * n
+        for r, i in enumerate(order):
+            weights[i] = (2 - s) / n + (2 * r * (s - 1) / (n * (n - 1)) if n > 1 else 0.0)
+        self._set_weights(weights)
+
+
+# ─────────────────────────────────────────────────────────────
+# Torneo
+# ─────────────────────────────────────────────────────────────
+class TournamentSelection:
+    def __init__(self, size: int = 3, rng=None):
+        self.size = size
+        self.rng = rng or random
+        # generador NumPy sembrado desde `random` → reproducible con random.seed()
+        self._np_rng = _np_rng(self.rng)
+        self._fits = None
+
+    def prepare(self, fits: Sequence[float]) -> None:
+        self._fits = np.asarray(fits, dtype=np.float64) if has_numpy() else list(fits)
+
+    def sample(self, k: int) -> List[int]:
+        fits, n = self._fits, len(self._fits)
+        if self._np_rng is not None:
+            idx = self._np_rng.integers(0, n, size=(k, self.size))
+            winners = idx[np.arange(k), np.argmax(fits[idx], axis=1)]
+            return winners.tolist()
+
+        randrange = self.rng.randrange
+        return [
+            max((randrange(n) for _ in range(self.size)), key=fits.__getitem__)
+            for _ in range(k)
+        ]
+
+
+SELECTIONS = {
+    "roulette": RouletteSelection,
+    "alias": AliasSelection,
+    "rank": RankSelection,
+    "tournament": TournamentSelection,
+}
+
+
+def make_selection(name: str, **kwargs):
+    cls = SELECTIONS.get(name)
+    if cls is None:
+        raise ValueError(f"Selección '{name}' no reconocida {tuple(SELECTIONS)}.")
+    return cls(**kwargs)
@@ -10,7 +10,9 @@ Descripción rápida
 ──────────────────
 • Optimiza la “naturalidad” de frases en castellano sin objetivo explícito.
 • Fitness = frecuencia Zipf (wordfreq) + heurísticos anti-repetición,
-  bonus por longitud razonable, etc.
+  bonus por longitud razonable, etc. La fitness trabaja directamente sobre
+  IDs (`src/evaluation/word_fitness.py`); el texto sólo se decodifica
+  para mostrarlo.
 • Se apoya en el módulo local `vocab.py`, que mapea palabras ↔ ID.
 """
 
@@ -18,26 +20,33 @@ from __future__ import annotations
 
 # ───── imports estándar ──────────────────────────────────────────────
 from pathlib import Path
-from typing import List, Tuple, Iterable
-import random, time, csv, argparse, pickle, sys
-from collections import Counter
+from typing import List, Tuple, Iterable, Sequence
+import random, re, time, argparse, sys
 
 # ───── terceros ──────────────────────────────────────────────────────
-from wordfreq import zipf_frequency
-
 try:
     from colorama import Fore, Style;
 
     Fore.OK = Fore.GREEN
 except Exception:  # colorama no instalado
     class _Dummy:
-        RESET = OK = RED = CYAN = ""
+        RESET = RESET_ALL = OK = RED = CYAN = ""
 
 
     Fore = Style = _Dummy()  # type: ignore
 
 # ───── internos ──────────────────────────────────────────────────────
 from src import vocab
+from src.evaluation import word_fitness
+from src.evolution.selection import SELECTIONS, make_selection
+from src.models.packed_population import PackedPopulation
+from src.utils.genome_batch import np
+from src.utils.budget import RunBudget
+from src.utils.diversity import DiversityTracker
+from src.utils.fitness_cache import FitnessCache
+from src.utils.hall_of_fame import HallOfFame
+from src.utils.parallel import ParallelEvaluator
+from src.utils.run_logger import CsvMetricsWriter
 # ─────────────────────────────────────────────────────────────────────
 # Parámetros por defecto (pueden sobre-escribirse al instanciar GAWord)
 # ─────────────────────────────────────────────────────────────────────
@@ -48,12 +57,9 @@ NO_IMPROVE_LIMIT = 400
 MUT_RATE = 0.025  # prob. de mutación por gen (≈ palabra)
 ELITISM = 2  # nº individuos que pasan sin cambios
 
-# ─ Fitness ───────────────────────────────────────────────────────────
-LEN_PEN_BASE = 5  # Nº palabras a partir del cual empieza a penalizar
-LEN_PEN_ALPHA = 1.10  # Factor exponencial de castigo
-WORD_BONUS = 0.30  # Premio por palabra
-WORD_BONUS_CAP = 6
-DUP_PENALTY = 1.00  # Castigo lineal por duplicados
+# ─ Sesión (arranque en caliente) ─────────────────────────────────────
+WARM_CARRY = 0.6  # fracción de la población anterior que pasa al nuevo turno
+PROMPT_SEED_FRAC = 0.2  # fracción de semillas derivadas del prompt
 
 # ─ Tipado ────────────────────────────────────────────────────────────
 Genome = List[int]  # secuencia de IDs (incl. BOS/EOS)
@@ -89,6 +95,10 @@ def _mutate(g: Genome) -> Genome:
     return out
 
 
+def _genome_hash(g: Genome) -> int:
+    return hash(tuple(g))
+
+
 def _crossover(a: Genome, b: Genome) -> Genome:
     """Cruzamiento 1-punto (en palabras)."""
     cut_a = random.randrange(1, len(a) - 1)
@@ -96,38 +106,28 @@ def _crossover(a: Genome, b: Genome) -> Genome:
     return a[:cut_a] + b[cut_b:]
 
 
-# ═════════════════════════════════════════════════════════════════════
-#   FUNCIÓN DE FITNESS
-# ═════════════════════════════════════════════════════════════════════
-def _fitness(g: Genome) -> float:
+def prompt_seeds(prompt: str, n: int) -> List[Genome]:
     """
-    • Zipf de palabras *únicas*             (mayor ⇒ mejor)
-    • Penalización suave de longitud
-    • Bonus moderado por nº de palabras
-    • Penalización lineal por repetición
+    Hasta `n` genomas derivados del prompt: la frase con sus palabras
+    conocidas y variantes (fragmentos contiguos mutados).
     """
-    words = vocab.decode(g, skip_special=True).split()
-    if not words:
-        return 0.0
-
-    cnt = Counter(words)
+    words = vocab.content_ids(vocab.encode(re.sub(r"[^\w\s]", " ", prompt), add_bos_eos=False))
+    if not words or n <= 0:
+        return []
+    seeds = [[vocab.BOS_ID] + words + [vocab.EOS_ID]]
+    while len(seeds) < n:
+        i = random.randrange(len(words))
+        j = random.randint(i + 1, len(words))
+        seeds.append(_mutate([vocab.BOS_ID] + words[i:j] + [vocab.EOS_ID]))
+    return seeds
 
-    # 1) Frecuencia Zipf (sólo una vez por token distinto)
-    fit = sum(zipf_frequency(w, "es") for w in cnt)
 
-    # 2) Penalización por longitud excesiva
-    n = len(words)
-    if n > LEN_PEN_BASE:
-        fit /= LEN_PEN_ALPHA ** (n - LEN_PEN_BASE)
-
-    # 3) Bonus por nº de palabras
-    fit += WORD_BONUS * min(n, WORD_BONUS_CAP)
-
-    # 4) Penalización por duplicados
-    dup = n - len(cnt)  # apariciones extra
-    fit -= DUP_PENALTY * dup
-
-    return fit
+# ═════════════════════════════════════════════════════════════════════
+#   FUNCIÓN DE FITNESS (ver src/evaluation/word_fitness.py)
+# ═════════════════════════════════════════════════════════════════════
+_fitness = word_fitness.score_ids
+_fitness_batch = word_fitness.score_many
+_fitness_packed = word_fitness.score_packed
 
 
 # ═════════════════════════════════════════════════════════════════════
@@ -145,93 +145,245 @@ class GAWord:
         • Nº de generación
         • Fitness del mejor individuo actual
         • El genoma (lista de IDs)
+
+    Modo sesión (`persistent=True`): run() puede llamarse varias veces
+    sobre la misma instancia; vocabulario, tablas, pool de procesos, CSV
+    y hall of fame se mantienen entre llamadas, `warm_start()` prepara la
+    población del siguiente turno y `close()` libera los recursos.
+
+    Modo *anytime*: con `time_budget_ms` y/o `target_fitness` cada llamada
+    a run() para al agotar el presupuesto (ver `utils/budget.py`); el
+    último genoma emitido es siempre el mejor hasta ese momento.
+
+    Con `save_runs=False` no se escribe nada en disco: métricas y hall of
+    fame sólo en memoria (p. ej. las sesiones de `src/server.py`).
     """
 
     # ─── construcción ────────────────────────────────────────────────
     def __init__(self,
                  pop_size: int = DEF_POP_SIZE,
                  max_gens: int = DEF_MAX_GENS,
-                 runs_dir: Path | str | None = None):
+                 runs_dir: Path | str | None = None,
+                 workers: int = 1,
+                 fitness_cache: FitnessCache | None = None,
+                 diversity_mode: str = "exact",
+                 selection: str = "roulette",
+                 report_every: int = 1,
+                 quiet: bool = False,
+                 flush_every: int = 100,
+                 hof_size: int = 10,
+                 hof_interval: float = 5.0,
+                 packed: bool = False,
+                 persistent: bool = False,
+                 time_budget_ms: float | None = None,
+                 target_fitness: float | None = None,
+                 bigram_weight: float = 0.0,
+                 save_runs: bool = True):
 
         # parámetros
         self.pop_size = pop_size
         self.max_gens = max_gens
+        self.persistent = persistent
+        self.generation = 0  # generaciones acumuladas (todas las llamadas a run())
+        # presupuesto por llamada a run() (tiempo de reloj / calidad objetivo)
+        self.budget = RunBudget(time_budget_ms, target_fitness)
+        # consola: una línea cada `report_every` generaciones (0 / quiet → ninguna)
+        self.report_every = 0 if quiet else report_every
+
+        # evaluación (pool de procesos si workers > 1); las tablas (Zipf,
+        # bigramas) se cargan antes de arrancar el pool para que los workers
+        # las hereden
+        vocab.zipf_table()
+        # packed → población CSR (`PackedPopulation`) con operadores por lotes
+        self.packed = packed
+        if packed and fitness_cache is not None:
+            raise ValueError("La caché de fitness no se usa con la población empaquetada.")
+        # bigram_weight > 0 → suma la fluidez de bigramas de palabras (por ID)
+        self.scorer = word_fitness.WordFitness(bigram_weight)
+        self.evaluator = ParallelEvaluator(
+            self.scorer.score_packed if packed else self.scorer.score_many, workers
+        )
+        self.fitness_cache = fitness_cache
+        self.diversity_tracker = DiversityTracker(diversity_mode)
+        self.selection = make_selection(selection)
 
         # población inicial
-        self.pop: List[Genome] = [_random_genome() for _ in range(pop_size)]
-        self.fits: List[float] = [_fitness(g) for g in self.pop]
-
-        # carpeta y CSV de métricas
-        runs_root = Path(runs_dir or Path(__file__).resolve().parent.parent / "runs")
-        runs_root.mkdir(exist_ok=True)
-        ts = time.strftime("%Y-%m-%dT%H-%M-%S")
-        self.csv_path = runs_root / f"{ts}_run_word.csv"
-
-        with self.csv_path.open("w", newline="", encoding="utf-8") as fh:
-            csv.writer(fh).writerow(["gen", "best_fit", "avg_fit", "diversity"])
-
-        # para dump del mejor
-        self.best_pickle = runs_root / f"{ts}_best_sentence.pkl"
+        genomes = [_random_genome() for _ in range(pop_size)]
+        if packed:
+            self.rng = np.random.default_rng(random.getrandbits(64))
+            self.pop: List[Genome] | PackedPopulation = PackedPopulation.from_genomes(genomes)
+        else:
+            self.pop = genomes
+        self._reset_diversity()
+        # se evalúa en el primer run(): un `warm_start()` previo la reemplaza
+        self.fits: List[float] | None = None
+
+        # carpeta y CSV de métricas (save_runs=False → nada en disco)
+        self.csv_path: Path | None = None
+        self.metrics: CsvMetricsWriter | None = None
+        hof_path = None
+        if save_runs:
+            runs_root = Path(runs_dir or Path(__file__).resolve().parent.parent / "runs")
+            runs_root.mkdir(exist_ok=True)
+            ts = time.strftime("%Y-%m-%dT%H-%M-%S")
+            self.csv_path = runs_root / f"{ts}_run_word.csv"
+            self.metrics = CsvMetricsWriter(
+                self.csv_path, ["gen", "best_fit", "avg_fit", "diversity"], flush_every
+            )
+            hof_path = runs_root / f"{ts}_hall_of_fame.pkl"
+
+        # archivo de las mejores frases distintas (se guarda en segundo plano)
+        self.hall_of_fame = HallOfFame(hof_size, hof_path, flush_interval=hof_interval)
+        self.closed = False
+
+    # ─── evaluación ──────────────────────────────────────────────────
+    def _evaluate(self, pop) -> List[float]:
+        if self.fitness_cache is not None:
+            return self.fitness_cache.evaluate(pop, self.evaluator)
+        fits = self.evaluator(pop)
+        return fits.tolist() if self.packed and not isinstance(fits, list) else fits
+
+    # ─── sesión ──────────────────────────────────────────────────────
+    def warm_start(self, seeds: Sequence[Genome] = (), carry: float = WARM_CARRY) -> None:
+        """
+        Población del siguiente turno: la fracción `carry` mejor de la
+        actual + `seeds` (p. ej. `prompt_seeds()`) + frases aleatorias
+        hasta completar `pop_size`. Sin evaluar: run() lo hace al empezar.
+        """
+        seeds = [list(s) for s in seeds][:self.pop_size]
+        genomes = []
+        if self.fits is not None:  # población aún sin evaluar → nada que conservar
+            n_keep = min(int(self.pop_size * carry), self.pop_size - len(seeds))
+            order = sorted(range(self.pop_size), key=self.fits.__getitem__, reverse=True)
+            genomes = [self.pop[i] for i in order[:n_keep]]
+        genomes += seeds
+        genomes += [_random_genome() for _ in range(self.pop_size - len(genomes))]
+        self.pop = PackedPopulation.from_genomes(genomes) if self.packed else genomes
+        self._reset_diversity()
+        self.fits = None
+
+    # ─── reproducción ────────────────────────────────────────────────
+    def _breed(self, elites: List[int], parents: List[int]):
+        """Élites + un hijo (cruce y mutación) por cada par de `parents`."""
+        if self.packed:
+            children = self.pop.crossover(self.rng, parents[0::2], parents[1::2])
+            children = children.mutate(self.rng, MUT_RATE, vocab.FIRST_WORD_ID, vocab.vocab_size())
+            return self.pop.take(elites).concat(children)
+
+        new_pop: List[Genome] = [self.pop[i] for i in elites]
+        for k in range(0, len(parents), 2):
+            p1, p2 = self.pop[parents[k]], self.pop[parents[k + 1]]
+            child = _crossover(p1, p2)
+            child = _mutate(child)
+            new_pop.append(child)
+
+        # diversidad incremental: las élites conservan su hash, sólo se
+        # calcula el de los hijos
+        tracker = self.diversity_tracker
+        if tracker.incremental:
+            tracker.assign_all([tracker.slots[i] for i in elites]
+                               + [_genome_hash(g) for g in new_pop[len(elites):]])
+        return new_pop
+
+    # ─── diversidad ──────────────────────────────────────────────────
+    def _reset_diversity(self) -> None:
+        """Población nueva completa (modo exacto, población en lista)."""
+        if not self.packed and self.diversity_tracker.incremental:
+            self.diversity_tracker.reset(map(_genome_hash, self.pop))
+
+    def _diversity(self) -> int:
+        tracker = self.diversity_tracker
+        if self.packed:  # hashes de todas las filas en una pasada vectorizada
+            return tracker.measure_hashes(self.pop.row_hashes())
+        if tracker.incremental:
+            return tracker.distinct()
+        return tracker.measure(self.pop, _genome_hash)
 
     # ─── logging interno ─────────────────────────────────────────────
     def _log(self, gen: int, best_g: Genome, best_f: float) -> None:
         avg_f = sum(self.fits) / len(self.fits)
-        diversity = len({tuple(g) for g in self.pop})
-        sent = vocab.decode(best_g)
+        diversity = self._diversity()
+        if self.metrics is not None:
+            self.metrics.write(gen, best_f, avg_f, diversity)
+
+        if not self.report_every or gen % self.report_every:
+            return
 
+        sent = vocab.decode(best_g)
         col = Fore.OK if gen == 0 or best_f == max(self.fits) else ""
         print(f"{col}Gen {gen:<4d} • Mejor: {sent} (fit={best_f:,.3f}) "
               f"- Avg {avg_f:,.2f} - Div {diversity} - μ {MUT_RATE}{Style.RESET_ALL}")
 
-        with self.csv_path.open("a", newline="", encoding="utf-8") as fh:
-            csv.writer(fh).writerow([gen, best_f, avg_f, diversity])
-
     # ─── bucle GA (generador) ────────────────────────────────────────
     def run(self) -> Iterable[Tuple[int, float, Genome]]:
-        best_fit, best_genome, best_gen = -1.0, None, 0
-
-        for gen in range(self.max_gens + 1):
-            # registro & yield
-            idx_best = max(range(self.pop_size), key=self.fits.__getitem__)
-            cur_best_fit = self.fits[idx_best]
-            cur_best_gen = self.pop[idx_best]
-
-            if cur_best_fit > best_fit:
-                best_fit, best_genome, best_gen = cur_best_fit, cur_best_gen, gen
-                # guardamos dump cada vez que hay nuevo récord
-                with self.best_pickle.open("wb") as fh:
-                    pickle.dump(best_genome, fh)
-
-            self._log(gen, cur_best_gen, cur_best_fit)
-            yield gen, cur_best_fit, cur_best_gen
-
-            # parada si no mejora
-            if gen - best_gen >= NO_IMPROVE_LIMIT:
-                print(f"{Fore.RED}🛑 Sin mejora en {NO_IMPROVE_LIMIT} generaciones. "
-                      f"Paro en la {gen}.{Style.RESET_ALL}")
-                break
-
-            # selección (ruleta)
-            total_fit = sum(self.fits)
-            probs = [f / total_fit for f in self.fits]
-            new_pop: List[Genome] = []
-
-            # elitismo
-            elites = sorted(zip(self.pop, self.fits),
-                            key=lambda x: x[1],
-                            reverse=True)[:ELITISM]
-            new_pop.extend([e[0] for e in elites])
-
-            # reproducción
-            while len(new_pop) < self.pop_size:
-                p1, p2 = random.choices(self.pop, weights=probs, k=2)
-                child = _crossover(p1, p2)
-                child = _mutate(child)
-                new_pop.append(child)
-
-            # nueva generación
-            self.pop = new_pop
-            self.fits = [_fitness(g) for g in self.pop]
+        best_fit, best_gen = -1.0, 0
+        gen0 = self.generation
+        # la evaluación de la población inicial cuenta como la generación 0
+        self.budget.start()
+        if self.fits is None:
+            self.fits = self._evaluate(self.pop)
+
+        try:
+            for gen in range(self.max_gens + 1):
+                # registro & yield
+                idx_best = max(range(self.pop_size), key=self.fits.__getitem__)
+                cur_best_fit = self.fits[idx_best]
+                cur_best_gen = self.pop[idx_best]
+
+                if cur_best_fit > best_fit:
+                    best_fit, best_gen = cur_best_fit, gen
+                self.hall_of_fame.update(self.pop, self.fits)
+
+                self.generation = gen0 + gen
+                self._log(self.generation, cur_best_gen, cur_best_fit)
+                yield gen, cur_best_fit, cur_best_gen
+
+                # parada si no mejora
+                if gen - best_gen >= NO_IMPROVE_LIMIT:
+                    print(f"{Fore.RED}🛑 Sin mejora en {NO_IMPROVE_LIMIT} generaciones. "
+                          f"Paro en la {gen}.{Style.RESET_ALL}")
+                    break
+
+                # parada por presupuesto (¿cabe otra generación?)
+                self.budget.tick()
+                if self.budget.exhausted(best_fit):
+                    if self.report_every:
+                        print(f"{Fore.CYAN}⏱️  {self.budget.describe()}. "
+                              f"Paro en la {gen}.{Style.RESET_ALL}")
+                    break
+
+                # selección: se prepara una vez por generación y se
+                # sortean de golpe todos los padres
+                n_children = self.pop_size - ELITISM
+                self.selection.prepare(self.fits)
+                parents = self.selection.sample(2 * max(n_children, 0))
+
+                # elitismo (índices de los mejores, orden estable)
+                elites = sorted(range(self.pop_size),
+                                key=self.fits.__getitem__,
+                                reverse=True)[:ELITISM]
+
+                # nueva generación
+                self.pop = self._breed(elites, parents)
+                self.fits = self._evaluate(self.pop)
+        finally:
+            self.generation += 1
+            if not self.persistent:
+                self.close()
+            elif self.metrics is not None:
+                self.metrics.flush()
+
+    def close(self) -> None:
+        """Cierra CSV, hall of fame y pool (automático al acabar run() si no es persistente)."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.metrics is not None:
+            self.metrics.close()
+        self.hall_of_fame.close()
+        self.evaluator.close()
+        if self.fitness_cache is not None:
+            print(self.fitness_cache.report())
 
 
 # ═════════════════════════════════════════════════════════════════════
@@ -248,6 +400,28 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
                    help=f"Nº máximo de generaciones (def. {DEF_MAX_GENS})")
     p.add_argument("--seed", type=int, default=None,
                    help="Semilla RNG (para reproducibilidad)")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Procesos para evaluar la fitness (def. 1 = sin pool)")
+    p.add_argument("--diversity", choices=["exact", "sample", "hll"], default="exact",
+                   help="Cálculo de la diversidad (def. exact)")
+    p.add_argument("--cache-size", type=int, default=0,
+                   help="Entradas de la caché LRU de fitness (def. 0 = sin caché)")
+    p.add_argument("--selection", choices=list(SELECTIONS), default="roulette",
+                   help="Estrategia de selección de padres (def. roulette)")
+    p.add_argument("--report-every", type=int, default=1,
+                   help="Mostrar una línea cada N generaciones (def. 1)")
+    p.add_argument("--quiet", action="store_true",
+                   help="Sin salida por generación (el CSV se sigue escribiendo)")
+    p.add_argument("--hof-size", type=int, default=10,
+                   help="Frases distintas que guarda el hall of fame (def. 10)")
+    p.add_argument("--packed", action="store_true",
+                   help="Población empaquetada (CSR) con operadores por lotes; requiere numpy")
+    p.add_argument("--bigram-weight", type=float, default=0.0,
+                   help="Peso de la fluidez de bigramas de palabras (def. 0 = sólo Zipf)")
+    p.add_argument("--time-budget-ms", type=float, default=None,
+                   help="Tiempo máximo de la ejecución en ms (def. sin límite)")
+    p.add_argument("--target-fitness", type=float, default=None,
+                   help="Parar al alcanzar esta fitness (def. sin objetivo)")
 
     return p.parse_args(argv)
 
@@ -259,18 +433,31 @@ def _main():
         random.seed(args.seed)
 
     ga = GAWord(pop_size=args.pop_size,
-                max_gens=args.max_gens)
+                max_gens=args.max_gens,
+                workers=args.workers,
+                diversity_mode=args.diversity,
+                selection=args.selection,
+                report_every=args.report_every,
+                quiet=args.quiet,
+                hof_size=args.hof_size,
+                packed=args.packed,
+                time_budget_ms=args.time_budget_ms,
+                target_fitness=args.target_fitness,
+                bigram_weight=args.bigram_weight,
+                fitness_cache=FitnessCache(args.cache_size) if args.cache_size > 0 else None)
 
     # iteramos sin hacer nada extra; run() ya loguea en consola/CSV
     for _ in ga.run():
         pass
 
-    # muestra el campeón final
-    with ga.best_pickle.open("rb") as fh:
-        best = pickle.load(fh)
+    # muestra el campeón final y las alternativas
+    hof = ga.hall_of_fame
+    best, best_fit = hof[0]
     print(f"\n🏆  Mejor global →  «{vocab.decode(best)}»  "
-          f"(fit={_fitness(best):.3f})")
-    print(f"📦  Dump guardado en: {ga.best_pickle}")
+          f"(fit={best_fit:.3f})")
+    for rank, (genome, fit) in enumerate(hof.top(5)[1:], start=2):
+        print(f"    #{rank} «{vocab.decode(genome)}» (fit={fit:.3f})")
+    print(f"📦  Hall of fame ({len(hof)}) guardado en: {hof.path}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,117 @@
+from array import array
+
+
+def _compact(genes):
+    """Lista de genes → `bytearray` (caracteres latin-1) o `array('d')` (numéricos)."""
+    if isinstance(genes, (bytearray, array)):
+        return genes
+    if isinstance(genes, (bytes, str)):
+        return bytearray(genes.encode("latin-1") if isinstance(genes, str) else genes)
+    if not genes:
+        return bytearray()
+    if isinstance(genes[0], str):
+        return bytearray("".join(genes).encode("latin-1"))
+    return array("d", genes)
+
+
 class Individual:
-    def __init__(self, genes=None):
-        self.genes = genes or []
-        self.fitness = None
+    """
+    Individuo con genoma compacto y copia-en-escritura.
+
+    • Genes de caracteres → `bytearray` (1 byte por gen).
+    • Genes numéricos     → `array('d')`.
+    • `clone()` comparte el buffer; la primera escritura con `set_gene()`
+      hace la copia real.
+    • El hash del genoma se calcula una vez y lo heredan los clones.
+    • Opcionalmente recuerda un genoma *base* (padre) con su fitness y las
+      posiciones modificadas desde entonces, para la evaluación delta.
+    """
+
+    __slots__ = ("_genes", "_shared", "_hash", "_base", "_changed", "fitness")
+
+    def __init__(self, genes=None, fitness=None):
+        self._genes = _compact(genes)
+        self._shared = False
+        self._hash = None
+        self._base = None
+        self._changed = None
+        self.fitness = fitness
+
+    # ------------------------------------------------------------------ #
+    # Acceso a los genes
+    # ------------------------------------------------------------------ #
+    @property
+    def genes(self):
+        """Buffer compacto (sólo lectura: para escribir usa `set_gene`)."""
+        return self._genes
+
+    @property
+    def is_char(self) -> bool:
+        return isinstance(self._genes, bytearray)
+
+    def as_sequence(self):
+        """Genes como secuencia indexable de caracteres (`str`) o floats (`array`)."""
+        return self._genes.decode("latin-1") if self.is_char else self._genes
+
+    def gene_list(self) -> list:
+        """Genes en la forma clásica: lista de caracteres o de floats."""
+        return list(self.as_sequence())
+
+    def key(self) -> bytes:
+        """Contenido del genoma como `bytes` (para conjuntos/diccionarios)."""
+        return bytes(self._genes) if self.is_char else self._genes.tobytes()
+
+    def genome_hash(self) -> int:
+        """Hash del contenido del genoma (cacheado hasta la siguiente escritura)."""
+        if self._hash is None:
+            self._hash = hash(self.key())
+        return self._hash
+
+    def __len__(self) -> int:
+        return len(self._genes)
+
+    # ------------------------------------------------------------------ #
+    # Copia-en-escritura
+    # ------------------------------------------------------------------ #
+    def clone(self) -> "Individual":
+        twin = Individual.__new__(Individual)
+        twin._genes = self._genes
+        twin._shared = self._shared = True
+        twin._hash = self._hash
+        twin.fitness = self.fitness
+        twin.derive(self._genes, self.fitness, set())
+        return twin
+
+    def set_gene(self, i: int, value) -> None:
+        if self._shared:
+            self._genes = self._genes[:]
+            self._shared = False
+        self._genes[i] = value
+        self._hash = None
+        if self._changed is not None:
+            self._changed.add(i)
+
+    # ------------------------------------------------------------------ #
+    # Evaluación delta
+    # ------------------------------------------------------------------ #
+    def derive(self, base_genes, base_fitness, changed: set) -> None:
+        """Registra el genoma base y las posiciones que difieren de él."""
+        if base_fitness is None:
+            self._base = self._changed = None
+        else:
+            self._base = (base_genes, base_fitness)
+            self._changed = changed
+
+    def delta_info(self):
+        """(genes base, fitness base, posiciones cambiadas) o None si no hay base."""
+        if self._base is None:
+            return None
+        return self._base[0], self._base[1], self._changed
+
+    def settle(self) -> None:
+        """Olvida el genoma base (tras evaluar)."""
+        self._base = self._changed = None
 
     def __repr__(self):
-        genes_str = ''.join(self.genes) if all(isinstance(g, str) for g in self.genes) else str(self.genes)
+        genes_str = self.as_sequence() if self.is_char else str(list(self._genes))
         return f"Individual(genes={genes_str}, fitness={self.fitness})"
@@ -0,0 +1,194 @@
+"""
+PackedPopulation
+================
+
+Población de genomas de longitud variable (frases de IDs de `GAWord`)
+en formato CSR:
+
+• ``tokens``  – buffer plano ``int32`` con todos los IDs seguidos.
+• ``offsets`` – ``int64`` (pop_size + 1,); el genoma i es
+  ``tokens[offsets[i]:offsets[i + 1]]``.
+
+Cruce en un punto, mutación (sustitución / inserción / borrado) y hash
+de cada genoma se hacen sobre la población completa con operaciones
+vectorizadas: cada generación produce dos arrays nuevos en lugar de
+miles de listas Python.
+
+El primer y el último token de cada genoma (BOS/EOS) nunca se tocan.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence
+
+# ─────────────────────────────────────────────────────────────
+# Dependencia opcional: numpy
+# ─────────────────────────────────────────────────────────────
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+_HASH_MULT = 0x100000001B3
+
+
+class PackedPopulation:
+    def __init__(self, tokens, offsets):
+        if np is None:
+            raise RuntimeError(
+                "El módulo 'numpy' no está instalado. "
+                "Ejecuta `pip install numpy` e inténtalo de nuevo."
+            )
+        self.tokens = tokens
+        self.offsets = offsets
+
+    # ------------------------------------------------------------------ #
+    # Construcción / conversión
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_genomes(cls, genomes: Sequence[Sequence[int]]) -> "PackedPopulation":
+        lengths = np.fromiter((len(g) for g in genomes), dtype=np.int64, count=len(genomes))
+        offsets = np.zeros(len(genomes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        tokens = np.fromiter(
+            (t for g in genomes for t in g), dtype=np.int32, count=int(offsets[-1])
+        )
+        return cls(tokens, offsets)
+
+    @classmethod
+    def _from_lengths(cls, tokens, lengths) -> "PackedPopulation":
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(tokens, offsets)
+
+    def genomes(self) -> List[List[int]]:
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, item):
+        """`pop[i]` → lista de IDs; `pop[a:b]` → `PackedPopulation` (p. ej. para el pool)."""
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return self.take(np.arange(start, stop, step))
+            lo, hi = self.offsets[start], self.offsets[stop]
+            return PackedPopulation(self.tokens[lo:hi].copy(), self.offsets[start:stop + 1] - lo)
+        return self.tokens[self.offsets[item]:self.offsets[item + 1]].tolist()
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def segment_ids(self):
+        """Índice de genoma de cada posición de `tokens`."""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def positions(self):
+        """Posición de cada token dentro de su genoma."""
+        return np.arange(len(self.tokens)) - np.repeat(self.offsets[:-1], self.lengths)
+
+    # ------------------------------------------------------------------ #
+    # Reordenación
+    # ------------------------------------------------------------------ #
+    def _gather(self, new_lengths, src_of):
+        """
+        Construye una población con longitudes `new_lengths`; `src_of(seg, pos)`
+        da, para cada posición de salida, el índice de origen en `tokens`.
+        """
+        out_offsets = np.zeros(len(new_lengths) + 1, dtype=np.int64)
+        np.cumsum(new_lengths, out=out_offsets[1:])
+        seg = np.repeat(np.arange(len(new_lengths)), new_lengths)
+        pos = np.arange(out_offsets[-1]) - np.repeat(out_offsets[:-1], new_lengths)
+        return self.tokens[src_of(seg, pos)], out_offsets, seg, pos
+
+    def take(self, indices) -> "PackedPopulation":
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.offsets[indices]
+        tokens, offsets, seg, pos = self._gather(
+            self.lengths[indices], lambda seg, pos: starts[seg] + pos
+        )
+        return PackedPopulation(tokens, offsets)
+
+    def concat(self, other: "PackedPopulation") -> "PackedPopulation":
+        return PackedPopulation(
+            np.concatenate([self.tokens, other.tokens]),
+            np.concatenate([self.offsets, other.offsets[1:] + self.offsets[-1]]),
+        )
+
+    # ------------------------------------------------------------------ #
+    # Operadores genéticos
+    # ------------------------------------------------------------------ #
+    def crossover(self, rng, parents_a, parents_b) -> "PackedPopulation":
+        """
+        Cruce en un punto: hijo k = a[:cut_a] + b[cut_b:], con
+        cut ∈ [1, len - 1) en cada padre (como `_crossover`).
+        """
+        a = np.asarray(parents_a, dtype=np.int64)
+        b = np.asarray(parents_b, dtype=np.int64)
+        len_a, len_b = self.lengths[a], self.lengths[b]
+        cut_a = rng.integers(1, len_a - 1)
+        cut_b = rng.integers(1, len_b - 1)
+        start_a, start_b = self.offsets[a], self.offsets[b] + cut_b
+
+        tokens, offsets, _, _ = self._gather(
+            cut_a + len_b - cut_b,
+            lambda seg, pos: np.where(
+                pos < cut_a[seg], start_a[seg] + pos, start_b[seg] + pos - cut_a[seg]
+            ),
+        )
+        return PackedPopulation(tokens, offsets)
+
+    def mutate(self, rng, rate: float, low: int, high: int) -> "PackedPopulation":
+        """
+        Mutación en tres pasos (como `_mutate`), con IDs nuevos en [low, high):
+        sustitución de cada token interior con prob. `rate`; inserción de
+        un token con prob. `rate`; borrado de uno con prob. `rate` si el
+        genoma tiene más de 5 tokens.
+        """
+        n = len(self)
+
+        # 1) sustitución (sin tocar BOS/EOS)
+        tokens = self.tokens.copy()
+        pos = self.positions()
+        interior = (pos > 0) & (pos < np.repeat(self.lengths, self.lengths) - 1)
+        hit = interior & (rng.random(len(tokens)) < rate)
+        tokens[hit] = rng.integers(low, high, size=int(hit.sum()), dtype=np.int32)
+        pop = PackedPopulation(tokens, self.offsets)
+
+        # 2) inserción en idx ∈ [1, len - 1)
+        lengths = pop.lengths
+        ins = rng.random(n) < rate
+        ins_at = np.where(ins, rng.integers(1, lengths - 1), lengths + 1)
+        starts = pop.offsets[:-1]
+        tokens, offsets, seg, pos = pop._gather(
+            lengths + ins,
+            lambda seg, pos: starts[seg] + pos - (pos > ins_at[seg]),
+        )
+        new_slot = pos == ins_at[seg]
+        tokens[new_slot] = rng.integers(low, high, size=int(new_slot.sum()), dtype=np.int32)
+        pop = PackedPopulation(tokens, offsets)
+
+        # 3) borrado en idx ∈ [1, len - 1) si len > 5
+        lengths = pop.lengths
+        dele = (lengths > 5) & (rng.random(n) < rate)
+        del_at = np.where(dele, rng.integers(1, np.maximum(lengths - 1, 2)), lengths + 1)
+        starts = pop.offsets[:-1]
+        tokens, offsets, _, _ = pop._gather(
+            lengths - dele,
+            lambda seg, pos: starts[seg] + pos + (pos >= del_at[seg]),
+        )
+        return PackedPopulation(tokens, offsets)
+
+    # ------------------------------------------------------------------ #
+    # Métricas
+    # ------------------------------------------------------------------ #
+    def row_hashes(self):
+        """Hash polinómico ``uint64`` de cada genoma (incluye la longitud)."""
+        pos = self.positions().astype(np.uint64)
+        with np.errstate(over="ignore"):
+            powers = np.power(np.uint64(_HASH_MULT), pos + np.uint64(1))
+            terms = self.tokens.astype(np.uint64) * powers
+            sums = np.add.reduceat(terms, self.offsets[:-1]) if len(terms) else np.zeros(len(self), np.uint64)
+            return sums + self.lengths.astype(np.uint64)
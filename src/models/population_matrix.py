@@ -0,0 +1,179 @@
+"""
+PopulationMatrix
+================
+
+Población completa almacenada en arrays NumPy en lugar de una lista de
+objetos `Individual`:
+
+• Genomas de caracteres → matriz ``uint8`` (pop_size × gene_length) con
+  el código latin-1 de cada carácter.
+• Genomas numéricos     → matriz ``float64`` de la misma forma.
+• Fitness               → vector ``float64`` (pop_size,).
+
+Selección, cruce, mutación y métricas trabajan sobre filas completas, sin
+bucles Python por individuo.
+"""
+
+from __future__ import annotations
+
+import string
+
+# ─────────────────────────────────────────────────────────────
+# Dependencia opcional: numpy
+# ─────────────────────────────────────────────────────────────
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+from .individual import Individual
+
+DEFAULT_CHARSET = string.ascii_uppercase + " "
+
+
+class PopulationMatrix:
+    """
+    Matriz de genomas + vector de fitness.
+
+    `genes` puede ser ``uint8`` (caracteres) o ``float64`` (numérico);
+    `charset` sólo se usa en el primer caso para generar caracteres
+    aleatorios en cruce y mutación.
+    """
+
+    def __init__(self, genes, charset: str | None = None):
+        if np is None:
+            raise RuntimeError(
+                "El módulo 'numpy' no está instalado. "
+                "Ejecuta `pip install numpy` e inténtalo de nuevo."
+            )
+
+        self.genes = genes
+        self.fitness = np.zeros(len(genes), dtype=np.float64)
+        self.is_char = genes.dtype == np.uint8
+
+        self.charset = charset if self.is_char else None
+        self.charset_codes = (
+            np.frombuffer(self.charset.encode("latin-1"), dtype=np.uint8)
+            if self.is_char else None
+        )
+
+    # ------------------------------------------------------------------ #
+    # Construcción
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_scenario(cls, scenario, size: int) -> "PopulationMatrix":
+        """Crea la población a partir de `scenario.random_genes()`."""
+        sample = [scenario.random_genes() for _ in range(size)]
+
+        if isinstance(sample[0][0], str):
+            data = "".join("".join(g) for g in sample).encode("latin-1")
+            genes = np.frombuffer(data, dtype=np.uint8).reshape(size, -1).copy()
+            charset = getattr(scenario, "charset", DEFAULT_CHARSET)
+            return cls(genes, charset)
+
+        return cls(np.asarray(sample, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.genes)
+
+    # ------------------------------------------------------------------ #
+    # Conversión a la representación clásica
+    # ------------------------------------------------------------------ #
+    def genes_list(self, i: int) -> list:
+        """Genes de la fila `i` como lista (caracteres o floats)."""
+        if self.is_char:
+            return list(self.genes[i].tobytes().decode("latin-1"))
+        return self.genes[i].tolist()
+
+    def individual(self, i: int) -> Individual:
+        genes = bytearray(self.genes[i].tobytes()) if self.is_char else self.genes_list(i)
+        return Individual(genes, fitness=float(self.fitness[i]))
+
+    # ------------------------------------------------------------------ #
+    # Métricas
+    # ------------------------------------------------------------------ #
+    def best_index(self) -> int:
+        return int(np.argmax(self.fitness))
+
+    def average(self) -> float:
+        return float(self.fitness.mean())
+
+    def diversity(self) -> int:
+        """Nº de genomas distintos (cada fila se compara como un bloque de bytes)."""
+        rows = np.ascontiguousarray(self.genes)
+        row_view = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1])))
+        return int(np.unique(row_view.ravel()).size)
+
+    def row_hashes(self):
+        """Hash ``uint64`` de cada fila (polinómico módulo 2**64, una pasada por columna)."""
+        cols = self.genes if self.is_char else np.ascontiguousarray(self.genes).view(np.uint64)
+        h = np.zeros(len(cols), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for j in range(cols.shape[1]):
+                h = h * np.uint64(0x100000001B3) + cols[:, j]
+        return h
+
+    # ------------------------------------------------------------------ #
+    # Operadores
+    # ------------------------------------------------------------------ #
+    def tournament(self, rng, tournament_size: int = 3):
+        """
+        Índices de los ganadores de `len(self)` torneos simultáneos.
+        Los candidatos se sortean con reemplazo.
+        """
+        n = len(self)
+        candidates = rng.integers(0, n, size=(n, tournament_size))
+        winners = np.argmax(self.fitness[candidates], axis=1)
+        return candidates[np.arange(n), winners]
+
+    def crossover(self, rng, parents1, parents2, keep_prob: float = 0.9):
+        """
+        Cruce uniforme fila a fila (caracteres) o aritmético (numérico).
+        Devuelve una matriz nueva con un hijo por pareja.
+        """
+        a, b = self.genes[parents1], self.genes[parents2]
+
+        if not self.is_char:
+            return 0.5 * a + 0.5 * b
+
+        child = np.where(rng.random(a.shape) < 0.5, a, b)
+        fresh = rng.random(a.shape) >= keep_prob
+        child[fresh] = rng.choice(self.charset_codes, size=int(fresh.sum()))
+        return child
+
+    def mutate(self, rng, genes, rates, mask=None, mutation_sigma: float = 0.1):
+        """
+        Mutación in-place de `genes` (sub-matriz de la población).
+
+        `rates` es un escalar o un vector con la tasa de cada fila y `mask`
+        (opcional) limita las posiciones mutables.
+        """
+        rates = np.asarray(rates, dtype=np.float64)
+        if rates.ndim == 1:
+            rates = rates[:, None]
+
+        hit = rng.random(genes.shape) < rates
+        if mask is not None:
+            hit &= mask
+
+        if self.is_char:
+            genes[hit] = rng.choice(self.charset_codes, size=int(hit.sum()))
+        else:
+            genes[hit] += rng.normal(0.0, mutation_sigma, size=int(hit.sum()))
+
+    def incorrect_mask(self, scenario, genes):
+        """
+        Máscara booleana de genes incorrectos para `genes`, o None si el
+        escenario no expone `incorrect_positions()`. Usa `incorrect_mask()`
+        del escenario cuando existe.
+        """
+        if hasattr(scenario, "incorrect_mask"):
+            return scenario.incorrect_mask(genes)
+        if not hasattr(scenario, "incorrect_positions"):
+            return None
+
+        mask = np.zeros(genes.shape, dtype=bool)
+        for r in range(len(genes)):
+            row = list(genes[r].tobytes().decode("latin-1")) if self.is_char else genes[r].tolist()
+            mask[r, scenario.incorrect_positions(row)] = True
+        return mask
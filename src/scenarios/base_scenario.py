@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from ..utils.genome_batch import iter_genomes
+
 
 class Scenario(ABC):
     """
@@ -22,6 +24,30 @@ class Scenario(ABC):
         """Devuelve la fitness de un conjunto de genes."""
         pass
 
+    # ------------------------------------------------------------------ #
+    # Evaluación por lotes
+    # ------------------------------------------------------------------ #
+    def evaluate_batch(self, genomes):
+        """
+        Devuelve la fitness de cada genoma de una población completa.
+
+        `genomes` es una lista de genomas o una matriz NumPy
+        (pop_size × gene_length). Por defecto se llama a `evaluate()`
+        genoma a genoma; los escenarios vectorizados la sobrescriben.
+        """
+        return [self.evaluate(g) for g in iter_genomes(genomes)]
+
+    # ------------------------------------------------------------------ #
+    # Hooks opcionales (el motor los detecta con hasattr)
+    # ------------------------------------------------------------------ #
+    #   incorrect_positions(genes) -> list[int]
+    #       Posiciones incorrectas → mutación focalizada.
+    #
+    #   evaluate_delta(genes, parent_genes, parent_fitness, changed) -> float
+    #       Fitness de `genes` sabiendo que sólo difiere de `parent_genes`
+    #       (cuya fitness es `parent_fitness`) en las posiciones `changed`.
+    #       Debe coincidir con `evaluate(genes)`.
+
     # ------------------------------------------------------------------ #
     # Opcional: fitness máxima conocida
     # ------------------------------------------------------------------ #
@@ -0,0 +1,70 @@
+import random
+import string
+from pathlib import Path
+
+from .base_scenario import Scenario
+from ..utils.genome_batch import has_numpy
+from ..utils.char_lm import CharNgramLM
+from ..utils.ngram_store import prefer_store
+
+
+class CharLMFluencyScenario(Scenario):
+    """
+    Fitness = log10 P(frase) según un modelo de n-gramas de caracteres
+    (orden 3–6 habitualmente) con suavizado Kneser-Ney.
+
+    A diferencia de sumar frecuencias crudas de bigramas, cada carácter
+    aporta su log-probabilidad condicionada a los anteriores: las
+    secuencias improbables penalizan en lugar de sumar cero.
+
+    - model_file = pickle generado con `scripts/build_char_lm.py` (si
+      existe su versión ``.bin``, se mapea en memoria en su lugar).
+    - order      = usar sólo hasta este orden (None → el del modelo).
+    """
+
+    def __init__(self, model_file: str = "data/processed/char_lm_5.pkl",
+                 length: int = 30, order: int | None = None):
+        super().__init__(gene_length=length)
+        self.charset = string.ascii_uppercase + " "
+
+        model_path = Path(model_file)
+        if not model_path.is_absolute():
+            model_path = Path(__file__).resolve().parents[2] / model_path
+        model_path = prefer_store(model_path)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"Char LM not found → {model_path} (genera uno con scripts/build_char_lm.py)"
+            )
+
+        self.model = CharNgramLM.load(model_path, order)
+        self.order = self.model.order
+
+    # --------- API obligatoria ---------------------------------- #
+    def random_genes(self):
+        return [random.choice(self.charset) for _ in range(self.gene_length)]
+
+    def evaluate(self, genes):
+        return self.model.score(genes)
+
+    def evaluate_delta(self, genes, parent_genes, parent_fitness, changed):
+        """Un cambio en i afecta a las posiciones i … i + order - 1."""
+        s, p = self.model.pad(genes), self.model.pad(parent_genes)
+        last = len(s) - 1
+        lp = self.model.position_logprob
+
+        # el relleno de contexto desplaza las posiciones `order - 1`
+        ctx = self.order - 1
+        positions = {
+            j for i in changed for j in range(i + ctx, min(i + ctx + self.order - 1, last) + 1)
+        }
+        return parent_fitness + sum(lp(s, j) - lp(p, j) for j in positions)
+
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        return self.model.score_batch(genomes)
+
+    # fitness máxima desconocida (log-probabilidad ≤ 0)
+    @property
+    def max_fitness(self):
+        return None
@@ -1,5 +1,6 @@
 import random
 from .base_scenario import Scenario
+from ..utils.genome_batch import np, has_numpy, char_matrix
 
 
 class DictionaryScenario(Scenario):
@@ -12,6 +13,10 @@ class DictionaryScenario(Scenario):
         self.target_word = target_word.upper()
         super().__init__(gene_length=len(self.target_word))
         self.dictionary = self._load_filtered_dictionary(dictionary_file)
+        self._target_codes = (
+            np.frombuffer(self.target_word.encode("latin-1"), dtype=np.uint8)
+            if has_numpy() else None
+        )
 
     # ------------------------------------------------------------------ #
     # Propiedad de fitness máxima
@@ -46,3 +51,9 @@ class DictionaryScenario(Scenario):
 
     def evaluate(self, genes):
         return sum(1 for g, t in zip(genes, self.target_word) if g == t)
+
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        matches = char_matrix(genomes) == self._target_codes
+        return matches.sum(axis=1).astype(np.float64)
@@ -1,20 +1,30 @@
+import random
 import string
-import pickle
 import re
 from abc import ABC
 from pathlib import Path
 
 from .base_scenario import Scenario
+from ..evaluation.text_terms import (
+    WeightedTerms, WordBigrams, WordFrequency, WordOverlap, doubled_chars, structure,
+)
+from ..utils.ngram_store import load_counts, prefer_store
+from ..utils.word_ngrams import WordBigramTable
 
 
 class LanguageAdaptiveFluencyScenario(Scenario, ABC):
     """
     Combina:
-      • Fluidez de bigramas en español
+      • Fluidez de bigramas de palabras en español (por ID del vocabulario)
       • Reconocimiento de palabras reales (unigramas)
       • Estructura básica (mayúscula inicial, punto final)
       • Penalización por repeticiones (AA, BB…)
       • Adaptación al prompt (bonus por palabras compartidas)
+
+    Las tablas se abren con `ngram_store`: si existe la versión ``.bin`` de
+    un pickle se mapea en memoria (compartida entre procesos) en su lugar.
+    `scale` ("count" | "log") es la escala del término de unigramas; la
+    PMI de los bigramas siempre se calcula sobre recuentos.
     """
 
     def __init__(
@@ -23,6 +33,8 @@ class LanguageAdaptiveFluencyScenario(Scenario, ABC):
             length: int | None = None,
             bigram_file: str = "data/processed/es_bigrams.pkl",
             unigram_file: str = "data/processed/es_unigrams.pkl",
+            word_bigram_file: str | None = "data/processed/es_word_bigrams.pkl",
+            scale: str = "count",
     ):
         # si no dan longitud, al menos tan largo como el prompt o 40 chars
         if length is None:
@@ -39,19 +51,26 @@ class LanguageAdaptiveFluencyScenario(Scenario, ABC):
         # cargamos bigramas
         root = Path(__file__).resolve().parents[2]
         bg_path = root / bigram_file
-        if not bg_path.exists():
+        if not prefer_store(bg_path).exists():
             raise FileNotFoundError(f"Bigram file not found → {bg_path}")
-        with bg_path.open("rb") as f:
-            self.bigram_freq: dict[str, int] = pickle.load(f)
+        self.bigram_freq = load_counts(bg_path)
 
         # cargamos unigramas (frecuencia de palabras reales)
         ug_path = root / unigram_file
-        if not ug_path.exists():
+        if not prefer_store(ug_path).exists():
             # si no tienes un pickle de unigrams, inicializa vacío
-            self.unigram_freq = {}
+            unigram_counts = self.unigram_freq = {}
+        else:
+            unigram_counts = load_counts(ug_path)
+            self.unigram_freq = unigram_counts if scale == "count" else load_counts(ug_path, scale)
+
+        # bigramas (palabra, palabra) → claves int64 de IDs: ya traducidos en
+        # `word_bigram_file` (scripts/build_es_word_ngrams.py) o aquí, una vez
+        wb_path = prefer_store(root / word_bigram_file) if word_bigram_file else None
+        if wb_path is not None and wb_path.exists():
+            self.word_bigrams = WordBigramTable.load(wb_path)
         else:
-            with ug_path.open("rb") as f:
-                self.unigram_freq: dict[str, int] = pickle.load(f)
+            self.word_bigrams = WordBigramTable.from_counts(unigram_counts, self.bigram_freq)
 
         # pesos: ajusta a tu gusto
         self.W_BG = 1.0  # bigramas
@@ -60,45 +79,22 @@ class LanguageAdaptiveFluencyScenario(Scenario, ABC):
         self.W_REP = 1.0  # penalización repeticiones
         self.W_ADAPT = 3.0  # adaptación al prompt
 
-    def evaluate(self, genes: list[str]) -> float:
-        text = "".join(genes)
-        # 1) Score bigramas
-        bg_score = sum(
-            self.bigram_freq.get(text[i:i + 2], 0)
-            for i in range(len(text) - 1)
-        )
+        # términos de la fitness: un único escaneo del texto por genoma
+        # (ver src/evaluation/text_terms.py); pesos ↔ atributos W_*
+        self.terms = WeightedTerms(self, [
+            ("bigram", "W_BG", WordBigrams(self.word_bigrams)),
+            ("unigram", "W_UG", WordFrequency(self.unigram_freq)),
+            ("structure", "W_STR", structure),
+            ("repetition", "W_REP", doubled_chars),  # ≤ 0
+            ("prompt", "W_ADAPT", WordOverlap(self.prompt_words)),
+        ])
 
-        # 2) Score unigramas / palabras reales
-        words = text.split()
-        ug_score = sum(
-            self.unigram_freq.get(w, 0)
-            for w in words
-        )
+    def random_genes(self):
+        return [random.choice(self.charset) for _ in range(self.gene_length)]
 
-        # 3) Bonus de estructura
-        str_bonus = 0
-        if text and text[0].isalpha():
-            str_bonus += 1
-        if text.endswith("."):
-            str_bonus += 1
-
-        # 4) Penalización por repeticiones dobles
-        rep_penalty = sum(
-            1 for _ in re.finditer(r"(.)\1", text)
-        )
-
-        # 5) Adaptación al prompt: palabras en común
-        adapt_score = sum(
-            1 for w in words
-            if w in self.prompt_words
-        )
+    def evaluate(self, genes: list[str]) -> float:
+        return self.terms("".join(genes))
 
-        # combinación lineal
-        fitness = (
-                self.W_BG * bg_score
-                + self.W_UG * ug_score
-                + self.W_STR * str_bonus
-                - self.W_REP * rep_penalty
-                + self.W_ADAPT * adapt_score
-        )
-        return fitness
+    def evaluate_terms(self, genes: list[str]) -> dict[str, float]:
+        """Valor sin ponderar de cada término (para inspeccionar la fitness)."""
+        return self.terms.breakdown("".join(genes))
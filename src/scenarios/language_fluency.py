@@ -1,8 +1,12 @@
 import string
 import random
-import pickle
 from pathlib import Path
 from .base_scenario import Scenario
+from ..utils.genome_batch import (
+    np, has_numpy, char_matrix, iter_genomes, IS_ALPHA, IS_SPACE, SPACE,
+)
+from ..utils.char_ngrams import CharNgramTable, encode
+from ..utils.ngram_store import load_counts, prefer_store
 
 
 class LanguageFluencyScenario(Scenario):
@@ -17,7 +21,8 @@ class LanguageFluencyScenario(Scenario):
     def __init__(
             self,
             length: int = 40,
-            bigram_file: str = "data/processed/bigrams.pkl"
+            bigram_file: str = "data/processed/bigrams.pkl",
+            scale: str = "count",
     ):
         super().__init__(gene_length=length)
         self.charset = string.ascii_uppercase + " "
@@ -27,11 +32,12 @@ class LanguageFluencyScenario(Scenario):
         project_root = Path(__file__).resolve().parents[2]
         ngram_path = project_root / bigram_file
 
-        if not ngram_path.exists():
+        if not prefer_store(ngram_path).exists():
             raise FileNotFoundError(f"Bigram file not found → {ngram_path}")
 
-        with ngram_path.open("rb") as f:
-            self.bigram_freq: dict[str, int] = pickle.load(f)
+        # dict o, si existe la versión .bin, recuentos mapeados en memoria
+        # (exactos o cuantizados); scale = "count" | "log"
+        self.bigram_freq = load_counts(ngram_path, scale)
 
         # (opcional) diccionario de palabras → por ahora vacío
         self.ug_freq: dict[str, int] = {}
@@ -42,6 +48,8 @@ class LanguageFluencyScenario(Scenario):
         self.W_STR = 5.0  # estructura
         self.W_REP = 1.0  # penalización repes
 
+        # tabla densa 28×28 (bigramas con espacio → 0)
+        self.bigram_table = CharNgramTable(self.bigram_freq, 2, ignore_space=True)
 
     # ---------------- Genes aleatorios ----------------------------
     def random_genes(self):
@@ -50,30 +58,111 @@ class LanguageFluencyScenario(Scenario):
     # ---------------- Evaluación ----------------------------------
     def evaluate(self, genes):
         s = "".join(genes)
+        raw = s.encode("latin-1", "replace")
 
         # 1️⃣ Frecuencia de bigramas sin espacios
-        bg_score = sum(
-            self.bigram_freq.get(s[i:i + 2], 0)
-            for i in range(len(s) - 1)
-            if " " not in s[i:i + 2]
-        )
+        bg_score = self.bigram_table.score(encode(raw))
 
         # 2️⃣ Frecuencia de palabras reales
         words = s.split()
         ug_score = sum(self.ug_freq.get(w, 0) for w in words)
 
         # 3️⃣ Estructura sencilla
+        struct = self._structure(s)
+
+        # 4️⃣ Penalización por repeticiones
+        rep_pen = sum(
+            1 for a, b, c in zip(raw, raw[1:], raw[2:])
+            if a == b == c and a != SPACE
+        )
+
+        return (
+                self.W_BG * bg_score +
+                self.W_UG * ug_score +
+                self.W_STR * struct -
+                self.W_REP * rep_pen
+        )
+
+    @staticmethod
+    def _structure(s: str) -> int:
         struct = 0
         if s and s[0].isalpha():           struct += 1
         if " " in s:                       struct += 1
         if s.strip().endswith((".", " ")): struct += 1
+        return struct
+
+    @staticmethod
+    def _repeat_at(raw: bytes, w: int) -> bool:
+        # s[w] == s[w+1] == s[w+2] y no es espacio
+        return raw[w] == raw[w + 1] == raw[w + 2] != SPACE
+
+    # ---------------- Evaluación delta ----------------------------
+    def evaluate_delta(self, genes, parent_genes, parent_fitness, changed):
+        """
+        Bigramas y repeticiones: sólo las ventanas afectadas por `changed`.
+        La estructura se recalcula entera (son operaciones de cadena en C).
+        """
+        if self.ug_freq:  # las palabras pueden cambiar en cualquier sitio
+            return self.evaluate(genes)
+
+        s = genes if isinstance(genes, str) else "".join(genes)
+        p = parent_genes if isinstance(parent_genes, str) else "".join(parent_genes)
+        s_raw = s.encode("latin-1", "replace")
+        p_raw = p.encode("latin-1", "replace")
+        s_codes, p_codes = encode(s_raw), encode(p_raw)
+        window = self.bigram_table.window
+        n = len(s)
+
+        d_bg = 0
+        for w in {w for i in changed for w in (i - 1, i) if 0 <= w <= n - 2}:
+            d_bg += window(s_codes, w) - window(p_codes, w)
+
+        d_rep = 0
+        for w in {w for i in changed for w in (i - 2, i - 1, i) if 0 <= w <= n - 3}:
+            d_rep += self._repeat_at(s_raw, w) - self._repeat_at(p_raw, w)
+
+        d_struct = self._structure(s) - self._structure(p)
 
-        # 4️⃣ Penalización por repeticiones
-        rep_pen = sum(
-            1 for i in range(len(s) - 2)
-            if s[i:i + 2] == s[i + 1:i + 3] and " " not in s[i:i + 2]
+        return (
+                parent_fitness +
+                self.W_BG * d_bg +
+                self.W_STR * d_struct -
+                self.W_REP * d_rep
         )
 
+    # ---------------- Evaluación por lotes ------------------------
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        m = char_matrix(genomes)
+        n, length = m.shape
+
+        # 1️⃣ Bigramas sin espacios
+        bg_score = self.bigram_table.score_batch(m)
+
+        # 2️⃣ Palabras reales (sólo si hay diccionario cargado)
+        ug_score = np.zeros(n)
+        if self.ug_freq:
+            ug_score[:] = [
+                sum(self.ug_freq.get(w, 0) for w in "".join(g).split())
+                for g in iter_genomes(m)
+            ]
+
+        # 3️⃣ Estructura sencilla
+        struct = np.zeros(n)
+        if length:
+            struct += IS_ALPHA[m[:, 0]]
+            struct += (m == SPACE).any(axis=1)
+            # último carácter no blanco == "."
+            visible = ~IS_SPACE[m]
+            last = length - 1 - np.argmax(visible[:, ::-1], axis=1)
+            struct += visible.any(axis=1) & (m[np.arange(n), last] == ord("."))
+
+        # 4️⃣ Repeticiones: s[i] == s[i+1] == s[i+2] y s[i] no es espacio
+        rep_pen = (
+                (m[:, :-2] == m[:, 1:-1]) & (m[:, 1:-1] == m[:, 2:]) & (m[:, :-2] != SPACE)
+        ).sum(axis=1)
+
         return (
                 self.W_BG * bg_score +
                 self.W_UG * ug_score +
@@ -2,10 +2,12 @@
 # FILE: src/scenarios/ngram_fluency.py
 # ================================================================
 import os
-import pickle
 import random
 import string
 from .base_scenario import Scenario
+from ..utils.genome_batch import has_numpy
+from ..utils.char_ngrams import CharNgramTable, encode
+from ..utils.ngram_store import load_counts, prefer_store
 from pathlib import Path
 
 
@@ -16,11 +18,18 @@ class NgramFluencyScenario(Scenario):
 
     - order = 2 → bigramas, order = 3 → trigramas.
     - length = longitud fija de la frase.
-    - ngram_file = pickle con dict{ngram: frecuencia}.
+    - ngram_file = pickle con dict{ngram: frecuencia} (o su versión
+      binaria ``.bin`` de `ngram_store`, que se prefiere si existe).
+    - scale = "count" (frecuencias) o "log" (log10 de las frecuencias);
+      con tablas cuantizadas, escala en la que se leen sus cubetas.
+
+    El dict se compila al construir el escenario en una tabla densa
+    28^order indexada por códigos de carácter (ver `CharNgramTable`;
+    dispersa a partir de orden 5); los n-gramas con espacios quedan a 0.
     """
 
     def __init__(self, order: int = 2, length: int = 30,
-                 ngram_file: str = "bigrams.pkl"):
+                 ngram_file: str = "bigrams.pkl", scale: str = "count"):
         super().__init__(gene_length=length)
         self.order = order
         self.charset = string.ascii_uppercase + " "
@@ -30,25 +39,37 @@ class NgramFluencyScenario(Scenario):
         data_dir = project_root / "data" / "processed"
         ngram_path = data_dir / ngram_file  # …/data/processed/bigrams.pkl
 
-        if not ngram_path.exists():
+        if not prefer_store(ngram_path).exists():
             raise FileNotFoundError(f"Ngram file not found → {ngram_path}")
 
-        with ngram_path.open("rb") as f:
-            self.ngram_freqs: dict[str, int] = pickle.load(f)
+        self.ngram_freqs = load_counts(ngram_path, scale)
+
+        self.table = CharNgramTable(self.ngram_freqs, order, ignore_space=True)
 
     # --------- API obligatoria ---------------------------------- #
     def random_genes(self):
         return [random.choice(self.charset) for _ in range(self.gene_length)]
 
     def evaluate(self, genes):
-        s = "".join(genes)
-        score = 0
-        for i in range(len(s) - self.order + 1):
-            ngram = s[i:i + self.order]
-            if " " in ngram:  # ignoramos n-gramas con espacios
-                continue
-            score += self.ngram_freqs.get(ngram, 0)
-        return score
+        return self.table.score(encode(genes))
+
+    def evaluate_delta(self, genes, parent_genes, parent_fitness, changed):
+        """Sólo se recalculan las ventanas que contienen alguna posición cambiada."""
+        s, p = encode(genes), encode(parent_genes)
+        k = self.order
+        last = len(s) - k
+        window = self.table.window
+
+        windows = {w for i in changed for w in range(max(0, i - k + 1), min(i, last) + 1)}
+        delta = 0
+        for w in windows:
+            delta += window(s, w) - window(p, w)
+        return parent_fitness + delta
+
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        return self.table.score_batch(genomes)
 
     # fitness máxima desconocida
     @property
@@ -8,6 +8,7 @@ from .dictionary_scenario import DictionaryScenario
 from .ngram_fluency import NgramFluencyScenario
 from .language_fluency import LanguageFluencyScenario
 from .language_adaptative_fluency import LanguageAdaptiveFluencyScenario
+from .char_lm_fluency import CharLMFluencyScenario
 
 
 class ScenarioManager:
@@ -39,12 +40,21 @@ class ScenarioManager:
                 order=cfg.get("order", 2),
                 length=cfg.get("length", 30),
                 ngram_file=str(data_dir / "bigrams.pkl"),
+                scale=cfg.get("scale", "count"),
+            )
+
+        elif name == "char_lm_fluency":
+            # cfg["order"] → modelo data/processed/char_lm_<orden>.pkl
+            return CharLMFluencyScenario(
+                model_file=str(data_dir / f"char_lm_{cfg.get('order', 5)}.pkl"),
+                length=cfg.get("length", 30),
             )
 
         elif name == "language_fluency":
             return LanguageFluencyScenario(
                 length=cfg.get("length", 40),
                 bigram_file=str(data_dir / "bigrams.pkl"),
+                scale=cfg.get("scale", "count"),
             )
 
         elif name == "language_adaptive_fluency":
@@ -56,6 +66,8 @@ class ScenarioManager:
                 length=length,
                 bigram_file=str(data_dir / "es_bigrams.pkl"),
                 unigram_file=str(data_dir / "es_unigrams.pkl"),
+                word_bigram_file=str(data_dir / "es_word_bigrams.pkl"),
+                scale=cfg.get("scale", "count"),
             )
 
         else:
@@ -1,5 +1,6 @@
 import random
 from .base_scenario import Scenario
+from ..utils.genome_batch import has_numpy, float_matrix
 
 
 class SimpleMaximizationScenario(Scenario):
@@ -14,3 +15,9 @@ class SimpleMaximizationScenario(Scenario):
         x = genes[0]
         fitness = x * (x ** 2 - 3 * x + 2)
         return fitness
+
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        x = float_matrix(genomes)[:, 0]
+        return x * (x ** 2 - 3 * x + 2)
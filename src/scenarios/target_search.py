@@ -1,5 +1,6 @@
 import random
 from .base_scenario import Scenario
+from ..utils.genome_batch import np, has_numpy, float_matrix
 
 
 class TargetSearchScenario(Scenario):
@@ -15,3 +16,9 @@ class TargetSearchScenario(Scenario):
         x = genes[0]
         fitness = 1 / (1 + abs(x - self.target))
         return fitness
+
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        x = float_matrix(genomes)[:, 0]
+        return 1 / (1 + np.abs(x - self.target))
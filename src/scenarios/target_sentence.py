@@ -1,6 +1,7 @@
 import random
 import string
 from .base_scenario import Scenario
+from ..utils.genome_batch import np, has_numpy, char_matrix
 
 
 class TargetSentenceScenario(Scenario):
@@ -14,6 +15,10 @@ class TargetSentenceScenario(Scenario):
         self.target_sentence = "HELLO FROM THE EVOLUTION LAB"
         super().__init__(gene_length=len(self.target_sentence))
         self.charset = string.ascii_uppercase + " "
+        self._target_codes = (
+            np.frombuffer(self.target_sentence.encode("latin-1"), dtype=np.uint8)
+            if has_numpy() else None
+        )
 
     # ---------- fitness máxima --------------------------------------- #
     @property
@@ -30,8 +35,26 @@ class TargetSentenceScenario(Scenario):
         )
         return matches / self.gene_length
 
+    def evaluate_delta(self, genes, parent_genes, parent_fitness, changed):
+        """Sólo se recuentan las posiciones cambiadas respecto al padre."""
+        target = self.target_sentence
+        matches = round(parent_fitness * self.gene_length)
+        for i in changed:
+            matches += (genes[i] == target[i]) - (parent_genes[i] == target[i])
+        return matches / self.gene_length
+
+    def evaluate_batch(self, genomes):
+        if not has_numpy():
+            return super().evaluate_batch(genomes)
+        matches = (char_matrix(genomes) == self._target_codes).sum(axis=1)
+        return matches / self.gene_length
+
     # ---------- helper para mutación focalizada ---------------------- #
     def incorrect_positions(self, genes):
         return [
             i for i, (g, t) in enumerate(zip(genes, self.target_sentence)) if g != t
         ]
+
+    def incorrect_mask(self, genes_matrix):
+        """Versión vectorizada: máscara (pop_size × gene_length) de genes incorrectos."""
+        return genes_matrix != self._target_codes
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+server
+======
+
+Servicio local de evolución (asyncio): atiende peticiones GA por HTTP,
+sobre TCP o sobre un socket Unix, con varios clientes a la vez.
+
+    python -m src.server --port 8765
+    python -m src.server --unix /tmp/rai.sock --workers 4
+
+Rutas
+─────
+• ``POST /evolve`` – cuerpo JSON:
+      {"prompt": "hola qué tal"}                          → GAWord (frase)
+      {"scenario": "ngram_fluency", "config": {...}}      → EvolutionEngine
+  Opcionales: ``pop_size``, ``generations``, ``time_budget_ms``,
+  ``target_fitness``, ``packed`` (prompt) y ``engine`` = classic | numpy
+  (escenario).
+• ``GET /metrics`` – latencias p50/p95/p99 (cola, cómputo, total),
+  peticiones servidas / rechazadas / fallidas y profundidad de la cola.
+• ``GET /health``
+
+Arquitectura
+────────────
+• Cola acotada (`queue_size`): si está llena se responde ``503`` con
+  ``Retry-After`` en vez de acumular trabajo → contrapresión.
+• `workers` despachadores sacan trabajos de la cola y los ejecutan en
+  un pool de procesos *calientes*: vocabulario, tabla Zipf y escenarios
+  de ``--preload`` se cargan en el proceso padre antes de arrancar el
+  pool (fork → páginas compartidas) o en el inicializador de cada
+  worker (spawn). Cada worker guarda los escenarios ya construidos y una
+  sesión `GAWord` persistente que arranca en caliente con cada prompt.
+  Si un worker muere (``BrokenProcessPool``), la petición falla y el pool
+  se vuelve a crear.
+• Las sesiones no escriben nada en disco salvo con ``--runs-dir``
+  (CSV de métricas y hall of fame de cada sesión).
+• ``time_budget_ms`` del servicio es el valor por defecto y el máximo de
+  cada petición → latencia acotada. Cada respuesta incluye
+  ``queue_ms`` / ``compute_ms`` / ``total_ms``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Sequence, Tuple
+
+from src import vocab
+from src.core.engine import EvolutionEngine
+from src.core.numpy_engine import NumpyEvolutionEngine
+from src.ga_word import GAWord, PROMPT_SEED_FRAC, prompt_seeds
+from src.scenarios.scenarios_manager import ScenarioManager
+from src.utils.budget import RunBudget
+from src.utils.parallel import default_workers, mp_context
+
+ENGINES = {"classic": EvolutionEngine, "numpy": NumpyEvolutionEngine}
+
+MAX_BODY = 1 << 20  # bytes
+REQUEST_TIMEOUT = 10.0  # s para recibir la petición completa
+MAX_SESSIONS = 4  # sesiones GAWord por worker (una por pop_size / packed)
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+# ═════════════════════════════════════════════════════════════════════
+#   LADO WORKER (proceso del pool)
+# ═════════════════════════════════════════════════════════════════════
+_SCENARIOS: Dict[str, object] = {}  # escenarios construidos, por (nombre, cfg)
+_SESSIONS: Dict[Tuple[int, bool, str | None], GAWord] = {}
+
+
+def _scenario(name: str, cfg: dict):
+    key = json.dumps([name, cfg], sort_keys=True)
+    scenario = _SCENARIOS.get(key)
+    if scenario is None:
+        scenario = _SCENARIOS[key] = ScenarioManager.get_scenario(name, cfg)
+    return scenario
+
+
+def _warm(preload: Sequence[str]) -> None:
+    """Carga vocabulario, tabla Zipf y escenarios de `preload`."""
+    vocab.zipf_table()
+    for name in preload:
+        _scenario(name, {})
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _session(pop_size: int, packed: bool, runs_dir: str | None) -> GAWord:
+    key = (pop_size, packed, runs_dir)
+    ga = _SESSIONS.get(key)
+    if ga is None:
+        if len(_SESSIONS) >= MAX_SESSIONS:
+            _SESSIONS.pop(next(iter(_SESSIONS))).close()
+        ga = _SESSIONS[key] = GAWord(pop_size=pop_size, quiet=True, packed=packed, persistent=True,
+                                     runs_dir=runs_dir, save_runs=runs_dir is not None)
+    return ga
+
+
+def _run_prompt(job: dict) -> dict:
+    ga = _session(job["pop_size"], job["packed"], job["runs_dir"])
+    ga.max_gens = job["generations"]
+    ga.budget = RunBudget(job["time_budget_ms"], job["target_fitness"])
+    ga.warm_start(prompt_seeds(job["prompt"], int(ga.pop_size * PROMPT_SEED_FRAC)))
+
+    gen, fitness, genome = 0, 0.0, []
+    for gen, fitness, genome in ga.run():
+        pass
+    return {"text": vocab.decode(genome), "genes": genome, "fitness": float(fitness),
+            "generations": gen, "stop": ga.budget.reason}
+
+
+def _run_scenario(job: dict) -> dict:
+    engine = ENGINES[job["engine"]](
+        _scenario(job["scenario"], job["config"]),
+        population_size=job["pop_size"],
+        generations=job["generations"],
+        report_every=0,
+        time_budget_ms=job["time_budget_ms"],
+        target_fitness=job["target_fitness"],
+    )
+    genes, fitness = engine.evolve()
+    text = "".join(genes) if genes and isinstance(genes[0], str) else None
+    return {"text": text, "genes": genes, "fitness": float(fitness),
+            "generations": engine.logger.records[-1][0], "stop": engine.budget.reason}
+
+
+def _run_job(job: dict) -> dict:
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # los motores informan por consola
+        result = _run_prompt(job) if "prompt" in job else _run_scenario(job)
+    result["compute_ms"] = (time.perf_counter() - t0) * 1000.0
+    result["worker"] = os.getpid()
+    return result
+
+
+# ═════════════════════════════════════════════════════════════════════
+#   MÉTRICAS
+# ═════════════════════════════════════════════════════════════════════
+def _percentile(sorted_values: Sequence[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(q * len(sorted_values)), 1)  # rango más cercano
+    return round(sorted_values[rank - 1], 3)
+
+
+class LatencyStats:
+    """Latencias de las últimas `window` peticiones + contadores globales."""
+
+    def __init__(self, window: int = 1024):
+        self._samples = {k: deque(maxlen=window) for k in ("queue_ms", "compute_ms", "total_ms")}
+        self.served = self.rejected = self.failed = 0
+
+    def record(self, queue_ms: float, compute_ms: float, total_ms: float) -> None:
+        self.served += 1
+        for key, value in zip(self._samples, (queue_ms, compute_ms, total_ms)):
+            self._samples[key].append(value)
+
+    def snapshot(self) -> dict:
+        out = {"served": self.served, "rejected": self.rejected, "failed": self.failed}
+        for key, samples in self._samples.items():
+            values = sorted(samples)
+            out[key] = {f"p{int(q * 100)}": _percentile(values, q) for q in (0.50, 0.95, 0.99)}
+        return out
+
+
+# ═════════════════════════════════════════════════════════════════════
+#   HTTP MÍNIMO
+# ═════════════════════════════════════════════════════════════════════
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str, retry_after: int | None = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    """(método, ruta, cuerpo) de una petición HTTP/1.x."""
+    parts = (await reader.readline()).decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise _HttpError(400, "Petición HTTP no válida.")
+    method, path, _ = parts
+
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            try:
+                length = int(value.strip())
+            except ValueError:
+                raise _HttpError(400, "Content-Length no válido.") from None
+    if length > MAX_BODY:
+        raise _HttpError(413, f"Cuerpo mayor de {MAX_BODY} bytes.")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), path.split("?", 1)[0], body
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: dict,
+                   retry_after: int | None = None) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    if retry_after is not None:
+        head.append(f"Retry-After: {retry_after}")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def _opt_float(value) -> float | None:
+    return None if value is None else float(value)
+
+
+# ═════════════════════════════════════════════════════════════════════
+#   SERVICIO
+# ═════════════════════════════════════════════════════════════════════
+class EvolutionService:
+    def __init__(self,
+                 workers: int = default_workers(),
+                 queue_size: int = 64,
+                 preload: Sequence[str] = (),
+                 time_budget_ms: float | None = 1000.0,
+                 max_gens: int = 2000,
+                 pop_size: int = 300,
+                 runs_dir: str | None = None):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers y queue_size deben ser ≥ 1.")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.preload = tuple(preload)
+        self.time_budget_ms = time_budget_ms  # por defecto y máximo por petición
+        self.max_gens = max_gens
+        self.pop_size = pop_size
+        self.runs_dir = runs_dir  # None → las sesiones no escriben en disco
+
+        self.stats = LatencyStats()
+        self.queue: asyncio.Queue | None = None
+        self.pool: ProcessPoolExecutor | None = None
+        self.server: asyncio.AbstractServer | None = None
+        self._dispatchers: list = []
+
+    # ------------------------------------------------------------------ #
+    # Arranque / parada
+    # ------------------------------------------------------------------ #
+    async def start(self, host: str = "127.0.0.1", port: int = 8765,
+                    unix_path: str | None = None) -> None:
+        loop = asyncio.get_running_loop()
+
+        # tablas en el padre antes del fork; `_warm` repite la carga con spawn
+        _warm(self.preload)
+        self.pool = self._new_pool()
+        # arranca ya todos los workers (el pool los crearía bajo demanda)
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ping) for _ in range(self.workers)))
+
+        self.queue = asyncio.Queue(self.queue_size)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+
+    def _new_pool(self, context=None) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            self.workers, mp_context=context or mp_context(), initializer=_warm,
+            initargs=(self.preload,)
+        )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Nuevo pool si `broken` sigue siendo el actual (varios despachadores
+        pueden verlo caer). Siempre con spawn: con el servidor ya
+        escuchando, un fork heredaría los sockets de las conexiones
+        abiertas y los clientes no verían nunca el cierre.
+        """
+        if self.pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._new_pool(mp.get_context("spawn"))
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    # ------------------------------------------------------------------ #
+    # Cola → pool
+    # ------------------------------------------------------------------ #
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job, future, t_enqueued = await self.queue.get()
+            t_start = time.perf_counter()
+            pool = self.pool
+            try:
+                result = await loop.run_in_executor(pool, _run_job, job)
+            except Exception as exc:
+                if isinstance(exc, BrokenProcessPool):  # un worker ha muerto
+                    self._replace_pool(pool)
+                self.stats.failed += 1
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                t_end = time.perf_counter()
+                result["queue_ms"] = (t_start - t_enqueued) * 1000.0
+                result["total_ms"] = (t_end - t_enqueued) * 1000.0
+                self.stats.record(result["queue_ms"], result["compute_ms"], result["total_ms"])
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.queue.task_done()
+
+    def _parse_job(self, req) -> dict:
+        if not isinstance(req, dict):
+            raise ValueError("El cuerpo debe ser un objeto JSON.")
+        prompt, scenario = req.get("prompt"), req.get("scenario")
+        if (prompt is None) == (scenario is None):
+            raise ValueError("Indica 'prompt' o 'scenario' (sólo uno).")
+
+        budget = _opt_float(req.get("time_budget_ms", self.time_budget_ms))
+        if self.time_budget_ms is not None:
+            budget = min(budget or self.time_budget_ms, self.time_budget_ms)
+        job = {
+            "pop_size": int(req.get("pop_size", self.pop_size)),
+            "generations": int(req.get("generations", self.max_gens)),
+            "time_budget_ms": budget,
+            "target_fitness": _opt_float(req.get("target_fitness")),
+        }
+        if job["pop_size"] < 4 or job["generations"] < 0:
+            raise ValueError("pop_size debe ser ≥ 4 y generations ≥ 0.")
+        if budget is not None and budget <= 0:
+            raise ValueError("time_budget_ms debe ser > 0.")
+
+        if prompt is not None:
+            if not isinstance(prompt, str) or not prompt.strip():
+                raise ValueError("'prompt' debe ser un texto no vacío.")
+            job.update(prompt=prompt, packed=bool(req.get("packed", False)),
+                       runs_dir=self.runs_dir)
+        else:
+            engine = req.get("engine", "classic")
+            if engine not in ENGINES:
+                raise ValueError(f"Motor '{engine}' no reconocido {tuple(ENGINES)}.")
+            config = req.get("config") or {}
+            if not isinstance(config, dict):
+                raise ValueError("'config' debe ser un objeto JSON.")
+            job.update(scenario=str(scenario), config=config, engine=engine)
+        return job
+
+    async def _evolve(self, body: bytes) -> dict:
+        try:
+            job = self._parse_job(json.loads(body or b"{}"))
+        except (ValueError, TypeError) as exc:  # JSONDecodeError ⊂ ValueError
+            raise _HttpError(400, str(exc)) from None
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise _HttpError(503, "Cola llena; reintenta más tarde.", retry_after=1) from None
+
+        try:
+            return await future
+        except ValueError as exc:  # p. ej. escenario desconocido
+            raise _HttpError(400, str(exc)) from None
+
+    # ------------------------------------------------------------------ #
+    # Conexiones
+    # ------------------------------------------------------------------ #
+    async def _route(self, method: str, path: str, body: bytes) -> dict:
+        if path == "/evolve":
+            if method != "POST":
+                raise _HttpError(405, "Usa POST.")
+            return await self._evolve(body)
+        if path in ("/metrics", "/health") and method != "GET":
+            raise _HttpError(405, "Usa GET.")
+        if path == "/metrics":
+            return {**self.stats.snapshot(), "queued": self.queue.qsize(),
+                    "queue_size": self.queue_size, "workers": self.workers}
+        if path == "/health":
+            return {"status": "ok"}
+        raise _HttpError(404, f"Ruta '{path}' no encontrada.")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(_read_request(reader), REQUEST_TIMEOUT)
+                await _respond(writer, 200, await self._route(method, path, body))
+            except _HttpError as exc:
+                await _respond(writer, exc.status, {"error": str(exc)}, exc.retry_after)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                await _respond(writer, 400, {"error": "Petición incompleta."})
+            except Exception as exc:
+                await _respond(writer, 500, {"error": f"{type(exc).__name__}: {exc}"})
+        except ConnectionError:
+            pass  # el cliente se ha ido
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+# ═════════════════════════════════════════════════════════════════════
+#   CLI
+# ═════════════════════════════════════════════════════════════════════
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="rai-server",
+        description="R.A.I. – Servicio local de evolución (HTTP sobre TCP o socket Unix)")
+    p.add_argument("--host", default="127.0.0.1", help="Interfaz TCP (def. 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="Puerto TCP (def. 8765)")
+    p.add_argument("--unix", default=None, help="Ruta de un socket Unix (en lugar de TCP)")
+    p.add_argument("--workers", type=int, default=default_workers(),
+                   help="Procesos del pool (def. nº de CPUs)")
+    p.add_argument("--queue-size", type=int, default=64,
+                   help="Peticiones en espera antes de responder 503 (def. 64)")
+    p.add_argument("--time-budget-ms", type=float, default=1000.0,
+                   help="Tiempo por petición en ms: valor por defecto y máximo (def. 1000)")
+    p.add_argument("--max-gens", type=int, default=2000,
+                   help="Generaciones por defecto de cada petición (def. 2000)")
+    p.add_argument("--pop-size", type=int, default=300,
+                   help="Población por defecto (def. 300)")
+    p.add_argument("--runs-dir", default=None,
+                   help="Guardar aquí el CSV y el hall of fame de cada sesión (def. nada en disco)")
+    p.add_argument("--preload", nargs="*", default=[],
+                   help="Escenarios que se cargan al arrancar (p. ej. ngram_fluency)")
+    return p.parse_args(argv)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    service = EvolutionService(
+        workers=args.workers,
+        queue_size=args.queue_size,
+        preload=args.preload,
+        time_budget_ms=args.time_budget_ms,
+        max_gens=args.max_gens,
+        pop_size=args.pop_size,
+        runs_dir=args.runs_dir,
+    )
+    await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"🚀 Servicio R.A.I. en {where} ({args.workers} workers, cola {args.queue_size})")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main() -> None:
+    try:
+        asyncio.run(_serve(_parse_args()))
+    except KeyboardInterrupt:
+        print("Adiós 👋")
+
+
+if __name__ == "__main__":
+    main()
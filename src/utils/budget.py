@@ -0,0 +1,76 @@
+"""
+budget
+======
+
+Presupuesto de una ejecución *anytime*: el bucle evolutivo para en
+cuanto se agota y devuelve lo mejor encontrado hasta entonces.
+
+• ``time_budget_ms`` – tiempo de reloj desde `start()`. Antes de empezar
+  otra generación se estima su duración con la más lenta de las últimas
+  `window`; si no cabe en lo que queda, se para → la ejecución termina
+  *antes* del límite en vez de pasarse una generación entera.
+• ``target_fitness`` – calidad suficiente: se para al alcanzarla.
+
+    budget.start()
+    while ...:
+        ...                      # una generación
+        budget.tick()
+        if budget.exhausted(best_fitness):
+            break                # budget.reason → "time" | "target"
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+
+
+class RunBudget:
+    def __init__(self, time_budget_ms: float | None = None,
+                 target_fitness: float | None = None, window: int = 8):
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            raise ValueError("time_budget_ms debe ser > 0.")
+        self.time_budget_ms = time_budget_ms
+        self.target_fitness = target_fitness
+        self._steps: deque = deque(maxlen=window)  # duración (s) de las últimas generaciones
+        self._t0 = self._last = time.perf_counter()
+        self.reason: str | None = None
+
+    def start(self) -> None:
+        self._t0 = self._last = time.perf_counter()
+        self._steps.clear()
+        self.reason = None
+
+    def tick(self) -> None:
+        """Marca el final de una generación."""
+        now = time.perf_counter()
+        self._steps.append(now - self._last)
+        self._last = now
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def remaining_ms(self) -> float | None:
+        if self.time_budget_ms is None:
+            return None
+        return self.time_budget_ms - self.elapsed_ms()
+
+    def exhausted(self, best_fitness: float | None = None) -> bool:
+        """True si hay que parar ya (fija `reason`)."""
+        if (self.target_fitness is not None and best_fitness is not None
+                and best_fitness >= self.target_fitness):
+            self.reason = "target"
+            return True
+        if self.time_budget_ms is not None:
+            next_step_ms = max(self._steps, default=0.0) * 1000.0
+            if self.elapsed_ms() + next_step_ms > self.time_budget_ms:
+                self.reason = "time"
+                return True
+        return False
+
+    def describe(self) -> str:
+        if self.reason == "target":
+            return f"Fitness objetivo ({self.target_fitness}) alcanzada"
+        if self.reason == "time":
+            return f"Presupuesto de {self.time_budget_ms:g} ms agotado ({self.elapsed_ms():.0f} ms)"
+        return ""
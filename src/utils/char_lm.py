@@ -0,0 +1,295 @@
+"""
+char_lm
+=======
+
+Modelo de lenguaje de n-gramas de caracteres (orden 1–8) con suavizado
+Kneser-Ney interpolado.
+
+Alfabeto y códigos: los de `char_ngrams` (A–Z, espacio, "otro" → 0..27).
+Cada n-grama se guarda como entero en base 28, en arrays ordenados por
+orden:
+
+• ``keys``     – n-gramas vistos (``array('q')`` ordenado)
+• ``logprob``  – log10 P_KN(w | h) ya interpolada
+• ``ctx_keys`` – historias h de longitud n-1 vistas como contexto
+• ``backoff``  – log10 γ(h), peso de la masa reservada a órdenes menores
+
+La consulta sigue el esquema ARPA: si hw está en la tabla de orden n se
+usa su probabilidad; si no, se suma el backoff de h y se baja un orden.
+El orden 1 cubre los 28 códigos, así que nunca hay probabilidad cero.
+
+Consultas escalares con `bisect`; por lotes con `np.searchsorted` si
+NumPy está disponible.
+
+Se guarda como pickle (`save`) o en el formato mapeable de
+`ngram_store.py` (`save_store`); `load` abre cualquiera de los dos.
+"""
+
+from __future__ import annotations
+
+import math
+import pickle
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from .char_ngrams import ALPHABET, BASE, SPACE_CODE, encode, CODE_LUT
+from .genome_batch import np, char_matrix
+from .ngram_store import is_store, open_store, write_store
+
+MAX_ORDER = 8
+FORMAT_VERSION = 1
+
+
+def normalize(text: str) -> str:
+    """Mayúsculas, fuera del alfabeto → espacio, espacios colapsados."""
+    text = "".join(c if c in ALPHABET else " " for c in text.upper())
+    return " ".join(text.split())
+
+
+# ─────────────────────────────────────────────────────────────
+# Recuento
+# ─────────────────────────────────────────────────────────────
+def count_ngrams(texts: Iterable[Tuple[str, int]], order: int) -> List[Counter]:
+    """
+    Cuenta n-gramas de orden 1..`order` sobre textos ya normalizados.
+
+    `texts` produce pares (texto, peso) – el peso permite construir el
+    modelo a partir de listas de frecuencias de palabras. Cada texto se
+    precede de `order - 1` espacios (historia completa desde el primer
+    carácter, como los <s> de un modelo de palabras) y termina en espacio.
+
+    Devuelve `counts[n]` = Counter{clave base 28: recuento} (counts[0] vacío).
+    """
+    counts = [Counter() for _ in range(order + 1)]
+    for text, weight in texts:
+        codes = encode(" " * (order - 1) + text + " ")
+        for n in range(1, order + 1):
+            mod = BASE ** n
+            key = 0
+            cnt = counts[n]
+            for i, c in enumerate(codes):
+                key = (key * BASE + c) % mod
+                if i >= n - 1:
+                    cnt[key] += weight
+    return counts
+
+
+def _discount(counts: Counter) -> float:
+    """D = n1 / (n1 + 2·n2) (Ney et al.), acotado a (0, 1)."""
+    freq_of_freq = Counter(counts.values())
+    n1, n2 = freq_of_freq.get(1, 0), freq_of_freq.get(2, 0)
+    if n1 == 0 or n2 == 0:
+        return 0.5
+    return min(max(n1 / (n1 + 2 * n2), 0.05), 0.95)
+
+
+# ─────────────────────────────────────────────────────────────
+# Modelo
+# ─────────────────────────────────────────────────────────────
+class CharNgramLM:
+    def __init__(self, order: int, tables: list):
+        """`tables[n]` = (keys, logprob, ctx_keys, backoff) para n = 1..order."""
+        if not 1 <= order <= MAX_ORDER:
+            raise ValueError(f"Orden {order} fuera de rango (1..{MAX_ORDER}).")
+        self.order = order
+        self.tables = tables
+        self.path: Path | None = None  # fichero mapeado que respalda las tablas
+        self._np_tables = None
+
+    # ------------------------------------------------------------------ #
+    # Construcción (Kneser-Ney interpolado)
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_counts(cls, counts: List[Counter], order: int) -> "CharNgramLM":
+        # recuentos ajustados: crudos en el orden máximo, de continuación
+        # (nº de caracteres distintos que preceden) en los inferiores
+        adjusted = [Counter() for _ in range(order + 1)]
+        adjusted[order] = counts[order]
+        for n in range(1, order):
+            mod = BASE ** n
+            cont = adjusted[n]
+            for key in counts[n + 1]:
+                cont[key % mod] += 1
+
+        probs: list = [None] * (order + 1)
+        tables: list = [None] * (order + 1)
+
+        # orden 1: interpolado con la uniforme sobre los 28 códigos
+        uni = adjusted[1]
+        d = _discount(uni)
+        total = sum(uni.values())
+        reserved = d * len(uni) / total if total else 1.0
+        probs[1] = {
+            c: max(uni.get(c, 0) - d, 0) / (total or 1) + reserved / BASE
+            for c in range(BASE)
+        }
+        tables[1] = cls._pack(probs[1], {})
+
+        for n in range(2, order + 1):
+            adj = adjusted[n]
+            d = _discount(adj)
+            lower = probs[n - 1]
+            lower_mod = BASE ** (n - 1)
+
+            ctx_total: Counter = Counter()
+            ctx_types: Counter = Counter()
+            for key, c in adj.items():
+                ctx_total[key // BASE] += c
+                ctx_types[key // BASE] += 1
+
+            gamma = {h: d * ctx_types[h] / ctx_total[h] for h in ctx_total}
+            probs[n] = {
+                key: (c - d) / ctx_total[key // BASE] + gamma[key // BASE] * lower[key % lower_mod]
+                for key, c in adj.items()
+            }
+            tables[n] = cls._pack(probs[n], gamma)
+
+        return cls(order, tables)
+
+    @staticmethod
+    def _pack(probs: dict, gamma: dict):
+        keys = sorted(probs)
+        ctx_keys = sorted(gamma)
+        return (
+            array("q", keys),
+            array("d", (math.log10(probs[k]) for k in keys)),
+            array("q", ctx_keys),
+            array("d", (math.log10(gamma[h]) for h in ctx_keys)),
+        )
+
+    # ------------------------------------------------------------------ #
+    # Persistencia
+    # ------------------------------------------------------------------ #
+    def save(self, path: str | Path) -> None:
+        with Path(path).open("wb") as f:
+            pickle.dump(
+                {"version": FORMAT_VERSION, "alphabet": ALPHABET,
+                 "order": self.order, "tables": self.tables[1:]},
+                f, protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+    _TABLE_FIELDS = ("keys", "logprob", "ctx_keys", "backoff")
+
+    def save_store(self, path: str | Path) -> Path:
+        arrays = {
+            f"{n}.{field}": array(a.typecode if isinstance(a, array) else a.format, a)
+            for n in range(1, self.order + 1)
+            for field, a in zip(self._TABLE_FIELDS, self.tables[n])
+        }
+        return write_store(path, "char_lm", arrays, alphabet=ALPHABET, order=self.order)
+
+    @classmethod
+    def load(cls, path: str | Path, order: int | None = None) -> "CharNgramLM":
+        """Carga un modelo; `order` permite usar sólo los órdenes inferiores."""
+        if is_store(path):
+            store = open_store(path, "char_lm")
+            if store.meta["alphabet"] != ALPHABET:
+                raise ValueError(f"Alfabeto incompatible en {path}")
+            order = min(order or store.meta["order"], store.meta["order"])
+            tables = [None] + [
+                tuple(store.array(f"{n}.{field}") for field in cls._TABLE_FIELDS)
+                for n in range(1, order + 1)
+            ]
+            model = cls(order, tables)
+            model.path = store.path
+            return model
+        with Path(path).open("rb") as f:
+            data = pickle.load(f)
+        if data.get("alphabet") != ALPHABET:
+            raise ValueError(f"Alfabeto incompatible en {path}")
+        order = min(order or data["order"], data["order"])
+        return cls(order, [None] + list(data["tables"][:order]))
+
+    def __len__(self) -> int:
+        return sum(len(t[0]) for t in self.tables[1:])
+
+    def __reduce_ex__(self, protocol):
+        if self.path is not None:  # el worker vuelve a mapear el fichero
+            return type(self).load, (self.path, self.order)
+        return super().__reduce_ex__(protocol)
+
+    # ------------------------------------------------------------------ #
+    # Consulta escalar
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _find(keys, values, key):
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return values[i]
+        return None
+
+    def position_logprob(self, codes: bytes, j: int) -> float:
+        """log10 P(codes[j] | historia) con backoff; `codes` viene de `pad()`."""
+        total = 0.0
+        for n in range(self.order, 0, -1):
+            keys, logprob, ctx_keys, backoff = self.tables[n]
+            key = 0
+            for c in codes[j - n + 1:j + 1]:
+                key = key * BASE + c
+            lp = self._find(keys, logprob, key)
+            if lp is not None:
+                return total + lp
+            bo = self._find(ctx_keys, backoff, key // BASE)
+            if bo is not None:
+                total += bo
+        raise AssertionError("el orden 1 cubre todos los códigos")
+
+    def pad(self, genes) -> bytes:
+        """Códigos del genoma precedidos de `order - 1` espacios de contexto."""
+        return bytes((SPACE_CODE,)) * (self.order - 1) + encode(genes)
+
+    def score(self, genes) -> float:
+        codes = self.pad(genes)
+        return sum(self.position_logprob(codes, j) for j in range(self.order - 1, len(codes)))
+
+    # ------------------------------------------------------------------ #
+    # Consulta por lotes (NumPy)
+    # ------------------------------------------------------------------ #
+    def _arrays(self):
+        if self._np_tables is None:
+            self._np_tables = [None] + [
+                tuple(np.asarray(a) for a in table)  # sin copia (array o memoryview)
+                for table in self.tables[1:]
+            ]
+        return self._np_tables
+
+    @staticmethod
+    def _search(keys, values, query):
+        """(encontrado, valor) para cada clave de `query`."""
+        if len(keys) == 0:
+            return np.zeros(query.shape, dtype=bool), np.zeros(query.shape)
+        pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+        found = keys[pos] == query
+        return found, np.where(found, values[pos], 0.0)
+
+    def score_batch(self, genomes):
+        m = CODE_LUT[char_matrix(genomes)].astype(np.int64)
+        pop, length = m.shape
+        ctx = self.order - 1
+        padded = np.full((pop, ctx + length), SPACE_CODE, dtype=np.int64)
+        padded[:, ctx:] = m
+
+        total = np.zeros((pop, length))
+        unresolved = np.ones((pop, length), dtype=bool)
+        tables = self._arrays()
+
+        for n in range(self.order, 0, -1):
+            # clave del n-grama que termina en cada posición del genoma
+            keys = np.zeros((pop, length), dtype=np.int64)
+            for t in range(ctx - n + 1, ctx + 1):
+                keys = keys * BASE + padded[:, t:t + length]
+
+            k_keys, k_lp, c_keys, c_bo = tables[n]
+            found, lp = self._search(k_keys, k_lp, keys)
+            hit = unresolved & found
+            total += np.where(hit, lp, 0.0)
+            unresolved &= ~found
+
+            if n > 1 and unresolved.any():
+                _, bo = self._search(c_keys, c_bo, keys // BASE)
+                total += np.where(unresolved, bo, 0.0)
+
+        return total.sum(axis=1)
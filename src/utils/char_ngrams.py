@@ -0,0 +1,166 @@
+"""
+char_ngrams
+===========
+
+Tablas densas de n-gramas de caracteres indexadas por código.
+
+Alfabeto: A–Z + espacio (27 símbolos) más un código 27 para cualquier
+otro carácter. Un n-grama de orden k se indexa como
+
+    idx = c0·28^(k-1) + c1·28^(k-2) + … + c(k-1)
+
+y su frecuencia se lee de una lista/array de 28^k posiciones, sin crear
+subcadenas ni calcular hashes de `str`.
+
+Por encima de `MAX_DENSE_ORDER` la tabla densa no cabe en memoria: se
+guarda sólo los n-gramas presentes (dict índice → frecuencia y, con NumPy,
+arrays de índices ordenados que se consultan con `searchsorted`).
+"""
+
+from __future__ import annotations
+
+import string
+from typing import Dict, List
+
+from .genome_batch import np, has_numpy, char_matrix
+
+ALPHABET = string.ascii_uppercase + " "
+OTHER = len(ALPHABET)  # código para caracteres fuera del alfabeto
+BASE = len(ALPHABET) + 1
+SPACE_CODE = ALPHABET.index(" ")
+
+MAX_DENSE_ORDER = 4  # 28^4 ≈ 615k posiciones
+MAX_INT64_ORDER = 13  # 28^13 < 2^63: índices de ventana en int64
+
+# byte latin-1 → código del alfabeto
+_BYTE_TO_CODE = bytes(
+    ALPHABET.index(chr(b)) if chr(b) in ALPHABET else OTHER for b in range(256)
+)
+CODE_LUT = np.frombuffer(_BYTE_TO_CODE, dtype=np.uint8) if has_numpy() else None
+
+
+def encode(genes) -> bytes:
+    """Genes (str, lista de caracteres o buffer latin-1) → bytes de códigos 0..27."""
+    if isinstance(genes, (bytes, bytearray)):
+        return bytes(genes).translate(_BYTE_TO_CODE)
+    text = genes if isinstance(genes, str) else "".join(genes)
+    return text.encode("latin-1", "replace").translate(_BYTE_TO_CODE)
+
+
+def ngram_index(ngram: str) -> int | None:
+    """Índice denso de un n-grama, o None si contiene caracteres fuera del alfabeto."""
+    idx = 0
+    for ch in ngram:
+        code = ALPHABET.find(ch)
+        if code < 0:
+            return None
+        idx = idx * BASE + code
+    return idx
+
+
+class CharNgramTable:
+    """
+    Tabla densa 28^k compilada a partir de dict{ngram: frecuencia}.
+
+    • `ignore_space=True` deja a 0 los n-gramas que contienen espacios.
+    • Las claves que no son cadenas de longitud `order` (p. ej. tuplas de
+      palabras) o con caracteres fuera del alfabeto se ignoran: nunca
+      podrían coincidir con una ventana del genoma.
+    • Con `order > MAX_DENSE_ORDER` la tabla es dispersa (`sparse=True`):
+      mismos índices y misma API, pero sólo con los n-gramas presentes.
+    """
+
+    def __init__(self, freqs: Dict, order: int, ignore_space: bool = False):
+        self.order = order
+        self.size = BASE ** order
+        self.ignore_space = ignore_space
+        self.sparse = order > MAX_DENSE_ORDER
+
+        entries: Dict[int, float] = {}
+        for key, freq in freqs.items():
+            if not isinstance(key, str) or len(key) != order:
+                continue
+            if ignore_space and " " in key:
+                continue
+            idx = ngram_index(key)
+            if idx is not None:
+                entries[idx] = freq
+
+        if self.sparse:
+            self.values = entries
+            self.array = None
+            if has_numpy() and order <= MAX_INT64_ORDER:
+                keys = sorted(entries)
+                self._keys = np.asarray(keys, dtype=np.int64)
+                # posición extra a 0 para los índices que no están
+                self._freqs = np.asarray([entries[i] for i in keys] + [0], dtype=np.float64)
+        else:
+            values: List = [0] * self.size
+            for idx, freq in entries.items():
+                values[idx] = freq
+            self.values = values
+            self.array = np.asarray(values, dtype=np.float64) if has_numpy() else None
+        # potencias de la base para calcular índices por columnas
+        self._weights = [BASE ** (order - 1 - j) for j in range(order)]
+
+    # ------------------------------------------------------------------ #
+    # Puntuación de un genoma
+    # ------------------------------------------------------------------ #
+    def score(self, codes: bytes):
+        """Suma de frecuencias de todas las ventanas de `codes` (ver `encode`)."""
+        values = self.values
+        if self.order == 2:
+            return sum(values[a * BASE + b] for a, b in zip(codes, codes[1:]))
+
+        k, size = self.order, self.size
+        if len(codes) < k:
+            return 0
+        idx = 0
+        for c in codes[:k - 1]:
+            idx = idx * BASE + c
+        total = 0
+        if self.sparse:
+            get = values.get
+            for c in codes[k - 1:]:
+                idx = (idx * BASE + c) % size
+                total += get(idx, 0)
+            return total
+        for c in codes[k - 1:]:
+            idx = (idx * BASE + c) % size
+            total += values[idx]
+        return total
+
+    def window(self, codes: bytes, start: int):
+        """Frecuencia de la ventana que empieza en `start`."""
+        idx = 0
+        for c in codes[start:start + self.order]:
+            idx = idx * BASE + c
+        if self.sparse:
+            return self.values.get(idx, 0)
+        return self.values[idx]
+
+    # ------------------------------------------------------------------ #
+    # Puntuación por lotes (NumPy)
+    # ------------------------------------------------------------------ #
+    def window_values(self, genomes):
+        """Matriz (pop_size × nº ventanas) con la frecuencia de cada ventana."""
+        codes = CODE_LUT[char_matrix(genomes)].astype(np.int64)
+        n_windows = codes.shape[1] - self.order + 1
+        if self.order > MAX_INT64_ORDER:
+            # índices demasiado grandes para int64: ventana a ventana
+            rows = [row.tobytes() for row in codes.astype(np.uint8)]
+            return np.array([[self.window(r, s) for s in range(max(n_windows, 0))]
+                             for r in rows], dtype=np.float64).reshape(len(rows), -1)
+        idx = np.zeros((codes.shape[0], max(n_windows, 0)), dtype=np.int64)
+        for j, w in enumerate(self._weights):
+            idx += codes[:, j:j + n_windows] * w
+        if not self.sparse:
+            return self.array[idx]
+        pos = np.searchsorted(self._keys, idx)
+        # las ventanas que no están apuntan a la posición extra (0)
+        found = pos < len(self._keys)
+        found[found] = self._keys[pos[found]] == idx[found]
+        return self._freqs[np.where(found, pos, len(self._keys))]
+
+    def score_batch(self, genomes):
+        return self.window_values(genomes).sum(axis=1)
@@ -0,0 +1,412 @@
+"""
+corpus_ngrams
+=============
+
+Recuento de n-gramas de caracteres y de palabras sobre corpus de texto
+plano de cualquier tamaño, con memoria acotada y en varios procesos.
+
+1. Troceo: cada fichero se divide en rangos de ~`chunk_mb` MB alineados
+   a líneas (`plan_chunks`); los trozos se reparten entre un pool de
+   procesos que los leen por su cuenta (nada de texto viaja por tuberías).
+2. Recuento por trozo en `Counter`s; cuando las tablas de un worker
+   superan `max_entries` claves se vuelcan a disco como *runs* ordenados
+   (una línea ``clave\\trecuento``) y se vacían. Las tablas de palabras
+   se reparten en `shards` particiones por hash de la clave.
+3. Pre-filtro opcional (count-min sketch, requiere NumPy): una primera
+   pasada resume los n-gramas de palabras en un sketch; en la segunda,
+   al volcar, se descartan las claves cuya estimación global no llega a
+   `min_count`. El sketch sólo sobreestima → nunca se pierde una clave
+   que sí llegue. Su error crece con el total de ocurrencias / anchura:
+   compensa con `min_count` alto o anchura grande.
+4. Mezcla k-way (`heapq.merge`) de los runs de cada (tabla, partición)
+   en paralelo, sumando las claves iguales, con poda por `min_count` y
+   `top_k` (montículo de tamaño k por partición y luego global). Con
+   muchos runs se mezcla por niveles (`MAX_OPEN_RUNS`).
+5. Con `store_dir`, las tablas de palabras no pasan nunca por un dict:
+   cada partición escribe su mezcla ordenada en disco y las particiones
+   se mezclan directamente en un fichero ``counts`` de `ngram_store`
+   (``<store_dir>/<tabla>.bin``), que se devuelve mapeado. Sin
+   `store_dir`, un ``word2`` sin podar de un corpus grande no cabe en
+   memoria.
+
+Tablas:
+• ``char1`` … ``char{n}`` – n-gramas del alfabeto A–Z + espacio (acentos
+  eliminados, resto → espacio), con el mismo relleno que
+  `char_lm.count_ngrams`. Acotadas por 28^n: no se podan.
+• ``word1`` / ``word2`` – palabras en minúsculas y sus parejas
+  consecutivas por línea (como scripts/build_es_word_ngrams.py); la clave
+  de un bigrama es ``"w1 w2"``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import re
+import tempfile
+import unicodedata
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from .char_ngrams import ALPHABET
+from .genome_batch import np
+from .ngram_store import StringCounts, write_counts, write_sorted_counts
+from .parallel import mp_context
+
+TOKEN_RE = re.compile(r"[A-Za-zÁÉÍÓÚÜÑáéíóúüñ]+")
+MAX_OPEN_RUNS = 128  # runs abiertos a la vez en una mezcla
+
+Chunk = Tuple[str, int, int]  # (fichero, byte inicial, byte final)
+
+
+# ─────────────────────────────────────────────────────────────
+# Troceo y lectura
+# ─────────────────────────────────────────────────────────────
+def plan_chunks(paths: Iterable[str | Path], chunk_bytes: int) -> List[Chunk]:
+    chunks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            chunks.append((str(path), start, min(start + chunk_bytes, size)))
+    return chunks
+
+
+def iter_chunk_lines(path: str, start: int, end: int) -> Iterator[str]:
+    """Líneas que *empiezan* en [start, end) (la que cruza el corte es del trozo anterior)."""
+    with open(path, "rb") as fh:
+        if start > 0:
+            fh.seek(start - 1)
+            fh.readline()  # resto de la línea que contiene start - 1
+        while fh.tell() < end:
+            line = fh.readline()
+            if not line:
+                break
+            yield line.decode("utf-8", "ignore").lstrip("\ufeff")
+
+
+# ─────────────────────────────────────────────────────────────
+# Normalización
+# ─────────────────────────────────────────────────────────────
+class _CharMap(dict):
+    """Tabla para `str.translate`: A–Z y espacio se quedan, marcas diacríticas fuera, resto → espacio."""
+
+    def __missing__(self, cp: int):
+        ch = chr(cp)
+        value = ch if ch in ALPHABET else (None if unicodedata.combining(ch) else " ")
+        self[cp] = value
+        return value
+
+
+_CHAR_MAP = _CharMap()
+
+
+def normalize_chars(text: str) -> str:
+    """"Canción, ¡ñu!" → "CANCION NU" (alfabeto de `char_ngrams`)."""
+    text = unicodedata.normalize("NFKD", text.upper()).translate(_CHAR_MAP)
+    return " ".join(text.split())
+
+
+def count_line(line: str, char_order: int, words: bool, tables: Dict[str, Counter]) -> None:
+    if char_order:
+        text = normalize_chars(line)
+        if text:
+            padded = " " * (char_order - 1) + text + " "
+            for n in range(1, char_order + 1):
+                tables[f"char{n}"].update(padded[i:i + n] for i in range(len(padded) - n + 1))
+    if words:
+        toks = TOKEN_RE.findall(line.lower())
+        if toks:
+            tables["word1"].update(toks)
+            tables["word2"].update(map(" ".join, zip(toks, toks[1:])))
+
+
+# ─────────────────────────────────────────────────────────────
+# Count-min sketch (pre-filtro de las tablas de palabras)
+# ─────────────────────────────────────────────────────────────
+class CountMinSketch:
+    def __init__(self, width: int = 1 << 20, depth: int = 4, table=None):
+        if np is None:
+            raise RuntimeError(
+                "El módulo 'numpy' no está instalado. "
+                "Ejecuta `pip install numpy` e inténtalo de nuevo."
+            )
+        self.width, self.depth = width, depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.uint32)
+
+    def _columns(self, keys: Sequence[str]):
+        data = [k.encode("utf-8") for k in keys]
+        h1 = np.fromiter((zlib.crc32(b) for b in data), dtype=np.int64, count=len(data))
+        h2 = np.fromiter((zlib.adler32(b) | 1 for b in data), dtype=np.int64, count=len(data))
+        rows = np.arange(self.depth, dtype=np.int64)[:, None]
+        return (h1[None, :] + rows * h2[None, :]) % self.width  # doble hash
+
+    def add(self, counts: Dict[str, int]) -> None:
+        if not counts:
+            return
+        cols = self._columns(list(counts))
+        values = np.fromiter(counts.values(), dtype=np.uint64, count=len(counts))
+        for row in range(self.depth):
+            acc = np.bincount(cols[row], weights=values, minlength=self.width)
+            self.table[row] = np.minimum(self.table[row] + acc, np.iinfo(np.uint32).max)
+
+    def estimate(self, keys: Sequence[str]):
+        if not keys:
+            return np.zeros(0, dtype=np.uint32)
+        cols = self._columns(keys)
+        return self.table[np.arange(self.depth)[:, None], cols].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        self.table = np.minimum(
+            self.table.astype(np.uint64) + other.table, np.iinfo(np.uint32).max
+        ).astype(np.uint32)
+
+
+# ─────────────────────────────────────────────────────────────
+# Runs en disco
+# ─────────────────────────────────────────────────────────────
+def write_run(path: Path, counts: Dict[str, int]) -> None:
+    write_stream(path, sorted(counts.items()))
+
+
+def write_stream(path: Path, items: Iterable[Tuple[str, int]]) -> None:
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.writelines(f"{k}\t{c}\n" for k, c in items)
+
+
+def read_run(path: Path) -> Iterator[Tuple[str, int]]:
+    with path.open(encoding="utf-8", buffering=1 << 20) as fh:
+        for line in fh:
+            key, _, count = line.rstrip("\n").rpartition("\t")
+            yield key, int(count)
+
+
+def merge_sorted(streams: Sequence[Iterable[Tuple[str, int]]]) -> Iterator[Tuple[str, int]]:
+    """Mezcla runs ordenados sumando los recuentos de claves iguales."""
+    merged = heapq.merge(*streams, key=lambda kv: kv[0])
+    for key, group in itertools.groupby(merged, key=lambda kv: kv[0]):
+        yield key, sum(c for _, c in group)
+
+
+# ─────────────────────────────────────────────────────────────
+# Worker
+# ─────────────────────────────────────────────────────────────
+_CFG: dict = {}
+
+
+def _init_worker(cfg: dict) -> None:
+    global _CFG
+    _CFG = cfg
+
+
+def _new_tables(char_order: int, words: bool) -> Dict[str, Counter]:
+    names = [f"char{n}" for n in range(1, char_order + 1)]
+    if words:
+        names += ["word1", "word2"]
+    return {name: Counter() for name in names}
+
+
+def shard_of(key: str, shards: int) -> int:
+    return zlib.crc32(key.encode("utf-8")) % shards if shards > 1 else 0
+
+
+def _shard_dir(spill_dir: Path, name: str, shard: int) -> Path:
+    return spill_dir / name / f"s{shard:03d}"
+
+
+def _spill(tables: Dict[str, Counter], tag: str) -> None:
+    cfg = _CFG
+    sketch, min_count = cfg["sketch"], cfg["min_count"]
+    for name, counts in tables.items():
+        if not counts:
+            continue
+        is_word = name.startswith("word")
+        if sketch is not None and is_word:
+            keys = list(counts)
+            keep = sketch.estimate(keys) >= min_count
+            counts = {k: counts[k] for k, ok in zip(keys, keep) if ok}
+
+        shards = cfg["shards"] if is_word else 1
+        parts: List[Dict[str, int]] = [{} for _ in range(shards)]
+        for key, count in counts.items():
+            parts[shard_of(key, shards)][key] = count
+        for shard, part in enumerate(parts):
+            if part:
+                write_run(_shard_dir(cfg["spill_dir"], name, shard) / f"{tag}.run", part)
+        tables[name] = Counter()
+
+
+def _count_chunk(job: Tuple[int, Chunk]) -> int:
+    """Pasada de recuento: vuelca runs ordenados del trozo; devuelve nº de líneas."""
+    idx, (path, start, end) = job
+    cfg = _CFG
+    tables = _new_tables(cfg["char_order"], cfg["words"])
+    n_lines, n_spill = 0, 0
+    for line in iter_chunk_lines(path, start, end):
+        count_line(line, cfg["char_order"], cfg["words"], tables)
+        n_lines += 1
+        if n_lines % 1000 == 0 and sum(map(len, tables.values())) > cfg["max_entries"]:
+            _spill(tables, f"{idx:06d}_{n_spill:03d}")
+            n_spill += 1
+    _spill(tables, f"{idx:06d}_{n_spill:03d}")
+    return n_lines
+
+
+def _sketch_chunk(job: Tuple[int, Chunk]):
+    """Pasada del sketch: sketch de los n-gramas de palabras del trozo."""
+    _, (path, start, end) = job
+    sketch = CountMinSketch(_CFG["sketch_width"], _CFG["sketch_depth"])
+    tables = _new_tables(0, True)
+    for i, line in enumerate(iter_chunk_lines(path, start, end), 1):
+        count_line(line, 0, True, tables)
+        if i % 1000 == 0 and sum(map(len, tables.values())) > _CFG["max_entries"]:
+            for counts in tables.values():
+                sketch.add(counts)
+            tables = _new_tables(0, True)
+    for counts in tables.values():
+        sketch.add(counts)
+    return sketch.table
+
+
+# ─────────────────────────────────────────────────────────────
+# Mezcla y poda
+# ─────────────────────────────────────────────────────────────
+def _merge_runs(runs: List[Path], work_dir: Path) -> Iterator[Tuple[str, int]]:
+    """Mezcla por niveles hasta que quedan ≤ MAX_OPEN_RUNS runs."""
+    level = 0
+    while len(runs) > MAX_OPEN_RUNS:
+        merged = []
+        for i in range(0, len(runs), MAX_OPEN_RUNS):
+            group = runs[i:i + MAX_OPEN_RUNS]
+            out = work_dir / f"merge_{level}_{i // MAX_OPEN_RUNS:06d}.run"
+            write_stream(out, merge_sorted([read_run(p) for p in group]))
+            for p in group:
+                p.unlink()
+            merged.append(out)
+        runs, level = merged, level + 1
+    return merge_sorted([read_run(p) for p in runs])
+
+
+def _top_k(stream: Iterable[Tuple[str, int]], top_k: int) -> Dict[str, int]:
+    heap: List[Tuple[int, str]] = []
+    for key, count in stream:
+        if len(heap) < top_k:
+            heapq.heappush(heap, (count, key))
+        elif count > heap[0][0]:
+            heapq.heapreplace(heap, (count, key))
+    return {key: count for count, key in sorted(heap, reverse=True)}
+
+
+def _merged_path(spill_dir: Path, name: str, shard: int) -> Path:
+    return _shard_dir(spill_dir, name, shard) / "merged.tsv"
+
+
+def _merge_shard(job: Tuple[str, int]) -> Tuple[str, Dict[str, int] | None]:
+    """
+    Mezcla y poda de una (tabla, partición). Las tablas de palabras sin
+    `top_k` con `stream` activo se escriben ordenadas en `_merged_path`
+    (→ None) en vez de devolverse.
+    """
+    name, shard = job
+    cfg = _CFG
+    work_dir = _shard_dir(cfg["spill_dir"], name, shard)
+    stream = _merge_runs(sorted(work_dir.glob("*.run")), work_dir)
+    if not name.startswith("word"):
+        return name, dict(stream)
+    stream = ((k, c) for k, c in stream if c >= cfg["min_count"])
+    if cfg["top_k"] is not None:
+        return name, _top_k(stream, cfg["top_k"])
+    if cfg["stream"]:
+        write_stream(_merged_path(cfg["spill_dir"], name, shard), stream)
+        return name, None
+    return name, dict(stream)
+
+
+# ─────────────────────────────────────────────────────────────
+# Orquestación
+# ─────────────────────────────────────────────────────────────
+def build_counts(
+        paths: Sequence[str | Path],
+        char_order: int = 2,
+        words: bool = True,
+        workers: int | None = None,
+        chunk_mb: float = 64,
+        max_entries: int = 2_000_000,
+        min_count: int = 1,
+        top_k: int | None = None,
+        shards: int | None = None,
+        sketch: bool = False,
+        sketch_width: int = 1 << 21,
+        sketch_depth: int = 4,
+        tmp_dir: str | Path | None = None,
+        store_dir: str | Path | None = None,
+        progress=print,
+) -> Dict[str, Mapping[str, int]]:
+    """
+    Cuenta n-gramas de `paths` y devuelve {tabla: {clave: recuento}}.
+    `min_count` / `top_k` se aplican a las tablas de palabras; con
+    `store_dir`, éstas se devuelven como `StringCounts` (ver arriba).
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers
+    chunks = list(enumerate(plan_chunks(paths, max(int(chunk_mb * (1 << 20)), 1))))
+    names = list(_new_tables(char_order, words))
+
+    with tempfile.TemporaryDirectory(prefix="rai_ngrams_", dir=tmp_dir) as tmp:
+        spill_dir = Path(tmp)
+        jobs = [(name, shard) for name in names
+                for shard in range(shards if name.startswith("word") else 1)]
+        for name, shard in jobs:
+            _shard_dir(spill_dir, name, shard).mkdir(parents=True)
+        cfg = {"char_order": char_order, "words": words, "max_entries": max_entries,
+               "spill_dir": spill_dir, "min_count": min_count, "top_k": top_k,
+               "shards": shards, "sketch": None, "stream": store_dir is not None,
+               "sketch_width": sketch_width, "sketch_depth": sketch_depth}
+
+        def pool():
+            return ProcessPoolExecutor(workers, mp_context=mp_context(),
+                                       initializer=_init_worker, initargs=(cfg,))
+
+        # 1) sketch (opcional): suma de los sketches de cada trozo
+        if sketch and words and min_count > 1:
+            total = CountMinSketch(sketch_width, sketch_depth)
+            with pool() as ex:
+                for i, table in enumerate(ex.map(_sketch_chunk, chunks), 1):
+                    total.merge(CountMinSketch(sketch_width, sketch_depth, table))
+                    progress(f"  sketch {i}/{len(chunks)}")
+            cfg["sketch"] = total
+
+        # 2) recuento con volcado a disco
+        lines = 0
+        with pool() as ex:
+            for i, n in enumerate(ex.map(_count_chunk, chunks), 1):
+                lines += n
+                progress(f"  recuento {i}/{len(chunks)} ({lines:,} líneas)")
+
+        # 3) mezcla y poda por (tabla, partición), en paralelo
+        result: Dict[str, Mapping[str, int]] = {name: {} for name in names}
+        with pool() as ex:
+            for name, part in ex.map(_merge_shard, jobs):
+                if part is not None:
+                    result[name].update(part)
+        for name in names:
+            if not name.startswith("word"):
+                continue
+            if top_k is not None:  # top-k global a partir del de cada partición
+                result[name] = dict(heapq.nlargest(top_k, result[name].items(), key=lambda kv: kv[1]))
+            if store_dir is None:
+                continue
+            Path(store_dir).mkdir(parents=True, exist_ok=True)
+            path = Path(store_dir) / f"{name}.bin"
+            if top_k is not None:
+                write_counts(path, result[name])
+            else:  # particiones disjuntas y ordenadas → mezcla directa al fichero
+                parts = [read_run(_merged_path(spill_dir, name, shard)) for shard in range(shards)]
+                write_sorted_counts(path, heapq.merge(*parts, key=lambda kv: kv[0]))
+            result[name] = StringCounts(path)
+        for name in names:
+            progress(f"  {name}: {len(result[name]):,} claves")
+    return result
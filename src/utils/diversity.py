@@ -0,0 +1,204 @@
+"""
+DiversityTracker
+================
+
+Nº de genomas distintos de la población, sin construir conjuntos de
+tuplas en cada generación.
+
+Modos
+─────
+• ``exact``  → multiconjunto (Counter) de hashes de genoma, mantenido de
+  forma incremental: `reset` al crear la población y `assign(i, h)`
+  cada vez que el motor pone un genoma nuevo en la posición i (sólo
+  cambia el recuento de los hashes que entran y salen).
+• ``sample`` → estimación a partir de una muestra aleatoria de tamaño
+  `sample_size`: los genomas vistos una sola vez se extrapolan a toda
+  la población y los repetidos cuentan una vez (encaja con la forma
+  típica de la población: clones de la élite + hijos únicos).
+• ``hll``    → HyperLogLog con 2**`precision` registros: memoria fija y
+  error relativo ≈ 1.04 / sqrt(2**precision).
+
+Los hashes de genoma deben ser enteros de 64 bits; se pasan por un
+finalizador *splitmix64* antes de usarlos en HyperLogLog.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import Counter
+from typing import Callable, Iterable, Sequence
+
+from .genome_batch import np, is_matrix
+
+MODES = ("exact", "sample", "hll")
+
+_MASK64 = (1 << 64) - 1
+
+
+def _splitmix64(h: int) -> int:
+    h = (h + 0x9E3779B97F4A7C15) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+
+def _splitmix64_array(h):
+    with np.errstate(over="ignore"):
+        h = h + np.uint64(0x9E3779B97F4A7C15)
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+class DiversityTracker:
+    def __init__(
+            self,
+            mode: str = "exact",
+            sample_size: int = 1024,
+            precision: int = 12,
+            seed: int | None = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Modo de diversidad '{mode}' no reconocido {MODES}.")
+        self.mode = mode
+        self.sample_size = sample_size
+        self.precision = precision
+        self._rng = random.Random(seed)
+
+        self.counts: Counter = Counter()
+        self.slots: list = []  # hash del genoma en cada posición de la población
+        self._estimate = 0
+
+    @property
+    def incremental(self) -> bool:
+        """True si el motor debe avisar con `reset` / `assign` en lugar de llamar a `measure`."""
+        return self.mode == "exact"
+
+    # ------------------------------------------------------------------ #
+    # Actualización incremental (modo exacto)
+    # ------------------------------------------------------------------ #
+    def add(self, h: int) -> None:
+        self.counts[h] += 1
+        self._estimate = len(self.counts)
+
+    def remove(self, h: int) -> None:
+        left = self.counts[h] - 1
+        if left > 0:
+            self.counts[h] = left
+        else:
+            del self.counts[h]
+        self._estimate = len(self.counts)
+
+    def replace(self, old: int, new: int) -> None:
+        if old != new:
+            self.remove(old)
+            self.add(new)
+
+    def distinct(self) -> int:
+        return self._estimate
+
+    def reset(self, hashes: Iterable[int]) -> int:
+        """Población completa nueva (creación, arranque en caliente)."""
+        self.slots = list(hashes)
+        self.counts = Counter(self.slots)
+        self._estimate = len(self.counts)
+        return self._estimate
+
+    def assign(self, i: int, h: int) -> None:
+        """La posición `i` de la población pasa a contener un genoma de hash `h`."""
+        self.replace(self.slots[i], h)
+        self.slots[i] = h
+
+    def assign_all(self, hashes: Sequence[int]) -> int:
+        """Nueva generación, posición a posición (`reset` si cambia el tamaño)."""
+        if len(hashes) != len(self.slots):
+            return self.reset(hashes)
+        for i, h in enumerate(hashes):
+            self.assign(i, h)
+        return self._estimate
+
+    # ------------------------------------------------------------------ #
+    # Medición de una población completa
+    # ------------------------------------------------------------------ #
+    def measure(self, items: Sequence, hash_of: Callable = hash) -> int:
+        """Recalcula la diversidad de `items` usando `hash_of(item)` como hash de genoma."""
+        if self.mode == "sample" and len(items) > self.sample_size:
+            sample = self._rng.sample(items, self.sample_size)
+            self._estimate = self._from_sample(Counter(map(hash_of, sample)), len(items))
+        elif self.mode == "hll":
+            self._estimate = min(self._hll(hash_of(x) for x in items), len(items))
+        else:
+            self.counts = Counter(map(hash_of, items))
+            self._estimate = len(self.counts)
+        return self._estimate
+
+    def measure_hashes(self, hashes) -> int:
+        """Igual que `measure`, pero con un vector NumPy ``uint64`` de hashes ya calculados."""
+        if not is_matrix(hashes):
+            return self.measure(list(hashes), hash_of=lambda h: h)
+
+        n = len(hashes)
+        if self.mode == "sample" and n > self.sample_size:
+            idx = self._rng.sample(range(n), self.sample_size)
+            values, freq = np.unique(hashes[idx], return_counts=True)
+            self._estimate = self._from_sample(dict(zip(values.tolist(), freq.tolist())), n)
+        elif self.mode == "hll":
+            self._estimate = min(self._hll_array(hashes), n)
+        else:
+            self._estimate = int(np.unique(hashes).size)
+        return self._estimate
+
+    # ------------------------------------------------------------------ #
+    # Estimadores
+    # ------------------------------------------------------------------ #
+    def _from_sample(self, sample_counts, population: int) -> int:
+        """(N/n)·f1 + Σ_{j≥2} f_j  (f_j = valores vistos j veces en la muestra de tamaño n)."""
+        n = sum(sample_counts.values())
+        f1 = sum(1 for c in sample_counts.values() if c == 1)
+        rest = len(sample_counts) - f1
+        estimate = population / n * f1 + rest
+        return int(round(min(max(estimate, len(sample_counts)), population)))
+
+    def _hll_finish(self, registers: Sequence[int]) -> int:
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        if is_matrix(registers):
+            harmonic = float(np.ldexp(1.0, -registers).sum())
+            zeros = int((registers == 0).sum())
+        else:
+            harmonic = sum(2.0 ** -r for r in registers)
+            zeros = registers.count(0)
+        estimate = alpha * m * m / harmonic
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # corrección de rango pequeño
+        return int(round(estimate))
+
+    def _hll(self, hashes: Iterable[int]) -> int:
+        p = self.precision
+        tail_bits = 64 - p
+        tail_mask = (1 << tail_bits) - 1
+        registers = [0] * (1 << p)
+
+        for h in hashes:
+            h = _splitmix64(h & _MASK64)
+            idx = h >> tail_bits
+            rank = tail_bits - (h & tail_mask).bit_length() + 1
+            if rank > registers[idx]:
+                registers[idx] = rank
+        return self._hll_finish(registers)
+
+    def _hll_array(self, hashes) -> int:
+        p = self.precision
+        tail_bits = 64 - p
+        h = _splitmix64_array(hashes.astype(np.uint64))
+
+        idx = (h >> np.uint64(tail_bits)).astype(np.int64)
+        tail = h & np.uint64((1 << tail_bits) - 1)
+        # bit_length vía exponente de coma flotante (aproximado en el último bit)
+        bit_length = np.where(tail > 0, np.frexp(tail.astype(np.float64))[1], 0)
+        rank = tail_bits - bit_length + 1
+
+        registers = np.zeros(1 << p, dtype=np.int64)
+        np.maximum.at(registers, idx, rank)
+        return self._hll_finish(registers)
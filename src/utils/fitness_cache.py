@@ -0,0 +1,131 @@
+"""
+FitnessCache
+============
+
+Memoización de fitness por contenido del genoma con expulsión LRU.
+
+• Clave: bytes del buffer (filas NumPy, genomas compactos), cadena
+  (listas de caracteres) o tupla (genes numéricos / IDs de palabras).
+• Límite de memoria: nº máximo de entradas y/o tamaño aproximado en bytes.
+• Contadores de aciertos, fallos y expulsiones para el informe final.
+
+Cualquier objeto con `evaluate(genomes, score_batch)` y `report()` puede
+sustituirla en los motores.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Callable, Hashable, List
+
+from .genome_batch import np, is_matrix
+
+# sobrecoste aproximado de una entrada del OrderedDict + float
+_ENTRY_OVERHEAD = 120
+
+
+class FitnessCache:
+    def __init__(self, max_entries: int = 100_000, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._data: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------ #
+    # Claves
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def key(genes) -> Hashable:
+        if is_matrix(genes) or isinstance(genes, array):
+            return genes.tobytes()
+        if isinstance(genes, (bytes, bytearray)):
+            return bytes(genes)
+        if genes and isinstance(genes[0], str):
+            return "".join(genes)
+        return tuple(genes)
+
+    # ------------------------------------------------------------------ #
+    # Acceso
+    # ------------------------------------------------------------------ #
+    def get(self, key: Hashable) -> float | None:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: float) -> None:
+        if key in self._data:
+            self._data.move_to_end(key)
+            self._data[key] = value
+            return
+
+        self._data[key] = value
+        self._bytes += sys.getsizeof(key) + _ENTRY_OVERHEAD
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, _ = self._data.popitem(last=False)
+            self._bytes -= sys.getsizeof(key) + _ENTRY_OVERHEAD
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ------------------------------------------------------------------ #
+    # Evaluación de una población
+    # ------------------------------------------------------------------ #
+    def evaluate(self, genomes, score_batch: Callable) -> List[float]:
+        """
+        Fitness de cada genoma: los ya conocidos salen de la caché y el
+        resto (sin duplicados) se evalúa con **una** llamada a `score_batch`.
+        """
+        keys = [self.key(g) for g in genomes]
+        out: List[float | None] = [None] * len(keys)
+
+        pending: dict[Hashable, List[int]] = {}
+        for i, k in enumerate(keys):
+            value = self.get(k)
+            if value is not None:
+                out[i] = value
+                self.hits += 1
+            elif k in pending:
+                pending[k].append(i)
+                self.hits += 1
+            else:
+                pending[k] = [i]
+                self.misses += 1
+
+        if pending:
+            first = [idx[0] for idx in pending.values()]
+            subset = genomes[np.asarray(first)] if is_matrix(genomes) else [genomes[i] for i in first]
+            for (k, idx), value in zip(pending.items(), score_batch(subset)):
+                self.put(k, value)
+                for i in idx:
+                    out[i] = value
+
+        return out
+
+    # ------------------------------------------------------------------ #
+    # Informe
+    # ------------------------------------------------------------------ #
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self) -> str:
+        return (
+            f"🧠 Caché de fitness: {self.hits} aciertos / {self.misses} fallos "
+            f"({self.hit_rate:.1%}) - {len(self)} entradas - {self.evictions} expulsiones"
+        )
@@ -0,0 +1,85 @@
+"""
+genome_batch
+============
+
+Utilidades para evaluar poblaciones completas de una vez.
+
+Un *batch* de genomas puede llegar como:
+
+• lista de genomas clásicos (listas de caracteres o de floats),
+• lista de genomas compactos (`bytearray` / `array('d')`, ver
+  `Individual`), o
+• matriz NumPy (pop_size × gene_length) — ``uint8`` con códigos
+  latin-1 para caracteres, ``float64`` para genes numéricos.
+
+Los escenarios vectorizados convierten a matriz con `char_matrix()` /
+`float_matrix()`; la implementación genérica recorre `iter_genomes()`.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator
+
+# ─────────────────────────────────────────────────────────────
+# Dependencia opcional: numpy
+# ─────────────────────────────────────────────────────────────
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+SPACE = ord(" ")
+
+# tablas código latin-1 → str.isalpha() / str.isspace()
+IS_ALPHA = np.array([chr(i).isalpha() for i in range(256)]) if np is not None else None
+IS_SPACE = np.array([chr(i).isspace() for i in range(256)]) if np is not None else None
+
+
+def has_numpy() -> bool:
+    return np is not None
+
+
+def is_matrix(genomes) -> bool:
+    return np is not None and isinstance(genomes, np.ndarray)
+
+
+# ─────────────────────────────────────────────────────────────
+# Conversión
+# ─────────────────────────────────────────────────────────────
+def iter_genomes(genomes) -> Iterator[list]:
+    """Recorre el batch devolviendo cada genoma en su forma clásica (lista)."""
+    if not is_matrix(genomes):
+        for g in genomes:
+            if isinstance(g, (bytes, bytearray)):
+                yield list(g.decode("latin-1"))
+            elif isinstance(g, array):
+                yield g.tolist()
+            else:
+                yield g
+        return
+
+    if genomes.dtype == np.uint8:
+        for row in genomes:
+            yield list(row.tobytes().decode("latin-1"))
+    else:
+        yield from genomes.tolist()
+
+
+def char_matrix(genomes):
+    """Batch de genomas de caracteres → matriz ``uint8`` (sin copia si ya lo es)."""
+    if is_matrix(genomes):
+        return genomes
+    if not genomes:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    if isinstance(genomes[0], (bytes, bytearray)):
+        data = b"".join(genomes)
+    else:
+        data = "".join("".join(g) for g in genomes).encode("latin-1")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(genomes), -1)
+
+
+def float_matrix(genomes):
+    """Batch de genomas numéricos → matriz ``float64``."""
+    return np.asarray(genomes, dtype=np.float64).reshape(len(genomes), -1)
@@ -0,0 +1,167 @@
+"""
+HallOfFame
+==========
+
+Archivo de los K mejores genomas **distintos** vistos durante una
+ejecución.
+
+• Deduplicación por contenido: cada genoma se indexa por su tupla
+  (hash) → un mismo genoma no ocupa dos puestos.
+• Montículo de mínimos de tamaño K: `update()` descarta en O(1) a
+  quien no supera al peor del archivo, sin calcular hashes.
+• Escritura en segundo plano: un hilo vuelca el archivo a disco cada
+  `flush_interval` segundos si ha cambiado (escritura atómica vía
+  fichero temporal), y `close()` hace el volcado final. El bucle
+  evolutivo nunca espera a la E/S.
+• Consulta por posición: ``hof[0]`` es el mejor, ``hof.top(5)`` los
+  cinco primeros; `HallOfFame.load(path)` recupera un archivo guardado.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+Entry = Tuple[list, float]  # (genoma, fitness)
+
+
+class HallOfFame:
+    def __init__(self, capacity: int = 10, path: str | Path | None = None,
+                 flush_interval: float = 5.0):
+        if capacity < 1:
+            raise ValueError("capacity debe ser ≥ 1.")
+        self.capacity = capacity
+        self.path = Path(path) if path is not None else None
+        self.flush_interval = flush_interval
+
+        # montículo de (fitness, nº de llegada, clave); la clave es la tupla del genoma
+        self._heap: List[Tuple[float, int, tuple]] = []
+        self._members: Dict[tuple, float] = {}
+        self._arrivals = itertools.count()
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------ #
+    # Inserción
+    # ------------------------------------------------------------------ #
+    def threshold(self) -> float | None:
+        """Fitness mínima para entrar (None mientras no esté lleno)."""
+        return self._heap[0][0] if len(self._heap) >= self.capacity else None
+
+    def offer(self, genome: Sequence, fitness: float) -> bool:
+        """Propone un genoma; devuelve True si entra en el archivo."""
+        thr = self.threshold()
+        if thr is not None and fitness <= thr:
+            return False
+
+        key = tuple(genome)
+        with self._lock:
+            if key in self._members:
+                return False
+            item = (fitness, -next(self._arrivals), key)  # a igual fitness, sale el más reciente
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, item)
+            else:
+                _, _, evicted = heapq.heapreplace(self._heap, item)
+                del self._members[evicted]
+            self._members[key] = fitness
+            self._dirty = True
+        self._ensure_writer()
+        return True
+
+    def update(self, population: Sequence[Sequence], fitnesses: Sequence[float]) -> int:
+        """Ofrece toda una población; devuelve cuántos genomas han entrado."""
+        added = 0
+        thr = self.threshold()
+        for i, fitness in enumerate(fitnesses):
+            if thr is not None and fitness <= thr:
+                continue  # el genoma ni se materializa
+            if self.offer(population[i], fitness):
+                added += 1
+                thr = self.threshold()
+        return added
+
+    # ------------------------------------------------------------------ #
+    # Consulta
+    # ------------------------------------------------------------------ #
+    def ranked(self) -> List[Entry]:
+        """Entradas de mejor a peor."""
+        with self._lock:
+            items = sorted(self._heap, reverse=True)
+        return [(list(key), fitness) for fitness, _, key in items]
+
+    def top(self, n: int) -> List[Entry]:
+        return self.ranked()[:n]
+
+    def __getitem__(self, rank: int) -> Entry:
+        return self.ranked()[rank]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, genome) -> bool:
+        return tuple(genome) in self._members
+
+    # ------------------------------------------------------------------ #
+    # Persistencia
+    # ------------------------------------------------------------------ #
+    def save(self, path: str | Path | None = None) -> Path:
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("HallOfFame sin ruta de guardado.")
+        with self._lock:
+            self._dirty = False
+        entries = self.ranked()
+
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(entries, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path, capacity: int | None = None) -> "HallOfFame":
+        with Path(path).open("rb") as fh:
+            entries: List[Entry] = pickle.load(fh)
+        hof = cls(capacity or max(len(entries), 1))
+        for genome, fitness in entries:
+            hof.offer(genome, fitness)
+        hof._dirty = False
+        return hof
+
+    # ------------------------------------------------------------------ #
+    # Hilo de escritura
+    # ------------------------------------------------------------------ #
+    def _ensure_writer(self) -> None:
+        if self.path is None or self._thread is not None or self._stop.is_set():
+            return
+        self._thread = threading.Thread(target=self._writer_loop, name="hall-of-fame", daemon=True)
+        self._thread.start()
+
+    def _writer_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            if self._dirty:
+                self.save()
+
+    def close(self) -> None:
+        """Detiene el hilo y hace el volcado final (si hay ruta)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.path is not None and (self._dirty or not self.path.exists()) and self._heap:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
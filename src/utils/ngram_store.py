@@ -0,0 +1,334 @@
+"""
+ngram_store
+===========
+
+Formato binario único para las tablas de n-gramas, cargado con `mmap`
+(misma idea que `vocab_store.py`): abrir un fichero no deserializa nada
+y todos los procesos que lo abren comparten las páginas en la caché del
+sistema.
+
+Disposición del fichero (little-endian):
+
+    cabecera   magic "RAINGRM1" · uint32 versión · uint32 reservado
+               · uint64 bytes de la cabecera JSON
+    JSON       {"kind": …, "arrays": {nombre: [typecode, offset, n]}, …}
+    arrays     datos de cada array, alineados a 8 bytes
+
+Tipos (`kind`):
+• ``counts``      – `StringCounts`: dict{str: int} (n-gramas de caracteres,
+                    palabras) o dict{(str, str): int} (bigramas de palabras).
+• ``word_bigrams`` – `WordBigramTable` (src/utils/word_ngrams.py).
+• ``char_lm``     – `CharNgramLM` (src/utils/char_lm.py).
+
+Los objetos respaldados por un fichero se serializan (pickle → workers
+con spawn) como su ruta: el worker vuelve a mapear el mismo fichero.
+
+Recuentos cuantizados (``write_counts(..., bits=8 | 16)``): cada valor
+es una cubeta logarítmica uint8/uint16 en vez de un int64,
+
+        q = round(ln(recuento) / paso)      paso = ln(máximo) / (2^bits − 1)
+
+con error relativo ≤ e^(paso/2) − 1 (≈ ±4 % con 8 bits y máximos de
+1e9; ≈ ±0.02 % con 16). Al leer, la cubeta pasa por una tabla de
+2^bits valores según la escala de puntuación (`SCALES`):
+
+• ``count`` – recuento aproximado (sustituto directo del dict original)
+• ``log``   – log10(recuento): suma de frecuencias → suma de log-frecuencias
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+from .genome_batch import np
+from .vocab_store import _bucket_count, _hash, _le_array
+
+MAGIC = b"RAINGRM1"
+VERSION = 1
+SUFFIX = ".bin"
+_HEADER = struct.Struct("<8sIIQ")
+_ALIGN = 8
+_PAIR_SEP = "\t"
+SCALES = ("count", "log")
+_QUANT_CODES = {8: "B", 16: "H"}
+
+
+def store_path(path: str | Path) -> Path:
+    """Fichero binario que acompaña a un pickle (``es_bigrams.pkl`` → ``es_bigrams.bin``)."""
+    return Path(path).with_suffix(SUFFIX)
+
+
+def prefer_store(path: str | Path) -> Path:
+    """
+    `path` o, si existe y no es más antigua que `path`, su versión
+    binaria (un pickle regenerado después deja obsoleto el .bin).
+    """
+    path = Path(path)
+    binary = store_path(path)
+    if binary.exists() and (not path.exists() or binary.stat().st_mtime >= path.stat().st_mtime):
+        return binary
+    return path
+
+
+def drop_store(path: str | Path) -> bool:
+    """Borra la versión binaria de `path` (al reescribir el pickle); True si existía."""
+    binary = store_path(path)
+    if binary.exists():
+        binary.unlink()
+        return True
+    return False
+
+
+def is_store(path: str | Path) -> bool:
+    with Path(path).open("rb") as fh:
+        return fh.read(len(MAGIC)) == MAGIC
+
+
+# ─────────────────────────────────────────────────────────────
+# Contenedor de arrays
+# ─────────────────────────────────────────────────────────────
+def write_store(path: str | Path, kind: str, arrays: Dict[str, array], **meta) -> Path:
+    """Escribe `arrays` (array.array) con sus metadatos en formato binario."""
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        layout[name] = [arr.typecode, offset, len(arr)]
+        offset += -(-len(arr) * arr.itemsize // _ALIGN) * _ALIGN
+
+    def header(base: int) -> bytes:
+        data = {"kind": kind, "arrays": {n: [t, base + o, c] for n, (t, o, c) in layout.items()}, **meta}
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    # la cabecera contiene los offsets absolutos, que dependen de su propio tamaño
+    base = 0
+    while True:
+        head = header(base)
+        start = -(-(_HEADER.size + len(head)) // _ALIGN) * _ALIGN
+        if start == base:
+            break
+        base = start
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, 0, len(head)))
+        fh.write(head)
+        for name, arr in arrays.items():
+            fh.seek(layout[name][1] + base)
+            fh.write(_le_array(arr.typecode, arr) if sys.byteorder == "big" else arr)
+        fh.truncate(base + offset)
+    tmp.replace(path)
+    return path
+
+
+class ArrayStore:
+    """Vista de sólo lectura sobre un fichero de `write_store`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, head_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Formato de n-gramas no reconocido → {self.path}")
+        self.meta = json.loads(bytes(self._mm[_HEADER.size:_HEADER.size + head_size]))
+        self.kind: str = self.meta["kind"]
+        self._view = memoryview(self._mm)
+
+    def array(self, name: str):
+        """Array `name` sin copiar (memoryview tipado; copia sólo en big-endian)."""
+        typecode, offset, n = self.meta["arrays"][name]
+        size = array(typecode).itemsize
+        raw = self._view[offset:offset + n * size]
+        if sys.byteorder == "big":  # el fichero es little-endian
+            arr = array(typecode, bytes(raw))
+            arr.byteswap()
+            return arr
+        return raw.cast(typecode)
+
+
+def open_store(path: str | Path, kind: str) -> ArrayStore:
+    store = ArrayStore(path)
+    if store.kind != kind:
+        raise ValueError(f"{path} contiene '{store.kind}', no '{kind}'.")
+    return store
+
+
+# ─────────────────────────────────────────────────────────────
+# Recuentos con clave de texto
+# ─────────────────────────────────────────────────────────────
+def quantize(counts: Iterable[int], bits: int) -> Tuple[array, float]:
+    """Recuentos (≥ 1) → (cubetas log uint8/uint16, paso en ln)."""
+    if bits not in _QUANT_CODES:
+        raise ValueError(f"bits debe ser uno de {sorted(_QUANT_CODES)}.")
+    if not isinstance(counts, array):
+        counts = list(counts)
+    top = (1 << bits) - 1
+    step = math.log(max(counts, default=1)) / top or 1.0
+    buckets = array(_QUANT_CODES[bits],
+                    (min(round(math.log(c) / step), top) if c > 1 else 0 for c in counts))
+    return buckets, step
+
+
+def write_counts(path: str | Path, counts: Mapping, bits: int | None = None) -> Path:
+    """
+    dict{str: int} o dict{(str, str): int} → fichero ``counts``.
+    Claves: blob UTF-8 + offsets; búsqueda por tabla hash (como el vocabulario).
+    `bits` = 8 | 16 guarda los valores cuantizados (ver arriba).
+    """
+    pairs = bool(counts) and isinstance(next(iter(counts)), tuple)
+    return write_sorted_counts(path, ((k, counts[k]) for k in sorted(counts)), pairs, bits)
+
+
+def write_sorted_counts(path: str | Path, items: Iterable[Tuple], pairs: bool = False,
+                        bits: int | None = None) -> Path:
+    """
+    Como `write_counts`, pero en streaming a partir de (clave, recuento)
+    ya ordenados por clave (p. ej. la mezcla de runs de `corpus_ngrams`):
+    en memoria sólo están los arrays del fichero, nunca un dict.
+    """
+    offsets, values, blob = array("Q", [0]), array("q"), array("B")
+    for key, count in items:
+        blob.frombytes((_PAIR_SEP.join(key) if pairs else key).encode("utf-8"))
+        offsets.append(len(blob))
+        values.append(count)
+
+    m = _bucket_count(len(values))
+    index = array("I", bytes(4 * m))
+    with memoryview(blob) as view:
+        for i in range(len(values)):
+            slot = _hash(view[offsets[i]:offsets[i + 1]]) & (m - 1)
+            while index[slot]:
+                slot = (slot + 1) & (m - 1)
+            index[slot] = i + 1
+
+    step = None
+    if bits is not None:
+        values, step = quantize(values, bits)
+    return write_store(path, "counts", {
+        "offsets": offsets,
+        "index": index,
+        "values": values,
+        "blob": blob,
+    }, pairs=pairs, bits=bits, log_step=step)
+
+
+def _value_reader(store_meta: dict, scale: str) -> Callable[[int], float]:
+    """Valor almacenado → valor en la escala pedida."""
+    if scale not in SCALES:
+        raise ValueError(f"Escala '{scale}' no soportada (usa una de {SCALES}).")
+    bits = store_meta.get("bits")
+    if bits is None:
+        return int if scale == "count" else _log10
+    step = store_meta["log_step"]
+    if scale == "log":
+        step /= math.log(10)
+    if np is not None:  # 2^16 exp en Python ≈ 15 ms por tabla abierta
+        logs = np.arange(1 << bits, dtype=np.float64) * step
+        lut = array("d", (np.exp(logs) if scale == "count" else logs).tobytes())
+    else:
+        lut = array("d", (math.exp(q * step) if scale == "count" else q * step
+                          for q in range(1 << bits)))
+    return lut.__getitem__
+
+
+def _log10(count: int) -> float:
+    return math.log10(count) if count > 0 else 0.0
+
+
+class StringCounts(Mapping):
+    """
+    dict de sólo lectura sobre un fichero ``counts`` (claves ordenadas al
+    iterar); los valores se devuelven en la escala `scale` (`SCALES`).
+    """
+
+    def __init__(self, path: str | Path, scale: str = "count"):
+        store = open_store(path, "counts")
+        self.path = store.path
+        self.scale = scale
+        self.pairs: bool = store.meta["pairs"]
+        self.bits: int | None = store.meta.get("bits")  # None → recuentos exactos
+        self._read = _value_reader(store.meta, scale)
+        self._offsets = store.array("offsets")
+        self._index = store.array("index")
+        self._values = store.array("values")
+        self._blob = store.array("blob")
+        self._mask = len(self._index) - 1
+
+    def _key_bytes(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def _decode(self, data: bytes):
+        text = data.decode("utf-8")
+        return tuple(text.split(_PAIR_SEP)) if self.pairs else text
+
+    def _find(self, key) -> int:
+        if self.pairs:
+            if not isinstance(key, tuple):
+                return -1
+            key = _PAIR_SEP.join(key)
+        elif not isinstance(key, str):
+            return -1
+        data = key.encode("utf-8")
+        slot = _hash(data) & self._mask
+        while True:
+            entry = self._index[slot]
+            if entry == 0:
+                return -1
+            if self._key_bytes(entry - 1) == data:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def __getitem__(self, key) -> int:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._read(self._values[i])
+
+    def get(self, key, default=None):
+        i = self._find(key)
+        return default if i < 0 else self._read(self._values[i])
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator:
+        return (k for k, _ in self.items())
+
+    def items(self) -> Iterator[Tuple]:
+        """(clave, recuento) en orden de clave; decodifica el blob de una vez."""
+        blob, off, decode = bytes(self._blob), self._offsets, self._decode
+        values, read = self._values, self._read
+        return ((decode(blob[off[i]:off[i + 1]]), read(values[i])) for i in range(len(self)))
+
+    def with_scale(self, scale: str) -> "StringCounts":
+        """El mismo fichero (mismas páginas) leído en otra escala."""
+        return self if scale == self.scale else type(self)(self.path, scale)
+
+    def __reduce__(self):
+        return type(self), (self.path, self.scale)
+
+
+def load_counts(path: str | Path, scale: str = "count") -> Mapping:
+    """
+    Recuentos de `path` en la escala `scale`: mapeados si hay versión
+    binaria (exacta o cuantizada), si no, el pickle.
+    """
+    path = prefer_store(path)
+    if is_store(path):
+        return StringCounts(path, scale)
+    read = _value_reader({}, scale)
+    with path.open("rb") as fh:
+        counts = pickle.load(fh)
+    return counts if scale == "count" else {k: read(v) for k, v in counts.items()}
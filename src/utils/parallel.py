@@ -0,0 +1,121 @@
+"""
+parallel
+========
+
+Evaluación de fitness repartida entre varios procesos.
+
+`ParallelEvaluator(score_batch, workers)` trocea la población en bloques
+contiguos, los evalúa en un pool de procesos y concatena los resultados
+en el mismo orden → mismas fitness que la ruta serie.
+
+Tablas de sólo lectura (bigramas, unigramas, vocabulario…)
+──────────────────────────────────────────────────────────
+`score_batch` (y el escenario al que pertenece, con todas sus tablas) se
+entrega a cada worker **una sola vez**, al arrancar el pool:
+
+• Linux (`fork`): los workers heredan la memoria del proceso padre; las
+  tablas se comparten página a página sin serializar nada.
+• Otras plataformas (`spawn`): se serializa una vez por worker.
+
+Cada generación sólo viajan los genomas y sus fitness.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+from .genome_batch import np, is_matrix
+
+# función de evaluación del worker (fijada por `_init_worker`)
+_SCORE_BATCH: Callable | None = None
+
+
+def _init_worker(score_batch: Callable) -> None:
+    global _SCORE_BATCH
+    _SCORE_BATCH = score_batch
+
+
+def _score_chunk(chunk):
+    return list(_SCORE_BATCH(chunk))
+
+
+def mp_context():
+    # `fork` comparte las tablas por copy-on-write; macOS/Windows → spawn
+    if sys.platform.startswith("linux") and "fork" in mp.get_all_start_methods():
+        return mp.get_context("fork")
+    return mp.get_context("spawn")
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+class ParallelEvaluator:
+    """
+    Envoltorio de `score_batch(genomes) -> fitnesses`.
+
+    Con `workers <= 1` llama directamente a `score_batch`; en otro caso
+    arranca (de forma perezosa) un pool de `workers` procesos.
+    """
+
+    def __init__(
+            self,
+            score_batch: Callable,
+            workers: int = 1,
+            chunks_per_worker: int = 2,
+            min_batch: int = 64,
+    ):
+        self.score_batch = score_batch
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.min_batch = min_batch  # por debajo no compensa repartir
+        self._pool: ProcessPoolExecutor | None = None
+
+    # ------------------------------------------------------------------ #
+    # Evaluación
+    # ------------------------------------------------------------------ #
+    def __call__(self, genomes):
+        n = len(genomes)
+        if self.workers <= 1 or n < self.min_batch:
+            return self.score_batch(genomes)
+
+        n_chunks = min(n, self.workers * self.chunks_per_worker)
+        bounds = [n * k // n_chunks for k in range(n_chunks + 1)]
+        chunks = [genomes[bounds[k]:bounds[k + 1]] for k in range(n_chunks)]
+
+        results = list(self._get_pool().map(_score_chunk, chunks))
+        if is_matrix(genomes):
+            return np.concatenate([np.asarray(r, dtype=np.float64) for r in results])
+
+        out: List[float] = []
+        for r in results:
+            out.extend(r)
+        return out
+
+    # ------------------------------------------------------------------ #
+    # Ciclo de vida del pool
+    # ------------------------------------------------------------------ #
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp_context(),
+                initializer=_init_worker,
+                initargs=(self.score_batch,),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -7,6 +7,11 @@ Pequeño registrador de métricas evolutivas.
 • Siempre guarda los CSV en <repo-root>/runs/ sin importar
   desde dónde ejecutes `python`.
 • Nombre de archivo:  <YYYY-MM-DD>T<HH-MM-SS>_run_<Scenario>.csv
+• Columnas extra opcionales (p. ej. ``island``) tras las cuatro básicas.
+
+`CsvMetricsWriter` es el escritor con buffer que usa `RunLogger.save()`;
+también sirve para volcar métricas en streaming (p. ej. `GAWord`): abre
+el fichero una sola vez y escribe las filas por lotes.
 """
 
 from __future__ import annotations
@@ -14,7 +19,61 @@ from __future__ import annotations
 import csv
 import datetime as _dt
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+
+class CsvMetricsWriter:
+    """
+    Escritor CSV con buffer.
+
+    • El fichero se abre (y se escribe la cabecera) en el primer volcado.
+    • Las filas se acumulan y se escriben cada `flush_every` filas.
+    • `close()` vuelca lo pendiente; también al salir de un bloque ``with``.
+    """
+
+    def __init__(self, path: str | Path, header: Sequence[str], flush_every: int = 100) -> None:
+        self.path = Path(path)
+        self.header = list(header)
+        self.flush_every = max(1, flush_every)
+        self._pending: List[Sequence] = []
+        self._fh = None
+        self._writer = None
+        self.closed = False
+
+    def write(self, *row) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def write_rows(self, rows) -> None:
+        self._pending.extend(rows)
+        self.flush()
+
+    def flush(self) -> None:
+        if self.closed:
+            raise ValueError(f"CSV ya cerrado → {self.path}")
+        if self._fh is None:
+            self._fh = self.path.open("w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._fh)
+            self._writer.writerow(self.header)
+        if self._pending:
+            self._writer.writerows(self._pending)
+            self._pending.clear()
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.flush()
+        self._fh.close()
+        self._fh = self._writer = None
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 class RunLogger:
@@ -23,17 +82,23 @@ class RunLogger:
     las vuelca a un CSV al final de la ejecución.
     """
 
-    def __init__(self, scenario_name: str) -> None:
+    def __init__(self, scenario_name: str, extra_columns: Sequence[str] = ()) -> None:
         self.scenario_name = scenario_name
+        self.extra_columns = tuple(extra_columns)
         self.start_time: _dt.datetime = _dt.datetime.now()
-        self._records: List[Tuple[int, float, float, int]] = []
+        self._records: List[Tuple] = []
 
     # ------------------------------------------------------------------ #
     # Registro
     # ------------------------------------------------------------------ #
-    def log(self, generation: int, best: float, avg: float, diversity: int) -> None:
-        """Añade una fila de métricas al buffer."""
-        self._records.append((generation, best, avg, diversity))
+    def log(self, generation: int, best: float, avg: float, diversity: int, *extra) -> None:
+        """Añade una fila de métricas al buffer (más los valores de `extra_columns`)."""
+        self._records.append((generation, best, avg, diversity, *extra))
+
+    @property
+    def records(self) -> List[Tuple]:
+        """Copia de las filas registradas hasta ahora."""
+        return list(self._records)
 
     # ------------------------------------------------------------------ #
     # Persistencia
@@ -56,9 +121,8 @@ class RunLogger:
         path      = out_dir / filename
 
         # ➍ Escritura del CSV
-        with path.open("w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(["generation", "best_fitness", "avg_fitness", "diversity"])
-            writer.writerows(self._records)
+        header = ["generation", "best_fitness", "avg_fitness", "diversity", *self.extra_columns]
+        with CsvMetricsWriter(path, header) as writer:
+            writer.write_rows(self._records)
 
         return str(path)     # para imprimir o registrar
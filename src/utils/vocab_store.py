@@ -0,0 +1,138 @@
+"""
+vocab_store
+===========
+
+Vocabulario en formato binario compacto, cargado con `mmap`.
+
+Disposición del fichero (little-endian):
+
+    cabecera   magic "RAIVOCB1" · uint32 versión · uint32 nº tokens (n)
+               · uint32 nº cubetas (m, potencia de 2) · uint32 reservado
+               · uint64 bytes del blob
+    offsets    uint32[n + 1]   token i = blob[offsets[i]:offsets[i + 1]]
+    índice     uint32[m]       tabla hash (direccionamiento abierto, sondeo
+                               lineal) con ID + 1; 0 = cubeta vacía
+    blob       tokens UTF-8 concatenados en orden de ID
+
+• Abrir el fichero sólo mapea memoria: no se deserializa nada y los
+  procesos hijos (fork) comparten las páginas.
+• ID → token: un corte del blob. Token → ID: crc32 + sondeo en el índice.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, List
+
+MAGIC = b"RAIVOCB1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIIIQ")
+
+
+def _bucket_count(n: int) -> int:
+    m = 1
+    while m < 2 * n:
+        m <<= 1
+    return m
+
+
+def _hash(data: bytes) -> int:
+    return zlib.crc32(data)
+
+
+def _le_array(typecode: str, data: Iterable[int]) -> bytes:
+    arr = array(typecode, data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def write_vocab(path: str | Path, tokens: List[str]) -> Path:
+    """Escribe `tokens` (en orden de ID) en formato binario."""
+    encoded = [t.encode("utf-8") for t in tokens]
+    n, m = len(encoded), _bucket_count(len(encoded))
+
+    offsets = [0]
+    for tok in encoded:
+        offsets.append(offsets[-1] + len(tok))
+    if offsets[-1] >= 2 ** 32:
+        raise ValueError("Vocabulario demasiado grande para offsets uint32.")
+
+    index = [0] * m
+    for i, tok in enumerate(encoded):
+        slot = _hash(tok) & (m - 1)
+        while index[slot]:
+            slot = (slot + 1) & (m - 1)
+        index[slot] = i + 1
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, n, m, 0, offsets[-1]))
+        fh.write(_le_array("I", offsets))
+        fh.write(_le_array("I", index))
+        fh.write(b"".join(encoded))
+    tmp.replace(path)
+    return path
+
+
+class VocabStore:
+    """Vista de sólo lectura sobre un fichero de `write_vocab`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n, m, _, blob_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Formato de vocabulario no reconocido → {self.path}")
+        self._n, self._m = n, m
+
+        start = _HEADER.size
+        view = memoryview(self._mm)
+        offsets = view[start:start + 4 * (n + 1)]
+        index = view[start + 4 * (n + 1):start + 4 * (n + 1 + m)]
+        if sys.byteorder == "big":  # el fichero es little-endian
+            self._offsets = array("I", bytes(offsets))
+            self._offsets.byteswap()
+            self._index = array("I", bytes(index))
+            self._index.byteswap()
+        else:
+            self._offsets = offsets.cast("I")
+            self._index = index.cast("I")
+        self._blob_start = start + 4 * (n + 1 + m)
+        self._blob = view[self._blob_start:self._blob_start + blob_size]
+
+    def __len__(self) -> int:
+        return self._n
+
+    def token_bytes(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def token(self, i: int) -> str:
+        return self.token_bytes(i).decode("utf-8")
+
+    def lookup(self, token: str, default: int | None = None) -> int | None:
+        """ID de `token` o `default` si no está."""
+        data = token.encode("utf-8")
+        mask = self._m - 1
+        slot = _hash(data) & mask
+        while True:
+            entry = self._index[slot]
+            if entry == 0:
+                return default
+            if self.token_bytes(entry - 1) == data:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def tokens(self) -> List[str]:
+        """Todos los tokens en orden de ID (decodifica el blob de una vez)."""
+        blob = bytes(self._blob)
+        off = self._offsets
+        return [blob[off[i]:off[i + 1]].decode("utf-8") for i in range(self._n)]
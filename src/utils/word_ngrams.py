@@ -0,0 +1,241 @@
+"""
+word_ngrams
+===========
+
+Fluidez word-level sobre IDs del vocabulario (`src/vocab.py`).
+
+Los recuentos de `scripts/build_es_word_ngrams.py` (dict{palabra: n} y
+dict{(palabra, palabra): n}) se traducen a IDs **una sola vez**, al
+construir la tabla o al cargarla:
+
+• claves  – ``a · n_vocab + b`` (int64) ordenadas, en un array('q')
+• valores – array('d') con la asociación de cada pareja (PMI en log10)
+
+        pmi(a, b) = log10 P(b | a) − log10 P(b)
+
+Sólo se guardan las parejas con PMI > 0 (aparecen juntas más de lo que
+predice el azar). Puntuación de una frase: suma sobre cada par de
+palabras consecutivas de su PMI si el par está en la tabla, o de
+``UNSEEN`` = 0 (independencia) si no, o si alguna palabra es
+desconocida. Así un par visto nunca puntúa por debajo de uno no visto y
+la longitud de la frase no cambia por sí sola el término. La frecuencia
+de cada palabra ya la premia la Zipf; aquí sólo cuenta si las parejas
+"pegan".
+
+Búsqueda por bisección sobre el array ordenado (un genoma) o con
+`np.searchsorted` sobre toda una población (`score_packed`).
+
+`save_store` escribe la tabla en el formato mapeable de
+`ngram_store.py`; `load` abre cualquiera de los dos formatos.
+"""
+
+from __future__ import annotations
+
+import math
+import pickle
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from .. import vocab
+from .genome_batch import np
+from .ngram_store import is_store, open_store, write_store
+
+VERSION = 2  # v1 guardaba PMI negativas y penalizaba los pares no vistos
+UNSEEN = 0.0  # par no visto: PMI de dos palabras independientes
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    arr = array(typecode, data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _check_version(version, path) -> None:
+    if version != VERSION:
+        raise ValueError(
+            f"Versión de tabla de bigramas no soportada → {path} "
+            f"(regenérala con scripts/build_es_word_ngrams.py)"
+        )
+
+
+class WordBigramTable:
+    def __init__(self, keys: array, values: array, n_vocab: int,
+                 first_word_id: int = vocab.FIRST_WORD_ID):
+        self.keys = keys
+        self.values = values
+        self.n_vocab = n_vocab
+        self.first_word_id = first_word_id  # IDs menores = tokens especiales
+        self.path: Path | None = None  # fichero mapeado que respalda keys/values
+        self._np: Tuple | None = None
+
+    # ------------------------------------------------------------------ #
+    # Construcción
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_counts(cls, unigrams: Dict[str, int], bigrams: Dict[Tuple[str, str], int],
+                    lookup: Callable[[str], int | None] | None = None,
+                    n_vocab: int | None = None) -> "WordBigramTable":
+        """
+        Traduce los recuentos a IDs con `lookup(palabra) → ID | None` (por
+        defecto, el vocabulario de `src/vocab.py`); las palabras fuera del
+        vocabulario se descartan. Con un `lookup` propio hay que indicar
+        `n_vocab` (nº de IDs de ese vocabulario).
+        """
+        if lookup is None:
+            lookup = vocab.lookup
+            n_vocab = vocab.vocab_size()
+        elif n_vocab is None:
+            raise ValueError("Con un 'lookup' propio hay que indicar 'n_vocab'.")
+        first = vocab.FIRST_WORD_ID
+
+        total = sum(unigrams.values())
+        pairs: Dict[int, float] = {}
+        for (w1, w2), count in bigrams.items():
+            c1, c2 = unigrams.get(w1, 0), unigrams.get(w2, 0)
+            a, b = lookup(w1), lookup(w2)
+            if not (c1 and c2 and count) or a is None or b is None or a < first or b < first:
+                continue
+            # varias formas pueden caer en el mismo par de IDs: se queda la más fuerte
+            pmi = math.log10(count * total / (c1 * c2))
+            if pmi <= UNSEEN:  # no mejor que el azar: igual que no haberlo visto
+                continue
+            key = a * n_vocab + b
+            pairs[key] = max(pairs.get(key, pmi), pmi)
+
+        keys = sorted(pairs)
+        table = cls(array("q", keys), array("d", (pairs[k] for k in keys)), n_vocab, first)
+        table.check()
+        return table
+
+    @classmethod
+    def from_pickles(cls, unigram_file: str | Path, bigram_file: str | Path, **kwargs) -> "WordBigramTable":
+        with Path(unigram_file).open("rb") as fh:
+            unigrams = pickle.load(fh)
+        with Path(bigram_file).open("rb") as fh:
+            bigrams = pickle.load(fh)
+        return cls.from_counts(unigrams, bigrams, **kwargs)
+
+    # ------------------------------------------------------------------ #
+    # Persistencia
+    # ------------------------------------------------------------------ #
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        data = {
+            "version": VERSION,
+            "n_vocab": self.n_vocab,
+            "first_word_id": self.first_word_id,
+            "keys": _le(self.keys),
+            "values": _le(self.values),
+        }
+        with path.open("wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def save_store(self, path: str | Path) -> Path:
+        return write_store(path, "word_bigrams", {"keys": array("q", self.keys),
+                                                  "values": array("d", self.values)},
+                           version=VERSION, n_vocab=self.n_vocab,
+                           first_word_id=self.first_word_id)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "WordBigramTable":
+        if is_store(path):
+            store = open_store(path, "word_bigrams")
+            _check_version(store.meta.get("version"), path)
+            table = cls(store.array("keys"), store.array("values"),
+                        store.meta["n_vocab"], store.meta["first_word_id"])
+            table.path = store.path
+        else:
+            with Path(path).open("rb") as fh:
+                data = pickle.load(fh)
+            _check_version(data.get("version"), path)
+            table = cls(_from_le("q", data["keys"]), _from_le("d", data["values"]),
+                        data["n_vocab"], data["first_word_id"])
+        table.check()
+        return table
+
+    def check(self) -> None:
+        """Un par visto nunca puntúa por debajo de uno no visto (PMI > `UNSEEN`)."""
+        if not len(self.values):
+            return
+        low = float(np.asarray(self.values).min()) if np is not None else min(self.values)
+        if low <= UNSEEN:
+            raise ValueError(f"Tabla de bigramas con PMI ≤ {UNSEEN} (mínimo {low:.3f}).")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # ------------------------------------------------------------------ #
+    # Puntuación
+    # ------------------------------------------------------------------ #
+    def pair_score(self, a: int, b: int) -> float:
+        key = a * self.n_vocab + b
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.values[i]
+        return UNSEEN
+
+    def score(self, ids: Sequence[int]) -> float:
+        """Fluidez de un genoma de `GAWord` (se ignoran BOS/EOS y especiales)."""
+        lo, hi = self.first_word_id, self.n_vocab
+        words = [i for i in ids if lo <= i < hi]
+        return sum(self.pair_score(a, b) for a, b in zip(words, words[1:]))
+
+    def score_word_ids(self, ids: Sequence[int]) -> float:
+        """
+        Fluidez de una secuencia de IDs *tal cual* (p. ej. palabras de un
+        texto, con <unk> para las desconocidas): un par con un especial
+        cuenta como no visto.
+        """
+        lo, hi = self.first_word_id, self.n_vocab
+        pair = self.pair_score
+        return sum(
+            pair(a, b) if lo <= a < hi and lo <= b < hi else UNSEEN
+            for a, b in zip(ids, ids[1:])
+        )
+
+    def score_many(self, genomes: Iterable[Sequence[int]]) -> List[float]:
+        return [self.score(g) for g in genomes]
+
+    def _arrays(self):
+        if self._np is None:
+            self._np = (np.frombuffer(self.keys, dtype=np.int64),
+                        np.frombuffer(self.values, dtype=np.float64))
+        return self._np
+
+    def score_packed(self, pop):
+        """`score` de toda una `PackedPopulation` (vector de floats)."""
+        keys, values = self._arrays()
+        tokens = pop.tokens.astype(np.int64)
+        is_word = (tokens >= self.first_word_id) & (tokens < self.n_vocab)
+        words, seg = tokens[is_word], pop.segment_ids()[is_word]
+
+        same = seg[:-1] == seg[1:]  # pares consecutivos dentro del mismo genoma
+        pair_keys = words[:-1][same] * self.n_vocab + words[1:][same]
+        scores = np.full(len(pair_keys), UNSEEN)
+        if len(keys):
+            idx = np.minimum(np.searchsorted(keys, pair_keys), len(keys) - 1)
+            found = keys[idx] == pair_keys
+            scores[found] = values[idx[found]]
+        return np.bincount(seg[:-1][same], weights=scores, minlength=len(pop))
+
+    def __reduce_ex__(self, protocol):
+        if self.path is not None:  # el worker vuelve a mapear el fichero
+            return type(self).load, (self.path,)
+        return super().__reduce_ex__(protocol)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_np"] = None  # vistas NumPy: se recrean en el worker
+        return state
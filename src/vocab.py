@@ -4,101 +4,181 @@ Autor: tú mismo :)
 """
 
 from pathlib import Path
+from array import array
 import random
 import pickle
-from typing import List, Dict
+import sys
+from typing import Dict, Iterable, List
+
+from src.utils.vocab_store import VocabStore, write_vocab
 
 # ─────────────────────────────────────────────────────────────
 # Configuración
 # ─────────────────────────────────────────────────────────────
 VOCAB_SIZE = 50_000  # cambia lo que necesites
-_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "processed"
-_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-_CACHE_FILE = _CACHE_DIR / f"vocab_es_{VOCAB_SIZE}.pkl"
+_DATA_DIR = Path(__file__).resolve().parents[1] / "data"  # …/R.A.I/data
+_PICKLE_FILE = _DATA_DIR / f"vocab_es_{VOCAB_SIZE}.pkl"   # formato antiguo
+_BIN_FILE = _DATA_DIR / f"vocab_es_{VOCAB_SIZE}.bin"      # ver utils/vocab_store.py
+_ZIPF_FILE = _DATA_DIR / f"vocab_es_{VOCAB_SIZE}_zipf.bin"  # float64 LE por ID
 
-# Tokens especiales
+# Tokens especiales (siempre los primeros IDs)
 PAD_TOKEN, UNK_TOKEN, BOS_TOKEN, EOS_TOKEN = "<pad>", "<unk>", "<bos>", "<eos>"
+SPECIAL_TOKENS = (PAD_TOKEN, UNK_TOKEN, BOS_TOKEN, EOS_TOKEN)
+PAD_ID, UNK_ID, BOS_ID, EOS_ID = range(len(SPECIAL_TOKENS))
+FIRST_WORD_ID = len(SPECIAL_TOKENS)  # los IDs 0..3 son los tokens especiales
 
 # ─────────────────────────────────────────────────────────────
-# Dependencia opcional: wordfreq
+# Dependencia opcional: wordfreq (sólo para construir las tablas; se
+# importa bajo demanda porque su import cuesta más que cargar el vocab)
 # ─────────────────────────────────────────────────────────────
-try:
-    from wordfreq import top_n_list  # noqa: F401
-except ModuleNotFoundError:  # ⇠ IDE no mostrará “unresolved” después
-    top_n_list = None  # sustituimos por marcador
+def _wordfreq():
+    try:
+        import wordfreq
+    except ModuleNotFoundError:
+        raise RuntimeError(
+            "El módulo 'wordfreq' no está instalado. "
+            "Ejecuta `pip install wordfreq` e inténtalo de nuevo."
+        ) from None
+    return wordfreq
 
 
 # ─────────────────────────────────────────────────────────────
 # Construcción / carga del vocabulario
 # ─────────────────────────────────────────────────────────────
-def _build_vocab() -> Dict[str, int]:
+def _build_tokens() -> List[str]:
     """
     Descarga las VOCAB_SIZE palabras españolas más frecuentes
     (requiere `pip install wordfreq`). Si la librería no existe,
     lanza una excepción clara.
     """
-    if top_n_list is None:
-        raise RuntimeError(
-            "El módulo 'wordfreq' no está instalado. "
-            "Ejecuta `pip install wordfreq` e inténtalo de nuevo."
-        )
+    return list(SPECIAL_TOKENS) + _wordfreq().top_n_list("es", VOCAB_SIZE)
+
+
+def convert_pickle(src: Path | str = _PICKLE_FILE, dst: Path | str = _BIN_FILE) -> Path:
+    """Convierte un vocabulario pickle (dict token → ID) al formato binario."""
+    with Path(src).open("rb") as fh:
+        token2idx: Dict[str, int] = pickle.load(fh)
+    tokens: List[str] = [None] * len(token2idx)
+    for tok, idx in token2idx.items():
+        tokens[idx] = tok
+    return write_vocab(dst, tokens)
+
+
+_STORE: VocabStore | None = None
+
+
+def _store() -> VocabStore:
+    """Vocabulario mapeado en memoria (se abre/convierte/construye en el primer uso)."""
+    global _STORE
+    if _STORE is None:
+        if not _BIN_FILE.exists():
+            _BIN_FILE.parent.mkdir(parents=True, exist_ok=True)
+            if _PICKLE_FILE.exists():
+                convert_pickle(_PICKLE_FILE, _BIN_FILE)
+            else:
+                write_vocab(_BIN_FILE, _build_tokens())
+        store = VocabStore(_BIN_FILE)
+        if [store.token(i) for i in range(FIRST_WORD_ID)] != list(SPECIAL_TOKENS):
+            raise ValueError(f"Tokens especiales inesperados en {_BIN_FILE}")
+        _STORE = store
+    return _STORE
+
+
+def __getattr__(name: str):
+    # compatibilidad: TOKEN2IDX / IDX2TOKEN se materializan sólo si se piden,
+    # una vez: quedan como globales del módulo y no vuelven a pasar por aquí
+    # (para buscar palabras sueltas, mejor `lookup()`)
+    if name == "IDX2TOKEN":
+        value = _store().tokens()
+    elif name == "TOKEN2IDX":
+        value = {tok: i for i, tok in enumerate(_store().tokens())}
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
-    tokens = [PAD_TOKEN, UNK_TOKEN, BOS_TOKEN, EOS_TOKEN] + top_n_list("es", VOCAB_SIZE)
-    return {tok: i for i, tok in enumerate(tokens)}
 
+# ─────────────────────────────────────────────────────────────
+# Tabla Zipf por ID
+# ─────────────────────────────────────────────────────────────
+_ZIPF: array | None = None
 
-def _load_or_build_vocab() -> Dict[str, int]:
-    if _CACHE_FILE.exists():
-        with _CACHE_FILE.open("rb") as fh:
-            vocab = pickle.load(fh)
-    else:
-        vocab = _build_vocab()
-        with _CACHE_FILE.open("wb") as fh:
-            pickle.dump(vocab, fh)
-    return vocab
 
+def _build_zipf() -> array:
+    zipf_frequency = _wordfreq().zipf_frequency
+    table = array("d", (0.0 if i < FIRST_WORD_ID else zipf_frequency(tok, "es")
+                        for i, tok in enumerate(_store().tokens())))
+    out = array("d", table)
+    if sys.byteorder == "big":
+        out.byteswap()
+    with _ZIPF_FILE.open("wb") as fh:
+        out.tofile(fh)
+    return table
 
-# Carga global (solo lectura tras esta línea)
-TOKEN2IDX: Dict[str, int] = _load_or_build_vocab()
-IDX2TOKEN: List[str] = [None] * len(TOKEN2IDX)
-for tok, idx in TOKEN2IDX.items():
-    IDX2TOKEN[idx] = tok
 
-PAD_ID, UNK_ID, BOS_ID, EOS_ID = (
-    TOKEN2IDX[PAD_TOKEN],
-    TOKEN2IDX[UNK_TOKEN],
-    TOKEN2IDX[BOS_TOKEN],
-    TOKEN2IDX[EOS_TOKEN],
-)
+def zipf_table() -> array:
+    """
+    Frecuencia Zipf (wordfreq, "es") de cada ID del vocabulario; 0.0 para
+    los tokens especiales. Se calcula una vez y se guarda junto al
+    vocabulario (`vocab_es_<N>_zipf.bin`).
+    """
+    global _ZIPF
+    if _ZIPF is None:
+        table = array("d")
+        n = vocab_size()
+        if _ZIPF_FILE.exists() and _ZIPF_FILE.stat().st_size == 8 * n:
+            with _ZIPF_FILE.open("rb") as fh:
+                table.fromfile(fh, n)
+            if sys.byteorder == "big":
+                table.byteswap()
+        else:
+            table = _build_zipf()
+        _ZIPF = table
+    return _ZIPF
 
 
 # ─────────────────────────────────────────────────────────────
 # API pública
 # ─────────────────────────────────────────────────────────────
 def encode(text: str, add_bos_eos: bool = True) -> List[int]:
-    tokens = text.lower().split()
-    ids = [TOKEN2IDX.get(tok, UNK_ID) for tok in tokens]
+    lookup = _store().lookup
+    ids = [lookup(tok, UNK_ID) for tok in text.lower().split()]
     return ([BOS_ID] + ids + [EOS_ID]) if add_bos_eos else ids
 
 
+def lookup(token: str, default: int | None = None) -> int | None:
+    """ID de `token` tal cual (sin pasarlo a minúsculas) o `default` si no está."""
+    return _store().lookup(token, default)
+
+
 def decode(ids: List[int], skip_special: bool = True) -> str:
-    words = []
-    for i in ids:
-        tok = IDX2TOKEN[i] if i < len(IDX2TOKEN) else UNK_TOKEN
-        if skip_special and tok in {PAD_TOKEN, UNK_TOKEN, BOS_TOKEN, EOS_TOKEN}:
-            continue
-        words.append(tok)
-    return " ".join(words)
+    """IDs → texto (sólo para mostrar; la fitness trabaja con IDs)."""
+    store = _store()
+    if skip_special:
+        return " ".join(store.token(i) for i in content_ids(ids))
+    n = len(store)
+    return " ".join(store.token(i) if i < n else UNK_TOKEN for i in ids)
+
+
+def is_special(i: int) -> bool:
+    """True para tokens especiales e IDs fuera del vocabulario (→ <unk>)."""
+    return not FIRST_WORD_ID <= i < vocab_size()
+
+
+def content_ids(ids: Iterable[int]) -> List[int]:
+    """IDs de palabras reales: descarta especiales y fuera de rango, sin decodificar."""
+    n = vocab_size()
+    return [i for i in ids if FIRST_WORD_ID <= i < n]
 
 
 def random_sentence(max_len: int = 12) -> List[int]:
     length = random.randint(1, max_len)
-    ids = [random.randrange(4, len(TOKEN2IDX)) for _ in range(length)]
+    ids = [random.randrange(FIRST_WORD_ID, vocab_size()) for _ in range(length)]
     return [BOS_ID] + ids + [EOS_ID]
 
 
 def vocab_size() -> int:
-    return len(TOKEN2IDX)
+    return len(_store())
 
 
 # ─────────────────────────────────────────────────────────────
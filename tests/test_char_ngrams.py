@@ -0,0 +1,39 @@
+"""Tablas de n-gramas de caracteres (src/utils/char_ngrams.py)."""
+
+import random
+
+import pytest
+
+from src.utils.char_ngrams import ALPHABET, MAX_DENSE_ORDER, CharNgramTable, encode
+
+np = pytest.importorskip("numpy")
+
+
+def _freqs(order: int, n: int = 300) -> dict:
+    rng = random.Random(order)
+    return {"".join(rng.choice(ALPHABET) for _ in range(order)): rng.randint(1, 99)
+            for _ in range(n)}
+
+
+def _brute(freqs: dict, text: str, order: int) -> int:
+    windows = (text[i:i + order] for i in range(len(text) - order + 1))
+    return sum(freqs.get(w, 0) for w in windows if " " not in w)
+
+
+@pytest.mark.parametrize("order", [2, 3, MAX_DENSE_ORDER + 1, 7, 15])
+def test_table_matches_brute_force(order):
+    freqs = _freqs(order)
+    table = CharNgramTable(freqs, order, ignore_space=True)
+    assert table.sparse == (order > MAX_DENSE_ORDER)
+
+    rng = random.Random(0)
+    texts = ["".join(rng.choice(ALPHABET) for _ in range(40)) for _ in range(5)]
+    seen = next(k for k in freqs if " " not in k)
+    texts += [seen * 3, "Ñ" + seen + "?"]
+    texts = [t[:40].ljust(40, "X") for t in texts]
+    expected = [_brute(freqs, t, order) for t in texts]
+
+    assert [table.score(encode(t)) for t in texts] == expected
+    assert list(table.score_batch([list(t) for t in texts])) == expected
+    assert table.window(encode(texts[-2]), 0) == freqs[seen]
+    assert table.window(encode(texts[-1]), 0) == 0
@@ -0,0 +1,190 @@
+"""Ida y vuelta del formato binario de n-gramas (src/utils/ngram_store.py)."""
+
+import math
+import os
+import pickle
+
+import pytest
+
+from src.utils.ngram_store import (
+    StringCounts, drop_store, load_counts, prefer_store, quantize, store_path, write_counts,
+)
+from src.utils.word_ngrams import UNSEEN, WordBigramTable
+
+WORDS = {"casa": 120, "perro": 7, "árbol": 3, "ñu": 1, "de": 9_000_000}
+PAIRS = {("la", "casa"): 40, ("de", "la"): 900, ("el", "ñu"): 1, ("árbol", "alto"): 2}
+
+
+# ─────────────────────────────────────────────────────────────
+# Recuentos
+# ─────────────────────────────────────────────────────────────
+@pytest.mark.parametrize("counts", [WORDS, PAIRS], ids=["str", "pairs"])
+def test_counts_round_trip(tmp_path, counts):
+    table = StringCounts(write_counts(tmp_path / "t.bin", counts))
+
+    assert len(table) == len(counts)
+    assert table.pairs == isinstance(next(iter(counts)), tuple)
+    assert table.bits is None
+    for key, count in counts.items():
+        assert table[key] == count
+        assert table.get(key) == count
+        assert key in table
+    assert list(table.items()) == sorted(counts.items())
+    assert list(table) == sorted(counts)
+    assert dict(table) == counts
+
+
+def test_counts_missing_keys(tmp_path):
+    words = StringCounts(write_counts(tmp_path / "w.bin", WORDS))
+    pairs = StringCounts(write_counts(tmp_path / "p.bin", PAIRS))
+
+    assert "gato" not in words and words.get("gato", -1) == -1
+    with pytest.raises(KeyError):
+        words["gato"]
+    # el tipo de clave tiene que coincidir con el de la tabla
+    assert ("la", "casa") not in words and 7 not in words
+    assert "casa" not in pairs and ("casa", "la") not in pairs
+    assert pairs.get(("la",)) is None
+
+
+def test_counts_empty(tmp_path):
+    table = StringCounts(write_counts(tmp_path / "e.bin", {}))
+    assert len(table) == 0 and list(table.items()) == [] and "x" not in table
+
+
+def test_counts_pickle_by_path(tmp_path):
+    table = StringCounts(write_counts(tmp_path / "t.bin", PAIRS), scale="log")
+    func, args = table.__reduce__()
+    assert func is StringCounts and args == (table.path, "log")
+
+    clone = pickle.loads(pickle.dumps(table))
+    assert clone.path == table.path and clone.scale == "log"
+    assert dict(clone) == dict(table)
+
+
+def test_load_counts_prefers_fresh_store(tmp_path):
+    pkl = tmp_path / "t.pkl"
+    with pkl.open("wb") as fh:
+        pickle.dump(WORDS, fh)
+    assert prefer_store(pkl) == pkl
+    assert isinstance(load_counts(pkl), dict)
+
+    binary = write_counts(store_path(pkl), {**WORDS, "casa": 1})
+    assert prefer_store(pkl) == binary
+    assert load_counts(pkl)["casa"] == 1
+
+    # un pickle reescrito después deja obsoleto el .bin
+    stat = binary.stat()
+    os.utime(pkl, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert prefer_store(pkl) == pkl
+    assert load_counts(pkl)["casa"] == WORDS["casa"]
+
+    assert drop_store(pkl) and not binary.exists()
+    assert not drop_store(pkl)
+
+
+# ─────────────────────────────────────────────────────────────
+# Recuentos cuantizados
+# ─────────────────────────────────────────────────────────────
+# recuentos de 1 a 1e9, repartidos en escala logarítmica
+SPREAD = {f"k{i:03d}": max(1, round(10 ** (i / 20))) for i in range(181)}
+
+
+@pytest.mark.parametrize("bits", [8, 16])
+@pytest.mark.parametrize("counts", [SPREAD, PAIRS], ids=["spread", "pairs"])
+def test_quantized_counts_within_bound(tmp_path, counts, bits):
+    path = write_counts(tmp_path / "q.bin", counts, bits=bits)
+    step = math.log(max(counts.values())) / ((1 << bits) - 1)
+    rel_bound = math.exp(step / 2) - 1           # escala count: error relativo
+    log_bound = step / 2 / math.log(10) + 1e-12  # escala log: error absoluto en log10
+
+    table, logs = StringCounts(path), StringCounts(path, scale="log")
+    assert table.bits == bits and logs.bits == bits
+    assert list(table) == sorted(counts)
+    for key, count in counts.items():
+        assert abs(table[key] / count - 1) <= rel_bound + 1e-12, key
+        assert abs(logs[key] - math.log10(count)) <= log_bound, key
+    assert table[min(counts, key=counts.get)] == pytest.approx(min(counts.values()))
+
+
+def rel_error_bound(bits: int, top: float = 1e9) -> float:
+    return math.exp(math.log(top) / ((1 << bits) - 1) / 2) - 1
+
+
+def test_quantize_bound_values():
+    # lo que promete el docstring del módulo: ≈ ±4 % (8 bits) y ≈ ±0.02 % (16)
+    assert rel_error_bound(8) < 0.05 and rel_error_bound(16) < 0.0003
+    buckets, step = quantize([1, 10, 10 ** 9], 8)
+    assert buckets.typecode == "B" and buckets[0] == 0 and buckets[-1] == 255
+    with pytest.raises(ValueError):
+        quantize([1, 2], 12)
+
+
+def test_scales_agree_unquantized(tmp_path):
+    path = write_counts(tmp_path / "t.bin", WORDS)
+    logs = load_counts(path, scale="log")
+    assert logs.with_scale("count") == StringCounts(path)
+    for key, count in WORDS.items():
+        assert logs[key] == pytest.approx(math.log10(count))
+    with pytest.raises(ValueError):
+        StringCounts(path, scale="ln")
+
+
+# ─────────────────────────────────────────────────────────────
+# Tabla de bigramas por ID
+# ─────────────────────────────────────────────────────────────
+IDS = {"la": 4, "casa": 5, "de": 6, "el": 7, "ñu": 8, "árbol": 9, "alto": 10}
+UNIGRAMS = {"la": 50, "casa": 45, "de": 950, "el": 60, "ñu": 1, "árbol": 3, "alto": 4}
+
+
+def _table() -> WordBigramTable:
+    return WordBigramTable.from_counts(UNIGRAMS, PAIRS, lookup=IDS.get, n_vocab=11)
+
+
+def _same(a: WordBigramTable, b: WordBigramTable) -> None:
+    assert list(a.keys) == list(b.keys)
+    assert list(a.values) == list(b.values)
+    assert (a.n_vocab, a.first_word_id) == (b.n_vocab, b.first_word_id)
+
+
+def test_word_bigrams_from_counts():
+    table = _table()
+    assert len(table) > 0
+    assert all(v > UNSEEN for v in table.values)  # sólo PMI > 0
+    assert list(table.keys) == sorted(table.keys)
+    assert table.pair_score(IDS["la"], IDS["casa"]) > UNSEEN
+    assert table.pair_score(IDS["casa"], IDS["la"]) == UNSEEN
+    table.check()
+
+
+def test_word_bigrams_needs_n_vocab_with_lookup():
+    with pytest.raises(ValueError):
+        WordBigramTable.from_counts(UNIGRAMS, PAIRS, lookup=IDS.get)
+
+
+SAVES = [("save", "wb.pkl"), ("save_store", "wb.bin")]
+
+
+@pytest.mark.parametrize("save, name", SAVES)
+def test_word_bigrams_round_trip(tmp_path, save, name):
+    table = _table()
+    path = getattr(table, save)(tmp_path / name)
+    loaded = WordBigramTable.load(path)
+    _same(loaded, table)
+    genome = [2, IDS["el"], IDS["ñu"], IDS["de"], IDS["la"], IDS["casa"], 3]
+    assert loaded.score(genome) == pytest.approx(table.score(genome))
+
+    clone = pickle.loads(pickle.dumps(loaded))  # mapeado → se vuelve a abrir por ruta
+    _same(clone, table)
+    assert clone.path == loaded.path
+
+
+@pytest.mark.parametrize("save, name", SAVES)
+def test_word_bigrams_load_rejects_non_positive_pmi(tmp_path, save, name):
+    table = _table()
+    table.values[0] = UNSEEN
+    with pytest.raises(ValueError):
+        table.check()
+    path = getattr(table, save)(tmp_path / name)
+    with pytest.raises(ValueError):
+        WordBigramTable.load(path)
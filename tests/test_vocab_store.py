@@ -0,0 +1,53 @@
+"""Ida y vuelta del vocabulario binario (src/utils/vocab_store.py)."""
+
+import pytest
+
+from src.utils.vocab_store import VocabStore, write_vocab
+
+TOKENS = ["<pad>", "<unk>", "<bos>", "<eos>", "de", "la", "casa", "árbol", "ñu", "pingüino", "a"]
+
+
+def test_vocab_round_trip(tmp_path):
+    store = VocabStore(write_vocab(tmp_path / "v.bin", TOKENS))
+
+    assert len(store) == len(TOKENS)
+    assert store.tokens() == TOKENS
+    for i, token in enumerate(TOKENS):
+        assert store.token(i) == token
+        assert store.token_bytes(i) == token.encode("utf-8")
+        assert store.lookup(token) == i
+
+
+def test_vocab_missing_tokens(tmp_path):
+    store = VocabStore(write_vocab(tmp_path / "v.bin", TOKENS))
+    assert store.lookup("gato") is None
+    assert store.lookup("gato", 1) == 1
+    assert store.lookup("Casa") is None  # sin pasar a minúsculas
+    assert store.lookup("") is None
+
+
+def test_vocab_many_tokens(tmp_path):
+    # suficientes colisiones en la tabla hash para recorrer el sondeo lineal
+    tokens = [f"palabra{i}" for i in range(5000)]
+    store = VocabStore(write_vocab(tmp_path / "v.bin", tokens))
+    assert all(store.lookup(t) == i for i, t in enumerate(tokens))
+    assert store.lookup("palabra5000") is None
+
+
+def test_vocab_rejects_other_files(tmp_path):
+    path = tmp_path / "x.bin"
+    path.write_bytes(b"NOTAVOCB" + bytes(64))
+    with pytest.raises(ValueError):
+        VocabStore(path)
+
+
+def test_module_vocab_shims_are_cached():
+    from src import vocab
+
+    assert vocab.TOKEN2IDX is vocab.TOKEN2IDX
+    assert vocab.IDX2TOKEN is vocab.IDX2TOKEN
+    for word in ("casa", "de", "hola"):
+        assert vocab.lookup(word) == vocab.TOKEN2IDX[word]
+        assert vocab.IDX2TOKEN[vocab.lookup(word)] == word
+    assert vocab.lookup("zzqxq") is None
+    assert vocab.lookup("zzqxq", vocab.UNK_ID) == vocab.UNK_ID